@@ -7,4 +7,8 @@ class BankingConfig(AppConfig):
     
     def ready(self):
         # Import the signals module to connect signal handlers
-        import banking.signals
\ No newline at end of file
+        import banking.signals
+        # Tune SQLite connections as they're opened
+        import banking.sqlite
+        # Count queries per request for the metrics endpoint
+        import banking.metrics
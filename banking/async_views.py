@@ -0,0 +1,143 @@
+"""
+Async versions of the read-heavy endpoints, for serving under ASGI.
+
+These are plain Django async views rather than DRF viewsets (DRF's APIView
+dispatches synchronously), mounted under ``/api/async/``. They return the
+same payloads as their synchronous counterparts in views.py and
+auth_views.py. Database calls go through the async queryset API, so while
+one request waits on the database the event loop serves the others. Under
+WSGI each of those waits would hold a worker thread. The account ownership
+check is the sync views' own (banking.ownership), run with
+``sync_to_async`` so both answer 404/403 the same way.
+"""
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db.models import Sum
+from django.http import JsonResponse
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from . import authentication, ownership, routers
+from .exports import filter_by_time_range
+from .models import Account, Transaction
+from .serializers import AccountSerializer, AccountSummarySerializer, TransactionSerializer
+
+_jwt = JWTAuthentication()
+
+
+def _json(data, status=200):
+    # DRF's encoder, so values render exactly as they do in the sync views
+    return JsonResponse(data, status=status, encoder=JSONEncoder, safe=False)
+
+
+def _error(detail, status):
+    return _json({"detail": detail}, status=status)
+
+
+async def authenticate(request):
+    """
+    Resolve the request's bearer token to an active user, or return None.
+    The token itself is checked without touching the database, and the user
+    usually comes from the cache.
+    """
+    header = _jwt.get_header(request)
+    raw_token = _jwt.get_raw_token(header) if header is not None else None
+    if raw_token is None:
+        return None
+    try:
+        token = _jwt.get_validated_token(raw_token)
+        user_id = authentication.user_id_from(token)
+    except (InvalidToken, TokenError):
+        return None
+    # Shares CachedJWTAuthentication's user cache
+    user = authentication.users.get(user_id)
+    if user is None:
+        User = get_user_model()
+        try:
+            user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            return None
+        authentication.users.put(user_id, user)
+    try:
+        return authentication.check_user(user, token)
+    except AuthenticationFailed:
+        return None
+
+
+def authenticated(view):
+    # Async counterpart of permission_classes = [IsAuthenticated]
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return _error(f'Method "{request.method}" not allowed.', 405)
+        user = await authenticate(request)
+        if user is None:
+            return _error("Authentication credentials were not provided.", 401)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+async def _access_error(request, account_id):
+    # The same 404/403 answers as the sync views (see banking.ownership)
+    error = await sync_to_async(ownership.access_error)(request, account_id)
+    if error is None:
+        return None
+    status, detail = error
+    return _error(detail, status)
+
+
+@authenticated
+async def my_accounts(request):
+    accounts = [account async for account in Account.objects.filter(user=request.user)]
+    return _json(AccountSummarySerializer(accounts, many=True).data)
+
+
+@authenticated
+async def user_accounts(request):
+    user = request.user
+    accounts = [account async for account in Account.objects.filter(user=user).select_related('user')]
+    return _json({
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'is_staff': user.is_staff,
+        },
+        'accounts': AccountSerializer(accounts, many=True).data,
+    })
+
+
+@authenticated
+async def account_transactions(request, account_id):
+    error = await _access_error(request, account_id)
+    if error:
+        return error
+    try:
+        transactions = filter_by_time_range(
+            Transaction.objects.filter(from_account_id=ownership.parse_account_id(account_id)), request.GET,
+        )
+    except ValueError as e:
+        return _error(str(e), 400)
+    rows = [txn async for txn in transactions]
+    return _json(TransactionSerializer(rows, many=True).data)
+
+
+@authenticated
+async def spending_summary(request, account_id):
+    error = await _access_error(request, account_id)
+    if error:
+        return error
+    summary = Transaction.objects.filter(
+        from_account_id=ownership.parse_account_id(account_id),
+        transaction_type="payment",
+    ).values('business__category').annotate(total=Sum('amount'))
+    with routers.use_replica():
+        rows = [row async for row in summary]
+    return _json(rows)
@@ -2,10 +2,10 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import Account
 from .serializers import AccountSerializer
+from . import hashing
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
@@ -19,7 +19,13 @@ class LoginView(APIView):
                 'error': 'Please provide both username and password'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        user = authenticate(username=username, password=password)
+        # The password check runs in the hashing pool; shed load when it's full
+        try:
+            user = hashing.authenticate(username, password)
+        except hashing.HashingBusy as e:
+            return Response({
+                'error': str(e)
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE, headers={'Retry-After': str(e.retry_after)})
         
         if user is None:
             return Response({
@@ -0,0 +1,119 @@
+"""
+JWT authentication without a user query on every request.
+
+simplejwt's ``JWTAuthentication`` loads the token's user from the database
+before every view. ``CachedJWTAuthentication`` keeps recently seen users in
+a per-process LRU cache of ``AUTH_USER_CACHE_SIZE`` entries, each trusted
+for ``AUTH_USER_CACHE_TTL`` seconds. Saving or deleting a user (which
+covers deactivation and password changes) drops their entry in this
+process straight away (see banking.signals). Other processes pick up the
+change when their entry expires, so the TTL bounds how long a deactivated
+user keeps access there. Set ``AUTH_USER_CACHE_TTL = 0`` to turn the cache
+off.
+
+The active and password-change checks still run against the cached row on
+every request.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+class UserCache:
+    """
+    A thread-safe LRU mapping of user id to user with a time-to-live. Ids are
+    compared as strings, since a token may carry a numeric id either way.
+    """
+
+    def __init__(self):
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, user_id):
+        ttl = settings.AUTH_USER_CACHE_TTL
+        if ttl <= 0:
+            return None
+        user_id = str(user_id)
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if entry is None:
+                return None
+            user, stored = entry
+            if time.monotonic() - stored > ttl:
+                del self.entries[user_id]
+                return None
+            self.entries.move_to_end(user_id)
+        # A copy, so nothing a request does to its user leaks into the next one
+        return copy.copy(user)
+
+    def put(self, user_id, user):
+        if settings.AUTH_USER_CACHE_TTL <= 0:
+            return
+        user_id = str(user_id)
+        with self.lock:
+            self.entries[user_id] = (copy.copy(user), time.monotonic())
+            self.entries.move_to_end(user_id)
+            while len(self.entries) > settings.AUTH_USER_CACHE_SIZE:
+                self.entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self.lock:
+            self.entries.pop(str(user_id), None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+users = UserCache()
+
+
+@receiver(setting_changed)
+def _settings_changed(setting, **kwargs):
+    if setting in ('AUTH_USER_CACHE_TTL', 'AUTH_USER_CACHE_SIZE'):
+        users.clear()
+
+
+def forget(user):
+    """Drop ``user``'s cached entry, e.g. after it has been written."""
+    users.forget(getattr(user, jwt_settings.USER_ID_FIELD))
+
+
+def check_user(user, validated_token):
+    # The checks simplejwt makes after loading the user
+    if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+        raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+    if jwt_settings.CHECK_REVOKE_TOKEN and \
+            validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+        raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+    return user
+
+
+def user_id_from(validated_token):
+    try:
+        return validated_token[jwt_settings.USER_ID_CLAIM]
+    except KeyError as e:
+        raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        user_id = user_id_from(validated_token)
+        user = users.get(user_id)
+        if user is None:
+            try:
+                user = self.user_model.objects.get(**{jwt_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist as e:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found") from e
+            users.put(user_id, user)
+        return check_user(user, validated_token)
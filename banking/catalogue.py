@@ -0,0 +1,81 @@
+"""
+Read-through cache for the business catalogue.
+
+List and detail payloads are cached under keys that embed a catalogue
+version number. Any write to a Business bumps the version (see
+banking.signals), so every cached payload goes stale at once without having
+to know which keys exist; old entries simply age out. Each payload is stored
+with an ETag so clients can revalidate with If-None-Match.
+
+The version only invalidates processes that share the cache, so
+``BUSINESS_CACHE_ALIAS`` must name a cache every worker can see (the
+default file cache is). With a per-process cache, other workers would keep
+serving the old catalogue for up to ``BUSINESS_CACHE_TIMEOUT``.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+
+VERSION_KEY = 'banking:businesses:version'
+
+
+def _cache():
+    return caches[settings.BUSINESS_CACHE_ALIAS]
+
+
+def _seed(cache):
+    # A version that was never used before, even if the key was evicted
+    # while payloads cached under an earlier number are still around
+    seed = time.time_ns()
+    cache.add(VERSION_KEY, seed, timeout=None)
+    return cache.get(VERSION_KEY, seed)
+
+
+def version():
+    cache = _cache()
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        current = _seed(cache)
+    return current
+
+
+def invalidate():
+    """Make every cached catalogue payload stale."""
+    cache = _cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Not set yet (or evicted)
+        _seed(cache)
+
+
+def etag_for(data):
+    body = json.dumps(data, cls=DjangoJSONEncoder, sort_keys=True).encode()
+    return '"%s"' % hashlib.md5(body).hexdigest()
+
+
+def get_or_build(name, build):
+    """
+    Return ``(data, etag)`` for the payload ``name``, calling ``build()`` to
+    produce it on a miss.
+    """
+    cache = _cache()
+    key = f'banking:businesses:{version()}:{name}'
+    entry = cache.get(key)
+    if entry is None:
+        data = build()
+        entry = (data, etag_for(data))
+        cache.set(key, entry, timeout=settings.BUSINESS_CACHE_TIMEOUT)
+    return entry
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    if header.strip() == '*':
+        return True
+    candidates = {tag.strip().removeprefix('W/') for tag in header.split(',')}
+    return etag in candidates
@@ -0,0 +1,126 @@
+"""
+Month-end balance checkpoints.
+
+``close`` writes a ``BalanceCheckpoint`` for every account at the end of a
+month, starting from the previous month's checkpoints and adding only that
+month's transactions (see the ``close_period`` command). ``balance_at``
+answers "what was the balance at time T" from the latest checkpoint at or
+before T plus the transactions after it, so the work is bounded by one
+month of history however old the account is.
+
+A checkpoint is only correct while nothing is written before its
+``period_end``. Writes are timestamped now, after every closed month, so
+they never touch one. Backdated writes (edits of old transactions,
+imported statements) go through ``discard_stale``, which drops the
+checkpoints they invalidate; ``balance_at`` then falls back to an older
+checkpoint until the months are closed again.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction as db_transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Account, BalanceCheckpoint
+from . import ledger
+
+# Accounts per query when catching up accounts that have no earlier checkpoint
+CHUNK_SIZE = 500
+ZERO = Decimal('0.00')
+NO_CHANGE = (ZERO, ZERO)
+
+
+def month_start(moment):
+    """The first instant of ``moment``'s month, in the current time zone."""
+    if timezone.is_aware(moment):
+        moment = timezone.localtime(moment)
+    start = datetime(moment.year, moment.month, 1)
+    return timezone.make_aware(start) if settings.USE_TZ else start
+
+
+def next_month(start):
+    """The first instant of the month after the one starting at ``start``."""
+    if timezone.is_aware(start):
+        start = timezone.localtime(start)
+    year, month = (start.year + 1, 1) if start.month == 12 else (start.year, start.month + 1)
+    following = datetime(year, month, 1)
+    return timezone.make_aware(following) if settings.USE_TZ else following
+
+
+def last_closable():
+    """The latest period end that can be closed: the start of the current month."""
+    return month_start(timezone.now())
+
+
+def close(period_end, batch_size=1000):
+    """
+    Write (or rewrite) every account's checkpoint at ``period_end``, which
+    must be a month start no later than ``last_closable()``. Returns the
+    number of checkpoints written.
+    """
+    if period_end != month_start(period_end) or period_end > last_closable():
+        raise ValueError("Checkpoints can only be written at the start of a month that has begun")
+
+    previous = BalanceCheckpoint.objects.filter(period_end__lt=period_end).aggregate(latest=Max('period_end'))['latest']
+    base = {}
+    if previous is not None:
+        base = {
+            account_id: (balance, pot)
+            for account_id, balance, pot in BalanceCheckpoint.objects.filter(period_end=previous)
+            .values_list('account', 'balance', 'round_up_pot')
+        }
+    accounts = list(Account.objects.values_list('id', 'starting_balance'))
+    changes = ledger.net_changes(since=previous, until=period_end)
+
+    # Accounts without a checkpoint at ``previous`` also need everything before it
+    earlier = {}
+    if previous is not None:
+        missing = [account_id for account_id, _ in accounts if account_id not in base]
+        for i in range(0, len(missing), CHUNK_SIZE):
+            earlier.update(ledger.net_changes(until=previous, account_ids=missing[i:i + CHUNK_SIZE]))
+
+    rows = []
+    for account_id, starting_balance in accounts:
+        balance, pot = base.get(account_id) or (starting_balance, ZERO)
+        for delta_balance, delta_pot in (earlier.get(account_id, NO_CHANGE), changes.get(account_id, NO_CHANGE)):
+            balance += delta_balance
+            pot += delta_pot
+        rows.append(BalanceCheckpoint(account_id=account_id, period_end=period_end, balance=balance, round_up_pot=pot))
+
+    with db_transaction.atomic():
+        BalanceCheckpoint.objects.bulk_create(
+            rows, batch_size=batch_size,
+            update_conflicts=True, unique_fields=['account', 'period_end'], update_fields=['balance', 'round_up_pot'],
+        )
+    return len(rows)
+
+
+def balance_at(account, until):
+    """
+    The account's ``(balance, round_up_pot, checkpoint)`` counting every
+    transaction timestamped before ``until``. ``checkpoint`` is the one the
+    answer started from, or None if there was none.
+    """
+    checkpoint = account.checkpoints.filter(period_end__lte=until).order_by('-period_end').first()
+    if checkpoint is not None:
+        balance, pot, since = checkpoint.balance, checkpoint.round_up_pot, checkpoint.period_end
+    else:
+        balance, pot, since = account.starting_balance, ZERO, None
+    delta_balance, delta_pot = ledger.net_changes(since, until, [account.pk]).get(account.pk, NO_CHANGE)
+    return balance + delta_balance, pot + delta_pot, checkpoint
+
+
+def discard_stale(transactions):
+    """
+    Delete the checkpoints made wrong by writing (or removing) the given
+    transactions. Costs nothing unless one of them predates the current month.
+    """
+    earliest = min((txn.timestamp for txn in transactions), default=None)
+    # Checkpoints end no later than the current month's start
+    if earliest is None or earliest >= last_closable():
+        return
+    accounts = {txn.from_account_id for txn in transactions}
+    accounts |= {txn.to_account_id for txn in transactions if txn.to_account_id is not None}
+    BalanceCheckpoint.objects.filter(account__in=accounts, period_end__gt=earliest).delete()
@@ -0,0 +1,142 @@
+"""
+Password hashing off the request thread.
+
+PBKDF2 is the most CPU-heavy thing the API does. Hashes are computed in a
+bounded process pool, so a login burst can't occupy every request worker or
+serialize on the GIL. Admission is bounded too: once the pool has
+``PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE`` hashes in flight, new
+requests are refused with HashingBusy (a 503 with Retry-After) rather than
+queueing without limit.
+
+Set ``PASSWORD_HASH_WORKERS = 0`` to hash inline on the calling thread; the
+admission limit still applies.
+"""
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_lock = threading.Lock()
+_pool = None
+_slots = None
+
+
+class HashingBusy(Exception):
+    """Every hashing slot is taken; the client should retry after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__("Too many password checks in progress")
+        self.retry_after = retry_after
+
+
+def _init_worker(settings_module, password_hashers):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+
+    django.setup()
+    # Hashers may have been swapped at runtime (tests, benchmarks)
+    settings.PASSWORD_HASHERS = password_hashers
+
+
+def _make(password):
+    return hashers.make_password(password)
+
+
+def _check(password, encoded):
+    # Returns (correct, needs rehashing with the preferred hasher)
+    outdated = []
+    return hashers.check_password(password, encoded, setter=outdated.append), bool(outdated)
+
+
+def _executor():
+    global _pool, _slots
+    with _lock:
+        if _slots is None:
+            _slots = threading.BoundedSemaphore(max(settings.PASSWORD_HASH_WORKERS, 1) + settings.PASSWORD_HASH_QUEUE)
+        if _pool is None and settings.PASSWORD_HASH_WORKERS > 0:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'extra_credit_union.settings'),
+                          list(settings.PASSWORD_HASHERS)),
+            )
+        return _pool, _slots
+
+
+def reset():
+    """Shut the pool down; the next hash starts a new one with current settings."""
+    global _pool, _slots
+    with _lock:
+        pool, _pool, _slots = _pool, None, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+@receiver(setting_changed)
+def _settings_changed(setting, **kwargs):
+    if setting in ('PASSWORD_HASHERS', 'PASSWORD_HASH_WORKERS', 'PASSWORD_HASH_QUEUE'):
+        reset()
+
+
+def _run(func, *args):
+    pool, slots = _executor()
+    if not slots.acquire(blocking=False):
+        raise HashingBusy(settings.PASSWORD_HASH_RETRY_AFTER)
+    try:
+        if pool is None:
+            return func(*args)
+        return pool.submit(func, *args).result()
+    except BrokenProcessPool:
+        # A worker died; start over on the next request rather than failing forever
+        reset()
+        raise HashingBusy(settings.PASSWORD_HASH_RETRY_AFTER)
+    finally:
+        slots.release()
+
+
+def make_password(password):
+    """``django.contrib.auth.hashers.make_password`` run in the pool."""
+    return _run(_make, password)
+
+
+def make_passwords(passwords):
+    """
+    Hash many passwords across the whole pool, for batch jobs. Batch jobs
+    aren't admission-controlled.
+    """
+    pool, _ = _executor()
+    if pool is None:
+        return [_make(password) for password in passwords]
+    return list(pool.map(_make, passwords, chunksize=16))
+
+
+def authenticate(username, password):
+    """
+    Pool-backed equivalent of ``authenticate()`` with the model backend.
+    Returns the active user whose password matches, or None.
+    """
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    try:
+        user = User._default_manager.get_by_natural_key(username)
+    except User.DoesNotExist:
+        # Spend the same hashing time as a real check so the response
+        # doesn't reveal whether the username exists
+        make_password(password)
+        return None
+
+    correct, outdated = _run(_check, password, user.password)
+    if not correct or not user.is_active:
+        return None
+    if outdated:
+        user.password = make_password(password)
+        user.save(update_fields=['password'])
+    return user
@@ -0,0 +1,123 @@
+"""
+Idempotency keys for create endpoints.
+
+Clients that retry a POST after a timeout can't tell whether the first
+attempt went through. A view wrapped with ``idempotent`` accepts an
+``Idempotency-Key`` header: the first successful response is stored under
+that key in the same database transaction as the rows it created, and a
+retry with the same key gets the stored response back (with an
+``Idempotent-Replayed: true`` header) after one primary key read, without
+validating or writing anything.
+
+* Keys belong to the user and the path, so two users (or the transaction
+  and transfer endpoints) can use the same key without clashing.
+* A retry has to send the same body; reusing a key for a different
+  request answers 422.
+* Only 2xx responses are stored. A request that failed wrote nothing, so
+  retrying it runs it again.
+* Stored responses expire after ``IDEMPOTENCY_KEY_TTL`` seconds;
+  ``purge_idempotency_keys`` deletes the expired rows.
+
+Requests with a key don't use the write queue (banking.write_queue): the
+key has to commit with the transaction, and rows saved inside an atomic
+block are written directly.
+"""
+import functools
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction as db_transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+
+class _Duplicate(Exception):
+    """Another request stored the same key first; roll back and replay theirs."""
+
+
+def _hash(*parts):
+    return hashlib.blake2b(b'\n'.join(parts), digest_size=16).hexdigest()
+
+
+def digest_for(request, key):
+    return _hash(str(request.user.pk).encode(), request.path.encode(), key.encode())
+
+
+def lookup(digest):
+    """The unexpired stored response for ``digest``, or None."""
+    stored = IdempotencyKey.objects.filter(pk=digest).first()
+    if stored is None or stored.expires_at <= timezone.now():
+        return None
+    return stored
+
+
+def replay(stored, fingerprint):
+    if stored.fingerprint != fingerprint:
+        return Response(
+            {"detail": f"This {HEADER} was already used for a different request"},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(stored.body, status=stored.status, headers={REPLAYED_HEADER: 'true'})
+
+
+def purge_expired():
+    """Delete expired keys. Returns how many were removed."""
+    deleted, _ = IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def idempotent(view_method):
+    """Decorate a DRF view method (``create`` or an action) to honour ``Idempotency-Key``."""
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        digest = digest_for(request, key)
+        fingerprint = _hash(request.body)
+        stored = lookup(digest)
+        if stored is not None:
+            return replay(stored, fingerprint)
+
+        try:
+            with db_transaction.atomic():
+                response = view_method(self, request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    _store(digest, fingerprint, response)
+        except _Duplicate:
+            return replay(lookup(digest), fingerprint)
+        return response
+
+    return wrapper
+
+
+def _store(digest, fingerprint, response):
+    now = timezone.now()
+    # Make room if an expired response is still stored under this key
+    IdempotencyKey.objects.filter(pk=digest, expires_at__lte=now).delete()
+    try:
+        with db_transaction.atomic():
+            IdempotencyKey.objects.create(
+                digest=digest,
+                fingerprint=fingerprint,
+                status=response.status_code,
+                body=response.data,
+                expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+            )
+    except IntegrityError:
+        raise _Duplicate()
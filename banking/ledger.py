@@ -0,0 +1,220 @@
+"""
+Write-time bookkeeping for transactions.
+
+Every change to the ``Transaction`` table goes through ``apply`` (insert) or
+``reverse`` (delete), which keep the derived per-account state in step with
+the transaction log inside the caller's database transaction:
+
+* ``Account.balance``
+* ``Account.round_up_pot`` and its ``RoundUp`` history
+* the spending rollups in ``banking.rollups``
+* month-end balance checkpoints, dropped when a backdated write makes them
+  wrong (``banking.checkpoints``)
+
+``rebuild`` recomputes balances and pots from scratch and is what the
+``rebuild_ledger`` management command runs.
+"""
+from collections import defaultdict
+from decimal import Decimal, ROUND_CEILING
+
+from django.db import transaction as db_transaction
+from django.db.models import F, Sum
+
+from .models import Account, RoundUp, Transaction
+from . import checkpoints, rollups
+
+# Types that move money out of ``from_account`` and, when set, into ``to_account``
+DEBIT_TYPES = ('payment', 'withdrawal', 'transfer', 'collect_roundup')
+# Types that pay money into ``from_account``
+CREDIT_TYPES = ('deposit',)
+# Moves money from the round-up pot back into the balance of ``from_account``
+RECLAIM_TYPE = 'roundup_reclaim'
+
+ZERO = Decimal('0.00')
+CENT = Decimal('0.01')
+
+
+def balance_deltas(transactions, sign=1):
+    """
+    Return a mapping of account id to the net balance change caused by the
+    given transactions, ignoring round-ups. ``sign=-1`` gives the change
+    needed to undo them.
+    """
+    deltas = defaultdict(Decimal)
+    for txn in transactions:
+        amount = txn.amount * sign
+        if txn.transaction_type in DEBIT_TYPES:
+            deltas[txn.from_account_id] -= amount
+            if txn.to_account_id is not None:
+                deltas[txn.to_account_id] += amount
+        elif txn.transaction_type in CREDIT_TYPES:
+            deltas[txn.from_account_id] += amount
+    return {account_id: delta for account_id, delta in deltas.items() if delta}
+
+
+def spare_change(amount):
+    """The amount needed to round a payment up to the next whole unit."""
+    return amount.quantize(Decimal('1'), rounding=ROUND_CEILING) - amount
+
+
+def round_ups_for(transactions):
+    """
+    Build the (unsaved) ``RoundUp`` entries caused by the given transactions:
+    spare change on payments from round-up enabled accounts, and the pot
+    withdrawal for reclaims.
+    """
+    payer_ids = {txn.from_account_id for txn in transactions if txn.transaction_type == 'payment'}
+    enabled = set(
+        Account.objects.filter(pk__in=payer_ids, round_up_enabled=True).values_list('id', flat=True)
+    ) if payer_ids else set()
+
+    entries = []
+    for txn in transactions:
+        if txn.transaction_type == 'payment' and txn.from_account_id in enabled:
+            amount = spare_change(txn.amount)
+        elif txn.transaction_type == RECLAIM_TYPE:
+            amount = -txn.amount
+        else:
+            continue
+        if amount:
+            entries.append(RoundUp(
+                account_id=txn.from_account_id,
+                transaction_id=txn.pk,
+                amount=amount,
+                timestamp=txn.timestamp,
+            ))
+    return entries
+
+
+def _update_accounts(balance_changes, pot_changes):
+    # One UPDATE per account; F() keeps concurrent writers from losing updates
+    for account_id in set(balance_changes) | set(pot_changes):
+        Account.objects.filter(pk=account_id).update(
+            balance=F('balance') + balance_changes.get(account_id, ZERO),
+            round_up_pot=F('round_up_pot') + pot_changes.get(account_id, ZERO),
+        )
+
+
+def _pot_deltas(entries, sign=1):
+    deltas = defaultdict(Decimal)
+    for entry in entries:
+        deltas[entry.account_id] += entry.amount * sign
+    return deltas
+
+
+def apply(transactions):
+    """
+    Apply the effects of newly written transactions. Callers are expected to
+    run this in the same atomic block as the insert.
+    """
+    transactions = list(transactions)
+    with db_transaction.atomic():
+        entries = round_ups_for(transactions)
+        RoundUp.objects.bulk_create(entries)
+
+        balances = defaultdict(Decimal, balance_deltas(transactions))
+        pots = _pot_deltas(entries)
+        # Round-ups move money between the balance and the pot
+        for account_id, amount in pots.items():
+            balances[account_id] -= amount
+        _update_accounts(balances, pots)
+        rollups.apply(transactions)
+        checkpoints.discard_stale(transactions)
+
+
+def reverse(transactions):
+    """Undo the effects of transactions that are being deleted or replaced."""
+    transactions = list(transactions)
+    with db_transaction.atomic():
+        stored = RoundUp.objects.filter(transaction_id__in=[txn.pk for txn in transactions])
+        entries = list(stored)
+        stored.delete()
+
+        balances = defaultdict(Decimal, balance_deltas(transactions, sign=-1))
+        pots = _pot_deltas(entries, sign=-1)
+        for account_id, amount in pots.items():
+            balances[account_id] -= amount
+        _update_accounts(balances, pots)
+        rollups.apply(transactions, sign=-1)
+        checkpoints.discard_stale(transactions)
+
+
+def _sums(queryset, key):
+    # SQLite adds decimals as floats; round back to whole cents
+    return {
+        row[key]: row['total'].quantize(CENT)
+        for row in queryset.values(key).annotate(total=Sum('amount')).order_by()
+    }
+
+
+def net_changes(since=None, until=None, account_ids=None):
+    """
+    Net balance and round-up pot changes per account from transactions
+    timestamped in ``[since, until)`` (either end may be open), optionally
+    only for ``account_ids``. Returns a mapping of account id to
+    ``(balance change, pot change)`` for accounts that moved.
+    """
+    window = {}
+    if since is not None:
+        window['timestamp__gte'] = since
+    if until is not None:
+        window['timestamp__lt'] = until
+    transactions = Transaction.objects.filter(**window)
+    round_ups = RoundUp.objects.filter(**window)
+    outgoing = incoming = transactions
+    if account_ids is not None:
+        outgoing = transactions.filter(from_account__in=account_ids)
+        incoming = transactions.filter(to_account__in=account_ids)
+        round_ups = round_ups.filter(account__in=account_ids)
+
+    debits = _sums(outgoing.filter(transaction_type__in=DEBIT_TYPES), 'from_account')
+    received = _sums(incoming.filter(transaction_type__in=DEBIT_TYPES, to_account__isnull=False), 'to_account')
+    credits = _sums(outgoing.filter(transaction_type__in=CREDIT_TYPES), 'from_account')
+    pots = _sums(round_ups, 'account')
+
+    changes = {}
+    for account_id in set(debits) | set(received) | set(credits) | set(pots):
+        pot = pots.get(account_id, ZERO)
+        changes[account_id] = (
+            received.get(account_id, ZERO)
+            + credits.get(account_id, ZERO)
+            - debits.get(account_id, ZERO)
+            - pot,
+            pot,
+        )
+    return changes
+
+
+def computed_balances():
+    """
+    Recompute every account balance and round-up pot from the transaction
+    log and round-up history with a handful of grouped queries. Returns a
+    mapping of account id to ``(balance, round_up_pot)``.
+    """
+    changes = net_changes()
+    balances = {}
+    for account_id, starting_balance in Account.objects.values_list('id', 'starting_balance'):
+        balance, pot = changes.get(account_id, (ZERO, ZERO))
+        balances[account_id] = (starting_balance + balance, pot)
+    return balances
+
+
+def rebuild(check_only=False):
+    """
+    Compare every stored balance and round-up pot with those recomputed from
+    the log, and overwrite any that have drifted unless ``check_only`` is
+    set. Returns a list of ``(account_id, field, stored, expected)``
+    mismatches.
+    """
+    mismatches = []
+    with db_transaction.atomic():
+        expected = computed_balances()
+        for account_id, balance, pot in Account.objects.values_list('id', 'balance', 'round_up_pot'):
+            expected_balance, expected_pot = expected[account_id]
+            if balance != expected_balance:
+                mismatches.append((account_id, 'balance', balance, expected_balance))
+            if pot != expected_pot:
+                mismatches.append((account_id, 'round_up_pot', pot, expected_pot))
+            if not check_only and (balance, pot) != (expected_balance, expected_pot):
+                Account.objects.filter(pk=account_id).update(balance=expected_balance, round_up_pot=expected_pot)
+    return mismatches
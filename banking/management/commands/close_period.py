@@ -0,0 +1,51 @@
+import time
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from banking import checkpoints
+
+
+def parse_month(value):
+    try:
+        return datetime.strptime(value, '%Y-%m')
+    except ValueError:
+        raise CommandError(f"Expected a month as YYYY-MM, got {value!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Write month-end balance checkpoints for every account, which point-in-time balance "
+        "queries start from. Closes the last completed month by default; run it early each month."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help="Month to close as YYYY-MM (default: last month).")
+        parser.add_argument('--since', help="Close every month from this one (YYYY-MM) through last month, in order.")
+        parser.add_argument('--batch-size', type=int, default=1000, help="Checkpoints inserted per query.")
+
+    def handle(self, *args, **options):
+        if options['month'] and options['since']:
+            raise CommandError("Use either --month or --since, not both.")
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        last = checkpoints.last_closable()
+        if options['month'] or options['since']:
+            first = parse_month(options['month'] or options['since'])
+            period_end = checkpoints.next_month(checkpoints.month_start(first))
+        else:
+            period_end = last
+        final = period_end if options['month'] else last
+        if period_end > last:
+            raise CommandError("That month hasn't ended yet.")
+
+        # Oldest first, so each month starts from the one before
+        while period_end <= final:
+            start = time.perf_counter()
+            written = checkpoints.close(period_end, batch_size=options['batch_size'])
+            month = checkpoints.month_start(period_end - timedelta(days=1))
+            self.stdout.write(self.style.SUCCESS(
+                f"Closed {month:%Y-%m}: {written} checkpoint(s) in {time.perf_counter() - start:.1f}s."
+            ))
+            period_end = checkpoints.next_month(period_end)
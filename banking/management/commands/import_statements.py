@@ -0,0 +1,80 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from banking import ledger, rollups, statements
+from banking.models import StatementImport
+
+
+class Command(BaseCommand):
+    help = (
+        "Import historical transactions from CSV or JSON Lines files with the fields "
+        "transaction_type, amount, from_account, timestamp and optionally to_account and business. "
+        "Progress is checkpointed per file, so re-running after an interruption resumes where it "
+        "stopped. Balances and spending rollups are rebuilt once at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help="Files to import.")
+        parser.add_argument('--format', choices=statements.FORMATS,
+                            help="File format (default: jsonl for .jsonl/.ndjson/.json files, otherwise csv).")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows inserted per batch.")
+        parser.add_argument('--restart', action='store_true',
+                            help="Forget earlier progress on these files and import them from the start.")
+        parser.add_argument('--no-rebuild', action='store_true',
+                            help="Skip rebuilding balances and rollups (run rebuild_ledger later).")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        sources = []
+        for path in options['paths']:
+            if not os.path.isfile(path):
+                raise CommandError(f"Can't read {path}: no such file")
+            sources.append(os.path.abspath(path))
+        if options['restart']:
+            StatementImport.objects.filter(source__in=sources).delete()
+
+        importer = statements.Importer()
+        for path in sources:
+            self.import_file(importer, path, options['format'] or statements.detect_format(path), options['batch_size'])
+
+        if options['no_rebuild']:
+            self.stdout.write("Skipped the rebuild; balances are stale until rebuild_ledger runs.")
+            return
+        start = time.perf_counter()
+        mismatches = ledger.rebuild()
+        daily, monthly = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {len(mismatches)} balance(s) and pot(s), {daily} daily and {monthly} monthly "
+            f"rollup(s) in {time.perf_counter() - start:.1f}s."
+        ))
+
+    def import_file(self, importer, path, fmt, batch_size):
+        start = time.perf_counter()
+        previous = StatementImport.objects.filter(source=path).first()
+        if previous is not None and previous.completed:
+            self.stdout.write(f"{path}: already imported ({previous.inserted} rows); use --restart to import it again")
+            return
+        resumed_from = previous.rows_done if previous is not None else 0
+
+        def on_error(number, error):
+            self.stderr.write(f"{path}: row {number} skipped: {error}")
+
+        def on_batch(checkpoint):
+            elapsed = time.perf_counter() - start
+            done = checkpoint.rows_done - resumed_from
+            self.stdout.write(f"{path}: {checkpoint.rows_done} rows ({done / elapsed:.0f} rows/s)")
+
+        if resumed_from:
+            self.stdout.write(f"{path}: resuming after row {resumed_from}")
+        with open(path, newline='', encoding='utf-8') as source:
+            checkpoint = importer.run(
+                statements.read_rows(source, fmt), path,
+                batch_size=batch_size, on_error=on_error, on_batch=on_batch,
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{path}: {checkpoint.inserted} imported, {checkpoint.rejected} skipped "
+            f"in {time.perf_counter() - start:.1f}s."
+        ))
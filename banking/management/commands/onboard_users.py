@@ -0,0 +1,49 @@
+import contextlib
+import csv
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from banking import registration
+
+
+class Command(BaseCommand):
+    help = (
+        "Register users and their default accounts from a CSV file with a header row of "
+        "username,password,email,first_name,last_name (only username is required)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV file to read, or - for stdin.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Users inserted per batch.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        queries = []
+
+        def count_queries(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        try:
+            handle = contextlib.nullcontext(sys.stdin) if path == '-' else open(path, newline='', encoding='utf-8')
+        except OSError as e:
+            raise CommandError(f"Can't read {path}: {e}")
+
+        start = time.perf_counter()
+        with handle as source, connection.execute_wrapper(count_queries):
+            reader = csv.DictReader(source)
+            if not reader.fieldnames or 'username' not in reader.fieldnames:
+                raise CommandError("The file needs a header row with a username column.")
+            created, skipped = registration.register_users(reader, batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - start
+
+        for username in skipped:
+            self.stdout.write(f"Skipped {username or '(blank username)'}: blank or already registered")
+        per_user = len(queries) / created if created else 0
+        self.stdout.write(self.style.SUCCESS(
+            f"Registered {created} user(s) in {elapsed:.1f}s "
+            f"({len(queries)} queries, {per_user:.2f} per user); skipped {len(skipped)}."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from banking import idempotency
+
+
+class Command(BaseCommand):
+    help = "Delete stored Idempotency-Key responses that have expired. Safe to run from cron."
+
+    def handle(self, *args, **options):
+        deleted = idempotency.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired idempotency key(s)."))
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from banking import ledger, rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute account balances and round-up pots from the transaction log and fix any "
+        "that have drifted, then rebuild the spending rollups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help="Only report balance and pot mismatches; don't write anything. Exits non-zero if any are found.",
+        )
+
+    def handle(self, *args, **options):
+        check_only = options['check']
+        mismatches = ledger.rebuild(check_only=check_only)
+
+        for account_id, field, stored, expected in mismatches:
+            self.stdout.write(f"{account_id} {field}: stored {stored}, expected {expected}")
+
+        if not mismatches:
+            self.stdout.write(self.style.SUCCESS("All balances and pots match the transaction log."))
+        elif check_only:
+            raise CommandError(f"{len(mismatches)} value(s) out of step.")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(mismatches)} value(s)."))
+
+        if not check_only:
+            daily, monthly = rollups.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {daily} daily and {monthly} monthly spending rollup(s)."))
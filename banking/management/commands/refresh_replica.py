@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from banking import routers
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy the primary database to the read replica used by the reporting endpoints. "
+        "Run it more often than REPLICA_MAX_STALENESS, or reports fall back to the primary."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=float,
+            help="Skip the refresh if the replica is younger than this many seconds.",
+        )
+
+    def handle(self, *args, **options):
+        source = connections[DEFAULT_DB_ALIAS]
+        if source.vendor != 'sqlite':
+            raise CommandError("refresh_replica copies SQLite databases only.")
+        path = settings.REPLICA_DATABASE_PATH
+
+        lag = routers.replica_lag()
+        if options['max_age'] is not None and lag is not None and lag < options['max_age']:
+            self.stdout.write(f"Replica is {lag:.0f}s old; not refreshing.")
+            return
+
+        start = time.perf_counter()
+        # Copy to a temporary file and swap it in, so readers never see a partial copy
+        tmp_path = f'{path}.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        source.ensure_connection()
+        target = sqlite3.connect(tmp_path)
+        try:
+            # The online backup API copies a consistent snapshot without blocking writers
+            source.connection.backup(target)
+            # A self-contained file: no WAL for an old copy's readers to trip over
+            target.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            target.close()
+        os.replace(tmp_path, path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed replica {path} in {time.perf_counter() - start:.2f}s."
+        ))
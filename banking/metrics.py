@@ -0,0 +1,221 @@
+"""
+Per-route request metrics in Prometheus text format.
+
+``MetricsMiddleware`` times every request and counts the database queries
+it makes, and how long they take, under the route it resolved to (the URL
+name, e.g. ``transaction-spending-summary`` or ``api-login``). Queries are
+counted by an execute wrapper that every new connection gets (see
+``install_query_counter``). The wrapper finds the current request's
+counters through a context variable, so it works the same for sync views,
+async views and the threads ``sync_to_async`` runs them on. The recording
+cost is a couple of clock reads per query and one short lock per request.
+
+``metrics_view`` serves the totals to staff at ``/api/metrics/``. They
+are kept per process, so under gunicorn each scrape sees the worker that
+answered it; label the scrape target per worker or sum across them.
+Latency is measured until the view returns its response, so a streamed
+export's body isn't included.
+"""
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.views import View
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+# Requests that didn't resolve to a route share one label, so scanners can't grow the registry
+UNMATCHED = 'unmatched'
+# Likewise for request methods Django doesn't know
+OTHER_METHOD = 'OTHER'
+KNOWN_METHODS = frozenset(method.upper() for method in View.http_method_names)
+
+_current = ContextVar('banking_request_metrics', default=None)
+
+
+class RequestCounters:
+    __slots__ = ('queries', 'db_time')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+
+
+def _record_query(execute, sql, params, many, context):
+    counters = _current.get()
+    if counters is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        counters.queries += 1
+        counters.db_time += time.perf_counter() - start
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+class RouteStats:
+    __slots__ = ('buckets', 'count', 'duration', 'queries', 'db_time', 'statuses')
+
+    def __init__(self, bucket_count):
+        self.buckets = [0] * bucket_count
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.db_time = 0.0
+        self.statuses = {}
+
+
+class Registry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.routes = {}
+
+    def observe(self, route, method, status, duration, counters):
+        bounds = settings.METRICS_LATENCY_BUCKETS
+        status_class = f'{status // 100}xx'
+        with self.lock:
+            stats = self.routes.get((route, method))
+            if stats is None:
+                stats = self.routes[(route, method)] = RouteStats(len(bounds))
+            for i, bound in enumerate(bounds):
+                if duration <= bound:
+                    stats.buckets[i] += 1
+                    break
+            stats.count += 1
+            stats.duration += duration
+            stats.queries += counters.queries
+            stats.db_time += counters.db_time
+            stats.statuses[status_class] = stats.statuses.get(status_class, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                key: (list(stats.buckets), stats.count, stats.duration, stats.queries,
+                      stats.db_time, dict(stats.statuses))
+                for key, stats in self.routes.items()
+            }
+
+    def clear(self):
+        with self.lock:
+            self.routes.clear()
+
+
+registry = Registry()
+
+
+def route_of(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED
+    return match.view_name or match.route or UNMATCHED
+
+
+def method_of(request):
+    return request.method if request.method in KNOWN_METHODS else OTHER_METHOD
+
+
+def _labels(**labels):
+    def escape(value):
+        return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+def render():
+    """The registry in Prometheus text exposition format."""
+    bounds = settings.METRICS_LATENCY_BUCKETS
+    snapshot = sorted(registry.snapshot().items())
+    lines = [
+        '# HELP http_request_duration_seconds Request latency by route.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (route, method), (buckets, count, duration, _, _, _) in snapshot:
+        cumulative = 0
+        for bound, observed in zip(bounds, buckets):
+            cumulative += observed
+            lines.append(f'http_request_duration_seconds_bucket'
+                         f'{_labels(route=route, method=method, le=repr(float(bound)))} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{_labels(route=route, method=method, le="+Inf")} {count}')
+        lines.append(f'http_request_duration_seconds_sum{_labels(route=route, method=method)} {duration}')
+        lines.append(f'http_request_duration_seconds_count{_labels(route=route, method=method)} {count}')
+
+    lines += [
+        '# HELP http_responses_total Responses by route and status class.',
+        '# TYPE http_responses_total counter',
+    ]
+    for (route, method), (_, _, _, _, _, statuses) in snapshot:
+        for status_class, total in sorted(statuses.items()):
+            lines.append(f'http_responses_total{_labels(route=route, method=method, status=status_class)} {total}')
+
+    lines += [
+        '# HELP http_request_db_queries_total Database queries made while serving the route.',
+        '# TYPE http_request_db_queries_total counter',
+    ]
+    for (route, method), (_, _, _, queries, _, _) in snapshot:
+        lines.append(f'http_request_db_queries_total{_labels(route=route, method=method)} {queries}')
+
+    lines += [
+        '# HELP http_request_db_seconds_total Time spent in database queries while serving the route.',
+        '# TYPE http_request_db_seconds_total counter',
+    ]
+    for (route, method), (_, _, _, _, db_time, _) in snapshot:
+        lines.append(f'http_request_db_seconds_total{_labels(route=route, method=method)} {db_time}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        counters = RequestCounters()
+        token = _current.set(counters)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        registry.observe(route_of(request), method_of(request), response.status_code,
+                         time.perf_counter() - start, counters)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        counters = RequestCounters()
+        token = _current.set(counters)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        registry.observe(route_of(request), method_of(request), response.status_code,
+                         time.perf_counter() - start, counters)
+        return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def metrics_view(request):
+    return HttpResponse(render(), content_type=CONTENT_TYPE)
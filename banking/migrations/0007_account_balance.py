@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:58
+
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_balances(apps, schema_editor):
+    Account = apps.get_model('banking', 'Account')
+    Transaction = apps.get_model('banking', 'Transaction')
+
+    def sums(queryset, key):
+        return {row[key]: row['total'] for row in queryset.values(key).annotate(total=Sum('amount')).order_by()}
+
+    debit_types = ('payment', 'withdrawal', 'transfer', 'collect_roundup')
+    credit_types = ('deposit', 'roundup_reclaim')
+    debits = sums(Transaction.objects.filter(transaction_type__in=debit_types), 'from_account')
+    incoming = sums(Transaction.objects.filter(transaction_type__in=debit_types, to_account__isnull=False), 'to_account')
+    credits = sums(Transaction.objects.filter(transaction_type__in=credit_types), 'from_account')
+
+    for account in Account.objects.all():
+        account.balance = (
+            account.starting_balance
+            - (debits.get(account.id) or 0)
+            + (incoming.get(account.id) or 0)
+            + (credits.get(account.id) or 0)
+        )
+        account.save(update_fields=['balance'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0006_account_account_type_account_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='account',
+            name='balance',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
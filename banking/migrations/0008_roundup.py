@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:59
+
+from collections import defaultdict
+from decimal import Decimal, ROUND_CEILING
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def replay_round_ups(apps, schema_editor):
+    """
+    Write the round-up history for existing transactions by the ledger's
+    rules: spare change on payments from round-up enabled accounts goes into
+    the pot, and reclaims move money from the pot back into the balance.
+    Each account's pot and balance are then set to match.
+    """
+    Account = apps.get_model('banking', 'Account')
+    Transaction = apps.get_model('banking', 'Transaction')
+    RoundUp = apps.get_model('banking', 'RoundUp')
+
+    enabled = set(Account.objects.filter(round_up_enabled=True).values_list('id', flat=True))
+    entries = []
+    for txn in Transaction.objects.filter(transaction_type__in=('payment', 'roundup_reclaim')).iterator():
+        if txn.transaction_type == 'roundup_reclaim':
+            amount = -txn.amount
+        elif txn.from_account_id in enabled:
+            amount = txn.amount.quantize(Decimal('1'), rounding=ROUND_CEILING) - txn.amount
+        else:
+            continue
+        if amount:
+            entries.append(RoundUp(account_id=txn.from_account_id, transaction_id=txn.pk, amount=amount,
+                                   timestamp=txn.timestamp))
+    RoundUp.objects.bulk_create(entries, batch_size=1000)
+
+    pots = defaultdict(Decimal)
+    spare = defaultdict(Decimal)
+    for entry in entries:
+        pots[entry.account_id] += entry.amount
+        if entry.amount > 0:
+            spare[entry.account_id] += entry.amount
+    # The 0007 backfill already credited reclaims to the balance; spare change comes out of it
+    for account in Account.objects.all():
+        pot = pots.get(account.id, Decimal('0.00'))
+        if account.round_up_pot == pot and account.id not in spare:
+            continue
+        account.round_up_pot = pot
+        account.balance -= spare.get(account.id, 0)
+        account.save(update_fields=['round_up_pot', 'balance'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0007_account_balance'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoundUp',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('timestamp', models.DateTimeField()),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='round_ups', to='banking.account')),
+                ('transaction', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='round_ups', to='banking.transaction')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['account', '-timestamp'], name='roundup_account_ts_idx')],
+            },
+        ),
+        migrations.RunPython(replay_round_ups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+
+
+def backfill_rollups(apps, schema_editor):
+    Transaction = apps.get_model('banking', 'Transaction')
+    DailySpending = apps.get_model('banking', 'DailySpending')
+    MonthlySpending = apps.get_model('banking', 'MonthlySpending')
+
+    for model, period_field, trunc in ((DailySpending, 'day', TruncDate), (MonthlySpending, 'month', TruncMonth)):
+        rows = (
+            Transaction.objects.filter(transaction_type='payment')
+            .annotate(period=trunc('timestamp', output_field=DateField()))
+            .values('from_account', 'business__category', 'period')
+            .annotate(total=Sum('amount'), count=Count('id'))
+            .order_by()
+        )
+        model.objects.bulk_create([
+            model(**{
+                'account_id': row['from_account'],
+                'category': row['business__category'] or '',
+                period_field: row['period'],
+                'total': row['total'],
+                'count': row['count'],
+            })
+            for row in rows
+        ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0008_roundup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySpending',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, default='', max_length=50)),
+                ('day', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_spending', to='banking.account')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('account', 'day', 'category'), name='daily_spending_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MonthlySpending',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, default='', max_length=50)),
+                ('month', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_spending', to='banking.account')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('account', 'month', 'category'), name='monthly_spending_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
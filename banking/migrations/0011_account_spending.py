@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_account_spending(apps, schema_editor):
+    MonthlySpending = apps.get_model('banking', 'MonthlySpending')
+    AccountSpending = apps.get_model('banking', 'AccountSpending')
+
+    rows = MonthlySpending.objects.values('account').annotate(total=Sum('total'), count=Sum('count')).order_by()
+    AccountSpending.objects.bulk_create([
+        AccountSpending(account_id=row['account'], total_spent=row['total'], count=row['count'])
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0010_transaction_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AccountSpending',
+            fields=[
+                ('account', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='spending', serialize=False, to='banking.account')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailyspending',
+            index=models.Index(fields=['day', 'account'], name='daily_spending_day_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accountspending',
+            index=models.Index(fields=['-total_spent'], name='account_spending_total_idx'),
+        ),
+        migrations.RunPython(backfill_account_spending, migrations.RunPython.noop),
+    ]
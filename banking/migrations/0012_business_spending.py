@@ -0,0 +1,86 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_business_spending(apps, schema_editor):
+    Transaction = apps.get_model('banking', 'Transaction')
+    BusinessSpending = apps.get_model('banking', 'BusinessSpending')
+    BusinessAccountDailySpending = apps.get_model('banking', 'BusinessAccountDailySpending')
+
+    rows = (
+        Transaction.objects.filter(business__isnull=False)
+        .annotate(period=TruncDate('timestamp'))
+        .values('business', 'from_account', 'period')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    BusinessAccountDailySpending.objects.bulk_create([
+        BusinessAccountDailySpending(
+            business_id=row['business'],
+            account_id=row['from_account'],
+            day=row['period'],
+            total=row['total'],
+            count=row['count'],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+    rows = BusinessAccountDailySpending.objects.values('business').annotate(total=Sum('total'), count=Sum('count')).order_by()
+    BusinessSpending.objects.bulk_create([
+        BusinessSpending(business_id=row['business'], total_spent=row['total'], count=row['count'])
+        for row in rows
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0011_account_spending'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessAccountDailySpending',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('total', models.DecimalField(decimal_places=2, default=0.0, max_digits=12)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='BusinessSpending',
+            fields=[
+                ('business', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='spending', serialize=False, to='banking.business')),
+                ('total_spent', models.DecimalField(decimal_places=2, default=0.0, max_digits=14)),
+                ('count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='business',
+            index=models.Index(condition=models.Q(('sanctioned', True)), fields=['id'], name='business_sanctioned_idx'),
+        ),
+        migrations.AddField(
+            model_name='businessaccountdailyspending',
+            name='account',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='business_daily_spending', to='banking.account'),
+        ),
+        migrations.AddField(
+            model_name='businessaccountdailyspending',
+            name='business',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_spending', to='banking.business'),
+        ),
+        migrations.AddIndex(
+            model_name='businessaccountdailyspending',
+            index=models.Index(fields=['business', 'day'], name='business_daily_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='businessaccountdailyspending',
+            constraint=models.UniqueConstraint(fields=('business', 'account', 'day'), name='business_account_daily_unique'),
+        ),
+        migrations.RunPython(backfill_business_spending, migrations.RunPython.noop),
+    ]
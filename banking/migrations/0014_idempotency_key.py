@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:02
+
+import rest_framework.utils.encoders
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('banking', '0013_statement_import'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyKey',
+            fields=[
+                ('digest', models.CharField(max_length=32, primary_key=True, serialize=False)),
+                ('fingerprint', models.CharField(max_length=32)),
+                ('status', models.PositiveSmallIntegerField()),
+                ('body', models.JSONField(encoder=rest_framework.utils.encoders.JSONEncoder)),
+                ('expires_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -1,6 +1,9 @@
 import uuid
-from django.db import models
+from decimal import Decimal
+from django.db import models, transaction as db_transaction
+from django.utils import timezone
 from django.contrib.auth.models import User
+from rest_framework.utils.encoders import JSONEncoder
 
 class Account(models.Model):
     ACCOUNT_TYPES = [
@@ -16,11 +19,47 @@ class Account(models.Model):
     round_up_enabled = models.BooleanField(default=False)
     postcode = models.CharField(max_length=10, null=True, blank=True)
     round_up_pot = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    # Running balance, maintained by banking.ledger as transactions are written
+    balance = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     # Add user field to associate with Django User
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='accounts', null=True, blank=True)
     # Add account type field
     account_type = models.CharField(max_length=20, choices=ACCOUNT_TYPES, default='current')
 
+    # Written only by banking.ledger, with F() updates, once the account exists
+    LEDGER_FIELDS = frozenset({'balance', 'round_up_pot'})
+
+    def save(self, *args, **kwargs):
+        # A new account has no transactions yet, so it opens at its starting balance
+        if self._state.adding:
+            self.balance = self.starting_balance
+            super().save(*args, **kwargs)
+            return
+
+        # Leave the ledger's fields alone: the values in memory may be stale
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            update_fields = {field.name for field in self._meta.concrete_fields if not field.primary_key}
+        update_fields = set(update_fields) - self.LEDGER_FIELDS
+        kwargs['update_fields'] = update_fields
+
+        stored = None
+        if 'starting_balance' in update_fields:
+            stored = Account.objects.filter(pk=self.pk).values_list('starting_balance', flat=True).first()
+        if stored is None or stored == Decimal(self.starting_balance):
+            super().save(*args, **kwargs)
+            return
+
+        # Moving the starting balance moves the running balance by the same amount,
+        # applied in the database so concurrent ledger writes aren't lost
+        self.balance = models.F('balance') + (Decimal(self.starting_balance) - stored)
+        update_fields.add('balance')
+        with db_transaction.atomic():
+            super().save(*args, **kwargs)
+            # Checkpoints were built from the old starting balance
+            self.checkpoints.all().delete()
+        self.refresh_from_db(fields=['balance'])
+
     def __str__(self):
         return self.name
 
@@ -30,6 +69,11 @@ class Business(models.Model):
     category = models.CharField(max_length=50)
     sanctioned = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(sanctioned=True), name='business_sanctioned_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -48,7 +92,222 @@ class Transaction(models.Model):
     from_account = models.ForeignKey(Account, related_name='outgoing_transactions', on_delete=models.CASCADE)
     to_account = models.ForeignKey(Account, related_name='incoming_transactions', on_delete=models.CASCADE, null=True, blank=True)
     business = models.ForeignKey(Business, related_name='transactions', on_delete=models.CASCADE, null=True, blank=True)
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add, so imported history keeps its own dates
+    timestamp = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # spending_summary and per-type filters on one account, newest first
+            models.Index(fields=['from_account', 'transaction_type', 'timestamp'], name='txn_account_type_ts_idx'),
+            # account_transactions, exports and date-range filters on one account
+            models.Index(fields=['from_account', 'timestamp', 'id'], name='txn_account_ts_idx'),
+            # staff listing, paginated on (timestamp, id)
+            models.Index(fields=['timestamp', 'id'], name='txn_ts_id_idx'),
+            # payment-only aggregates (top spenders, spending rollup rebuilds)
+            models.Index(
+                fields=['from_account', 'timestamp'],
+                condition=models.Q(transaction_type='payment'),
+                name='txn_payment_account_ts_idx',
+            ),
+            # merchant reports only ever look at rows linked to a business
+            models.Index(
+                fields=['business', 'timestamp'],
+                condition=models.Q(business__isnull=False),
+                name='txn_business_ts_idx',
+            ),
+            # money received by one account since a balance checkpoint
+            models.Index(
+                fields=['to_account', 'timestamp'],
+                condition=models.Q(to_account__isnull=False),
+                name='txn_to_account_ts_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the transaction and update the affected account balances in the
+        same database transaction. Editing an existing row reverses the
+        effects of the stored version before applying the new one.
+        """
+        from . import ledger
+
+        with db_transaction.atomic(using=kwargs.get('using')):
+            previous = None
+            if not self._state.adding and self.pk is not None:
+                previous = Transaction.objects.filter(pk=self.pk).first()
+            super().save(*args, **kwargs)
+            if previous is not None:
+                ledger.reverse([previous])
+            ledger.apply([self])
+
+    def __str__(self):
+        return f"{self.transaction_type} - {self.amount}"
+
+class RoundUp(models.Model):
+    """
+    One movement of an account's round-up pot: the spare change accrued on a
+    payment (positive) or money reclaimed from the pot (negative). Written by
+    banking.ledger alongside the transaction that caused it.
+    """
+    account = models.ForeignKey(Account, related_name='round_ups', on_delete=models.CASCADE)
+    transaction = models.ForeignKey(Transaction, related_name='round_ups', on_delete=models.CASCADE)
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['account', '-timestamp'], name='roundup_account_ts_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.account} round-up {self.amount}"
+class DailySpending(models.Model):
+    """
+    Total payments out of an account per business category per day. Kept
+    current by banking.rollups as transactions are written; payments with no
+    business are rolled up under an empty category.
+    """
+    account = models.ForeignKey(Account, related_name='daily_spending', on_delete=models.CASCADE)
+    category = models.CharField(max_length=50, blank=True, default='')
+    day = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'day', 'category'], name='daily_spending_unique'),
+        ]
+        indexes = [
+            # windowed leaderboards: every account's spend since a given day
+            models.Index(fields=['day', 'account'], name='daily_spending_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.account} {self.day} {self.category}: {self.total}"
+
+class MonthlySpending(models.Model):
+    """
+    Monthly counterpart of DailySpending. ``month`` is the first day of the
+    month.
+    """
+    account = models.ForeignKey(Account, related_name='monthly_spending', on_delete=models.CASCADE)
+    category = models.CharField(max_length=50, blank=True, default='')
+    month = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'month', 'category'], name='monthly_spending_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.account} {self.month:%Y-%m} {self.category}: {self.total}"
+
+class AccountSpending(models.Model):
+    """
+    All-time payment total per account, kept current by banking.rollups.
+    The descending index lets the top-spenders leaderboard read the first N
+    rows directly.
+    """
+    account = models.OneToOneField(Account, primary_key=True, related_name='spending', on_delete=models.CASCADE)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-total_spent'], name='account_spending_total_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.account}: {self.total_spent}"
+
+class BusinessSpending(models.Model):
+    """
+    Running total of every transaction linked to a business, kept current by
+    banking.rollups. The sanctioned-merchant report joins this to Business
+    at read time, so flipping ``sanctioned`` changes the report immediately.
+    """
+    business = models.OneToOneField(Business, primary_key=True, related_name='spending', on_delete=models.CASCADE)
+    total_spent = models.DecimalField(max_digits=14, decimal_places=2, default=0.00)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.business}: {self.total_spent}"
+
+class BusinessAccountDailySpending(models.Model):
+    """
+    Per business, per paying account, per day totals backing the
+    sanctioned-merchant drill-down.
+    """
+    business = models.ForeignKey(Business, related_name='daily_spending', on_delete=models.CASCADE)
+    account = models.ForeignKey(Account, related_name='business_daily_spending', on_delete=models.CASCADE)
+    day = models.DateField()
+    total = models.DecimalField(max_digits=12, decimal_places=2, default=0.00)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['business', 'account', 'day'], name='business_account_daily_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['business', 'day'], name='business_daily_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.business} {self.account} {self.day}: {self.total}"
+
+class StatementImport(models.Model):
+    """
+    Progress of one ``import_statements`` source. ``rows_done`` is updated
+    in the same database transaction as each inserted batch, so an
+    interrupted import resumes exactly after the last committed row.
+    """
+    source = models.CharField(max_length=255, unique=True)
+    rows_done = models.PositiveBigIntegerField(default=0)
+    inserted = models.PositiveBigIntegerField(default=0)
+    rejected = models.PositiveBigIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.source}: {self.rows_done} rows"
+
+class BalanceCheckpoint(models.Model):
+    """
+    An account's balance and round-up pot at the close of a period, counting
+    every transaction timestamped before ``period_end``. Written by the
+    ``close_period`` command; point-in-time balances start from the latest
+    checkpoint and add only the transactions after it (see
+    banking.checkpoints).
+    """
+    account = models.ForeignKey(Account, related_name='checkpoints', on_delete=models.CASCADE)
+    period_end = models.DateTimeField()
+    balance = models.DecimalField(max_digits=10, decimal_places=2)
+    round_up_pot = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            # Also the index for "latest checkpoint at or before" lookups
+            models.UniqueConstraint(fields=['account', 'period_end'], name='checkpoint_account_period_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.account_id} at {self.period_end}: {self.balance}"
+
+class IdempotencyKey(models.Model):
+    """
+    The response to a create request sent with an ``Idempotency-Key``
+    header, replayed when the client retries (see banking.idempotency).
+    ``digest`` hashes the user, path and key together, so a lookup is one
+    primary key read and keys can't collide across users.
+    """
+    digest = models.CharField(max_length=32, primary_key=True)
+    # Hash of the request body; a retry must send the same body
+    fingerprint = models.CharField(max_length=32)
+    status = models.PositiveSmallIntegerField()
+    body = models.JSONField(encoder=JSONEncoder)
+    expires_at = models.DateTimeField(db_index=True)
 
     def __str__(self):
-        return f"{self.transaction_type} - {self.amount}"
\ No newline at end of file
+        return f"{self.digest}: {self.status}"
@@ -0,0 +1,76 @@
+"""
+Ownership-scoped access to account data.
+
+Account-scoped actions used to load the Account, compare its owner in
+Python (lazily loading the user) and only then run their real query.
+``AccountOwnershipMixin`` folds the ownership check into that query
+instead: non-staff callers only ever see rows whose account they own, so
+the normal path is a single query. Only when the result is empty do we
+need to know why (no such account, someone else's account, or simply no
+rows), and that is answered from the caller's account ids, loaded at most
+once per request.
+"""
+import uuid
+
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import Account
+
+NOT_FOUND = "Account not found"
+FORBIDDEN = "You don't have permission to access this account"
+
+
+def owned_account_ids(request):
+    """The ids of the caller's accounts, queried once per request."""
+    ids = getattr(request, '_owned_account_ids', None)
+    if ids is None:
+        ids = request._owned_account_ids = frozenset(
+            Account.objects.filter(user=request.user).values_list('id', flat=True)
+        )
+    return ids
+
+
+def parse_account_id(account_id):
+    """``account_id`` as a UUID, or None if it can't be one."""
+    try:
+        return uuid.UUID(str(account_id))
+    except ValueError:
+        return None
+
+
+def access_error(request, account_id):
+    """
+    ``(status, detail)`` for the error to answer if the caller can't see
+    ``account_id``, or None if they can. Shared by the sync views (through
+    ``AccountOwnershipMixin``) and the async ones.
+    """
+    account_id = parse_account_id(account_id)
+    if account_id is None:
+        return status.HTTP_404_NOT_FOUND, NOT_FOUND
+    if not request.user.is_staff and account_id in owned_account_ids(request):
+        return None
+    if not Account.objects.filter(pk=account_id).exists():
+        return status.HTTP_404_NOT_FOUND, NOT_FOUND
+    if request.user.is_staff:
+        return None
+    return status.HTTP_403_FORBIDDEN, FORBIDDEN
+
+
+class AccountOwnershipMixin:
+    def scope_to_owner(self, queryset, account_field='from_account'):
+        """Limit ``queryset`` to rows whose ``account_field`` the caller owns."""
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(**{f'{account_field}__user': self.request.user})
+
+    def account_access_error(self, account_id):
+        """
+        Return a 404 or 403 response if the caller can't see ``account_id``,
+        or None if they can.
+        """
+        error = access_error(self.request, account_id)
+        if error is None:
+            return None
+        status_code, detail = error
+        return Response({"detail": detail}, status=status_code)
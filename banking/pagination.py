@@ -0,0 +1,114 @@
+"""
+Keyset (cursor) pagination.
+
+Each page is fetched with ``WHERE (key) after (last key of previous page)
+ORDER BY key LIMIT n``, so page 10,000 costs the same as page 1, unlike
+OFFSET paging. Cursors are signed with the project's SECRET_KEY, so clients
+can pass them back but can't forge or edit them.
+"""
+from collections import OrderedDict
+
+from django.core import signing
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    # Must end in a unique field so every row has a distinct position
+    ordering = ('-id',)
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    @property
+    def salt(self):
+        # Tie cursors to the paginator so one listing's cursor can't be replayed on another
+        return f'{__name__}.{type(self).__name__}'
+
+    def encode_cursor(self, row):
+        values = []
+        for name in self.ordering:
+            value = getattr(row, name.lstrip('-'))
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else str(value))
+        return signing.dumps(values, salt=self.salt, compress=True)
+
+    def decode_cursor(self, queryset, token):
+        try:
+            values = signing.loads(token, salt=self.salt)
+        except signing.BadSignature:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering]
+        return [field.to_python(value) for field, value in zip(fields, values)]
+
+    def keyset_filter(self, values):
+        """
+        Build ``(a, b, c) > (x, y, z)`` (respecting each field's direction)
+        as an OR of prefix-equality terms, which every backend can index.
+        """
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            term = Q(**{f'{field}__{lookup}': values[i]})
+            for prefix, value in zip(self.ordering[:i], values[:i]):
+                term &= Q(**{prefix.lstrip('-'): value})
+            condition |= term
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        token = request.query_params.get(self.cursor_query_param)
+        if token:
+            queryset = queryset.filter(self.keyset_filter(self.decode_cursor(queryset, token)))
+
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class TransactionPagination(KeysetPagination):
+    ordering = ('-timestamp', '-id')
+
+
+class AccountPagination(KeysetPagination):
+    ordering = ('id',)
@@ -0,0 +1,159 @@
+"""
+User registration.
+
+Every registration entry point calls ``register_user``, which creates the
+user and their default accounts in one transaction. The accounts are written
+by the ``create_default_accounts`` signal handler with a single
+``bulk_create``, so users created any other way (admin, createsuperuser) get
+them too. ``register_user`` reads them back inside its own transaction.
+``register_users`` is the batch form used for onboarding whole branches from
+a file.
+"""
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction as db_transaction
+
+from . import hashing
+from .models import Account
+
+# (account type, name template, starting balance, round-up enabled)
+DEFAULT_ACCOUNTS = [
+    ('current', "{name}'s Current Account", Decimal('1000.00'), False),
+    ('savings', "{name}'s Savings Account", Decimal('0.00'), True),
+]
+
+ACCOUNT_ORDER = {account_type: i for i, (account_type, *_) in enumerate(DEFAULT_ACCOUNTS)}
+
+
+class RegistrationError(Exception):
+    """A registration request that can't be fulfilled, e.g. a taken username."""
+
+
+def default_accounts(user):
+    """Unsaved default accounts for ``user``."""
+    name = user.first_name or user.username
+    return [
+        Account(
+            name=template.format(name=name),
+            starting_balance=balance,
+            # bulk_create skips Account.save(), which would set this
+            balance=balance,
+            round_up_enabled=round_up,
+            user=user,
+            account_type=account_type,
+        )
+        for account_type, template, balance, round_up in DEFAULT_ACCOUNTS
+    ]
+
+
+def create_default_accounts(users):
+    """Insert the default accounts for every user in ``users`` at once."""
+    accounts = [account for user in users for account in default_accounts(user)]
+    return Account.objects.bulk_create(accounts, batch_size=500)
+
+
+def register_user(username, password, email='', first_name='', last_name=''):
+    """
+    Create a user and their default accounts atomically. Returns
+    ``(user, accounts)``; raises RegistrationError for missing credentials
+    or a username that's already taken, and hashing.HashingBusy when the
+    hashing pool is saturated.
+    """
+    if not username or not password:
+        raise RegistrationError("Username and password are required")
+
+    # Hash before opening the transaction so no write lock is held meanwhile
+    encoded = hashing.make_password(password)
+    username = User.normalize_username(username)
+    try:
+        with db_transaction.atomic():
+            user = User(
+                username=username,
+                password=encoded,
+                email=User.objects.normalize_email(email or ''),
+                first_name=first_name or '',
+                last_name=last_name or '',
+            )
+            user.save()
+            # Created by the post_save signal, so every way of adding a user gets them
+            accounts = sorted(Account.objects.filter(user=user), key=lambda account: ACCOUNT_ORDER[account.account_type])
+    except IntegrityError:
+        # Only a clash on the username is the caller's fault
+        if User.objects.filter(username=username).exists():
+            raise RegistrationError("Username already exists")
+        raise
+    return user, accounts
+
+
+def register_users(rows, batch_size=500):
+    """
+    Register many users, ``batch_size`` at a time. ``rows`` yields dicts with
+    the ``register_user`` keyword arguments; a blank password leaves the
+    account without a usable password. Each batch costs a fixed handful of
+    queries however many users it holds. Returns ``(created, skipped)``
+    where ``skipped`` lists usernames that were blank or already taken.
+    """
+    created = 0
+    skipped = []
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            created += _register_batch(batch, skipped)
+            batch = []
+    if batch:
+        created += _register_batch(batch, skipped)
+    return created, skipped
+
+
+def _register_batch(rows, skipped):
+    usernames = [row.get('username') for row in rows]
+    taken = set(User.objects.filter(username__in=usernames).values_list('username', flat=True))
+
+    accepted = []
+    seen = set()
+    for row in rows:
+        username = row.get('username')
+        if not username or username in taken or username in seen:
+            skipped.append(username)
+            continue
+        seen.add(username)
+        accepted.append(row)
+    if not accepted:
+        return 0
+
+    passwords = hashing.make_passwords([row.get('password') or None for row in accepted])
+    users = [
+        User(
+            username=row['username'],
+            password=encoded,
+            email=row.get('email') or '',
+            first_name=row.get('first_name') or '',
+            last_name=row.get('last_name') or '',
+        )
+        for row, encoded in zip(accepted, passwords)
+    ]
+
+    with db_transaction.atomic():
+        users = User.objects.bulk_create(users)
+        if any(user.pk is None for user in users):
+            # Backends that can't return ids from a bulk insert
+            ids = dict(User.objects.filter(username__in=seen).values_list('username', 'id'))
+            for user in users:
+                user.pk = ids[user.username]
+        create_default_accounts(users)
+    return len(users)
+
+
+def describe_accounts(accounts):
+    """The account summary returned by the registration endpoints."""
+    return [
+        {
+            "id": str(account.id),
+            "name": account.name,
+            "type": account.get_account_type_display(),
+            "balance": str(account.starting_balance),
+        }
+        for account in accounts
+    ]
@@ -0,0 +1,45 @@
+"""
+Renderers for the line-oriented export formats.
+
+Views that stream large exports return a ``StreamingHttpResponse`` directly
+and only use these classes for content negotiation (``Accept`` header or
+``?format=``). ``render`` covers the small non-streamed responses, such as
+errors, that the same endpoints can return.
+"""
+import csv
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.renderers import BaseRenderer
+
+
+def _rows(data):
+    if data is None:
+        return []
+    return data if isinstance(data, list) else [data]
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return ''.join(json.dumps(row, cls=DjangoJSONEncoder) + '\n' for row in _rows(data)).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = _rows(data)
+        if not rows:
+            return b''
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode(self.charset)
@@ -0,0 +1,234 @@
+"""
+Pre-aggregated spending rollups.
+
+``apply`` folds transactions into the rollup tables as they are written:
+
+* payments into per-(account, category, day) and per-(account, category,
+  month) totals and each account's all-time total, which back
+  ``spending_trends`` and ``top_10_spenders``;
+* anything linked to a business into that business's running total and its
+  per-(account, day) breakdown, which back ``sanctioned_business_report``.
+
+Reporting endpoints therefore read a bounded number of rollup rows rather
+than scanning the transaction history. Payments are filed under their
+business's category at write time; ``recategorise`` re-files them when the
+category changes. ``rebuild`` recomputes all of them
+from the transaction log.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction as db_transaction
+from django.db.models import Count, DateField, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from .models import (
+    AccountSpending, Business, BusinessAccountDailySpending, BusinessSpending, DailySpending, MonthlySpending,
+    Transaction,
+)
+
+# Category used for payments that aren't linked to a business
+UNCATEGORISED = ''
+CENT = Decimal('0.01')
+
+
+def period_day(timestamp):
+    if timezone.is_aware(timestamp):
+        timestamp = timezone.localtime(timestamp)
+    return timestamp.date()
+
+
+def _totals():
+    return defaultdict(lambda: [Decimal('0.00'), 0])
+
+
+class RollupMismatch(Exception):
+    """A removal found no rollup row to subtract from; the rollups need rebuilding."""
+
+
+def _upsert(model, key, total, count, total_field='total'):
+    changes = {total_field: F(total_field) + total, 'count': F('count') + count}
+    if model.objects.filter(**key).update(**changes):
+        return
+    if count < 0:
+        raise RollupMismatch(f"No {model.__name__} row for {key} to remove from; run rebuild_ledger")
+    try:
+        # The savepoint lets a concurrent insert of the same key lose cleanly
+        with db_transaction.atomic():
+            model.objects.create(count=count, **{total_field: total}, **key)
+    except IntegrityError:
+        if not model.objects.filter(**key).update(**changes):
+            raise
+
+
+def _apply_spending(payments, sign):
+    business_ids = {txn.business_id for txn in payments if txn.business_id}
+    categories = dict(
+        Business.objects.filter(pk__in=business_ids).values_list('id', 'category')
+    ) if business_ids else {}
+
+    daily = _totals()
+    for txn in payments:
+        key = (txn.from_account_id, categories.get(txn.business_id, UNCATEGORISED), period_day(txn.timestamp))
+        daily[key][0] += txn.amount * sign
+        daily[key][1] += sign
+
+    monthly = _totals()
+    for (account_id, category, day), (total, count) in daily.items():
+        key = (account_id, category, day.replace(day=1))
+        monthly[key][0] += total
+        monthly[key][1] += count
+
+    accounts = _totals()
+    for (account_id, _, _), (total, count) in monthly.items():
+        accounts[account_id][0] += total
+        accounts[account_id][1] += count
+
+    for (account_id, category, day), (total, count) in daily.items():
+        _upsert(DailySpending, {'account_id': account_id, 'category': category, 'day': day}, total, count)
+    for (account_id, category, month), (total, count) in monthly.items():
+        _upsert(MonthlySpending, {'account_id': account_id, 'category': category, 'month': month}, total, count)
+    for account_id, (total, count) in accounts.items():
+        _upsert(AccountSpending, {'account_id': account_id}, total, count, total_field='total_spent')
+    if sign < 0:
+        DailySpending.objects.filter(account_id__in=accounts, count=0).delete()
+        MonthlySpending.objects.filter(account_id__in=accounts, count=0).delete()
+        AccountSpending.objects.filter(account_id__in=accounts, count=0).delete()
+
+
+def _apply_business(linked, sign):
+    daily = _totals()
+    for txn in linked:
+        key = (txn.business_id, txn.from_account_id, period_day(txn.timestamp))
+        daily[key][0] += txn.amount * sign
+        daily[key][1] += sign
+
+    businesses = _totals()
+    for (business_id, _, _), (total, count) in daily.items():
+        businesses[business_id][0] += total
+        businesses[business_id][1] += count
+
+    for (business_id, account_id, day), (total, count) in daily.items():
+        key = {'business_id': business_id, 'account_id': account_id, 'day': day}
+        _upsert(BusinessAccountDailySpending, key, total, count)
+    for business_id, (total, count) in businesses.items():
+        _upsert(BusinessSpending, {'business_id': business_id}, total, count, total_field='total_spent')
+    if sign < 0:
+        BusinessAccountDailySpending.objects.filter(business_id__in=businesses, count=0).delete()
+        BusinessSpending.objects.filter(business_id__in=businesses, count=0).delete()
+
+
+def apply(transactions, sign=1):
+    """
+    Add the given transactions to the rollups, or remove them with
+    ``sign=-1``.
+    """
+    payments = [txn for txn in transactions if txn.transaction_type == 'payment']
+    linked = [txn for txn in transactions if txn.business_id]
+    if not payments and not linked:
+        return
+
+    with db_transaction.atomic():
+        if payments:
+            _apply_spending(payments, sign)
+        if linked:
+            _apply_business(linked, sign)
+
+
+def recategorise(business_id, old_category, new_category):
+    """
+    Move a business's past payments from ``old_category`` to
+    ``new_category`` in the per-category rollups, so later removals find
+    the rows they were added to. Called when a business changes category.
+    """
+    payments = Transaction.objects.filter(business_id=business_id, transaction_type='payment')
+    with db_transaction.atomic():
+        for trunc, model, period_field in ((TruncDate, DailySpending, 'day'), (TruncMonth, MonthlySpending, 'month')):
+            rows = list(
+                payments.annotate(period=trunc('timestamp', output_field=DateField()))
+                .values('from_account', 'period')
+                .annotate(total=Sum('amount'), count=Count('id'))
+                .order_by()
+            )
+            for row in rows:
+                key = {'account_id': row['from_account'], period_field: row['period']}
+                total = row['total'].quantize(CENT)
+                _upsert(model, {**key, 'category': old_category}, -total, -row['count'])
+                _upsert(model, {**key, 'category': new_category}, total, row['count'])
+            accounts = {row['from_account'] for row in rows}
+            model.objects.filter(account_id__in=accounts, category=old_category, count=0).delete()
+
+
+def _aggregate(trunc):
+    return (
+        Transaction.objects.filter(transaction_type='payment')
+        .annotate(period=trunc('timestamp', output_field=DateField()))
+        .values('from_account', 'business__category', 'period')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+
+
+def _spending_rows(trunc, period_field):
+    for row in _aggregate(trunc).iterator():
+        yield {
+            'account_id': row['from_account'],
+            'category': row['business__category'] or UNCATEGORISED,
+            period_field: row['period'],
+            'total': row['total'],
+            'count': row['count'],
+        }
+
+
+def _business_rows():
+    rows = (
+        Transaction.objects.filter(business__isnull=False)
+        .annotate(period=TruncDate('timestamp'))
+        .values('business', 'from_account', 'period')
+        .annotate(total=Sum('amount'), count=Count('id'))
+        .order_by()
+    )
+    for row in rows.iterator():
+        yield {
+            'business_id': row['business'],
+            'account_id': row['from_account'],
+            'day': row['period'],
+            'total': row['total'],
+            'count': row['count'],
+        }
+
+
+def _grand_totals(model, key):
+    rows = model.objects.values(key).annotate(total=Sum('total'), count=Sum('count')).order_by()
+    for row in rows.iterator():
+        yield {f'{key}_id': row[key], 'total_spent': row['total'], 'count': row['count']}
+
+
+def _write(model, rows, batch_size):
+    written = 0
+    batch = []
+    for row in rows:
+        batch.append(model(**row))
+        if len(batch) >= batch_size:
+            model.objects.bulk_create(batch)
+            written += len(batch)
+            batch = []
+    model.objects.bulk_create(batch)
+    return written + len(batch)
+
+
+def rebuild(batch_size=1000):
+    """
+    Replace every rollup row with totals recomputed from the transaction log.
+    Returns the number of daily and monthly spending rows written.
+    """
+    with db_transaction.atomic():
+        for model in (DailySpending, MonthlySpending, AccountSpending, BusinessAccountDailySpending, BusinessSpending):
+            model.objects.all().delete()
+        daily = _write(DailySpending, _spending_rows(TruncDate, 'day'), batch_size)
+        monthly = _write(MonthlySpending, _spending_rows(TruncMonth, 'month'), batch_size)
+        _write(AccountSpending, _grand_totals(MonthlySpending, 'account'), batch_size)
+        _write(BusinessAccountDailySpending, _business_rows(), batch_size)
+        _write(BusinessSpending, _grand_totals(BusinessAccountDailySpending, 'business'), batch_size)
+    return daily, monthly
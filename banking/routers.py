@@ -0,0 +1,76 @@
+"""
+Read-replica routing for reporting queries.
+
+The reporting endpoints (top spenders, the sanctioned-business report,
+spending summaries and trends) scan large tables. ``use_replica()`` sends
+the reads made inside it to the ``REPLICA_DATABASE_ALIAS`` database, a
+read-only copy of the primary that ``manage.py refresh_replica`` rebuilds
+periodically. Everything else, and every write, stays on the primary.
+
+The copy is used only while it is fresh. If the file at
+``REPLICA_DATABASE_PATH`` is missing, or was last refreshed more than
+``REPLICA_MAX_STALENESS`` seconds ago, the reads go to the primary
+instead. Ownership checks should run outside ``use_replica()`` so they
+always see current data.
+"""
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+# Alias reads are routed to inside use_replica(); None outside it
+_read_alias = ContextVar('banking_read_alias', default=None)
+
+
+def replica_alias():
+    return getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+
+
+def replica_lag():
+    """Seconds since the replica was last refreshed, or None if there's no replica."""
+    path = getattr(settings, 'REPLICA_DATABASE_PATH', None)
+    if not path or replica_alias() not in settings.DATABASES:
+        return None
+    try:
+        refreshed = os.stat(path).st_mtime
+    except OSError:
+        return None
+    return max(time.time() - refreshed, 0.0)
+
+
+def read_alias():
+    """The database reporting reads should use right now."""
+    lag = replica_lag()
+    if lag is None or lag > settings.REPLICA_MAX_STALENESS:
+        return DEFAULT_DB_ALIAS
+    return replica_alias()
+
+
+@contextmanager
+def use_replica():
+    """Route the reads made inside the block to the replica while it's fresh enough."""
+    # Decided once on entry so a block never mixes the two databases
+    token = _read_alias.set(read_alias())
+    try:
+        yield _read_alias.get()
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica is a copy of the primary, schema included
+        return db != replica_alias()
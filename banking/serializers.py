@@ -1,5 +1,7 @@
+from decimal import Decimal
+
 from rest_framework import serializers
-from .models import Account, Transaction, Business
+from .models import Account, Transaction, Business, RoundUp
 from django.contrib.auth.models import User
 
 class UserSerializer(serializers.ModelSerializer):
@@ -17,13 +19,49 @@ class AccountSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'starting_balance', 'round_up_enabled', 
             'postcode', 'user', 'user_details', 'account_type', 
-            'account_type_display', 'round_up_pot'
+            'account_type_display', 'round_up_pot', 'balance'
         ]
-        
+        read_only_fields = ['balance', 'round_up_pot']
+
+class AccountSummarySerializer(serializers.ModelSerializer):
+    """
+    Flat, read-only account representation for list endpoints. Reads only
+    columns on the account row, so listing n accounts costs one query.
+    """
+    class Meta:
+        model = Account
+        fields = ['id', 'name', 'account_type', 'balance', 'round_up_enabled', 'round_up_pot', 'user']
+        read_only_fields = fields
+
 class TransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transaction
         fields = ['id', 'transaction_type', 'amount', 'from_account', 'to_account', 'business', 'timestamp']
+        # Set by the server; only the import command writes historical timestamps
+        read_only_fields = ['timestamp']
+
+class TransferSerializer(serializers.Serializer):
+    from_account = serializers.UUIDField()
+    to_account = serializers.UUIDField()
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+
+class TransactionBulkRowSerializer(serializers.Serializer):
+    """
+    One row of a bulk transaction upload. References are validated as plain
+    ids here and resolved for the whole batch at once by the view, rather
+    than one related-object query per row.
+    """
+    transaction_type = serializers.ChoiceField(choices=Transaction.TRANSACTION_TYPES)
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2)
+    from_account = serializers.UUIDField()
+    to_account = serializers.UUIDField(required=False, allow_null=True)
+    business = serializers.CharField(max_length=50, required=False, allow_null=True)
+
+class RoundUpSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RoundUp
+        fields = ['id', 'transaction', 'amount', 'timestamp']
+        read_only_fields = fields
 
 class BusinessSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,32 +1,64 @@
-from django.db.models.signals import post_save
+from django.db import transaction as db_transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Account
-from decimal import Decimal
+from .models import Business, Transaction
+from . import authentication, catalogue, ledger, registration, rollups
 
 @receiver(post_save, sender=User)
 def create_default_accounts(sender, instance, created, **kwargs):
     """
     Signal to create default Current and Savings accounts when a new user is created.
-    Only runs when a new user is created (not on updates).
-    """
-    if created:
-        # Check if the user already has accounts (to prevent duplicates)
-        if not Account.objects.filter(user=instance).exists():
-            # Create Current Account
-            Account.objects.create(
-                name=f"{instance.first_name or instance.username}'s Current Account",
-                starting_balance=Decimal('1000.00'),
-                round_up_enabled=False,
-                user=instance,
-                account_type='current'
-            )
-            
-            # Create Savings Account
-            Account.objects.create(
-                name=f"{instance.first_name or instance.username}'s Savings Account",
-                starting_balance=Decimal('0.00'),
-                round_up_enabled=True,  # Enable round-up for savings by default
-                user=instance,
-                account_type='savings'
-            )
\ No newline at end of file
+    Only runs when a new user is created (not on updates). A brand-new user can't
+    own accounts yet, so both are inserted with one bulk_create.
+    """
+    if created and not kwargs.get('raw'):
+        registration.create_default_accounts([instance])
+
+@receiver(pre_delete, sender=Transaction)
+def reverse_deleted_transaction(sender, instance, **kwargs):
+    """
+    Undo a deleted transaction's effect on balances and round-up pots. This
+    runs before the row's round-up history is cascaded away, inside the
+    collector's atomic block, so the update commits with the delete.
+    """
+    ledger.reverse([instance])
+
+@receiver(post_save, sender=Business)
+@receiver(post_delete, sender=Business)
+def invalidate_business_catalogue(sender, **kwargs):
+    """
+    Drop cached catalogue payloads when a business is written. The version is
+    bumped again on commit so a reader that re-cached the old rows while the
+    write was in flight doesn't keep them.
+    """
+    catalogue.invalidate()
+    db_transaction.on_commit(catalogue.invalidate)
+
+@receiver(pre_save, sender=Business)
+def remember_business_category(sender, instance, raw=False, **kwargs):
+    """Note the stored category so a change can be detected after the save."""
+    if not raw:
+        instance._stored_category = Business.objects.filter(pk=instance.pk).values_list('category', flat=True).first()
+
+@receiver(post_save, sender=Business)
+def refile_business_spending(sender, instance, created, raw=False, **kwargs):
+    """
+    Move the business's past payments to its new category in the spending
+    rollups, which are keyed by category.
+    """
+    previous = getattr(instance, '_stored_category', None)
+    if not raw and previous is not None and previous != instance.category:
+        rollups.recategorise(instance.pk, previous, instance.category)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    """
+    Drop the user's cached authentication entry when the row is written, so
+    deactivation and password changes apply to the next request. As with the
+    catalogue, it's dropped again on commit in case a request re-cached the
+    old row in the meantime.
+    """
+    authentication.forget(instance)
+    db_transaction.on_commit(lambda: authentication.forget(instance))
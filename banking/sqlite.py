@@ -0,0 +1,56 @@
+"""
+SQLite tuning for concurrent use.
+
+With the defaults, a writer blocks every reader and a second writer fails
+straight away with "database is locked". Every new SQLite connection is
+therefore configured from ``settings.SQLITE_PRAGMAS``:
+
+* ``synchronous=NORMAL``: syncs far less often, and under WAL is still
+  safe against corruption
+* ``mmap_size`` / ``cache_size``: keep hot pages in memory
+
+``SQLITE_WAL`` (off unless the ``SQLITE_WAL`` environment variable is
+``1``; the Docker image turns it on) adds ``journal_mode=WAL``, so readers
+no longer block on the writer. WAL mode is stored in the database file and
+leaves ``-wal``/``-shm`` files beside it, so it stays off for checkouts
+and test runs.
+
+Set ``SQLITE_PRAGMAS = {}`` to leave connections untouched. How long a
+writer waits for the lock is the ``timeout`` database option, which sets
+SQLite's busy timeout when the connection opens.
+
+Connections to the read replica (see banking.routers) keep the copy's own
+journal mode, so no WAL files outlive a refresh, and are set to
+``query_only`` so nothing can write to them.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+DEFAULT_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    # Negative means KiB rather than pages
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+def pragmas():
+    values = dict(getattr(settings, 'SQLITE_PRAGMAS', DEFAULT_PRAGMAS))
+    if getattr(settings, 'SQLITE_WAL', False):
+        values.setdefault('journal_mode', 'WAL')
+    return values
+
+
+@receiver(connection_created)
+def tune_connection(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    values = pragmas()
+    if connection.alias == getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica'):
+        values.pop('journal_mode', None)
+        values['query_only'] = 'ON'
+    with connection.cursor() as cursor:
+        for name, value in values.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
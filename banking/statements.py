@@ -0,0 +1,151 @@
+"""
+Bulk import of historical statement lines.
+
+Sources are CSV (with a header row) or JSON Lines files whose rows carry
+``transaction_type``, ``amount``, ``from_account``, ``timestamp`` and
+optionally ``to_account`` and ``business``. Files are read a row at a
+time, and rows are inserted with ``bulk_create`` in batches, so memory use
+doesn't grow with the file. Account and business ids are checked against
+sets loaded once per import, not a query per row.
+
+The ledger isn't applied row by row. Balances and rollups are rebuilt once
+after the import (``ledger.rebuild`` and ``rollups.rebuild``). Imported
+payments don't accrue round-ups, since the feature didn't exist when they
+were made. Until the rebuild, balances don't include the imported rows.
+Balance checkpoints after the earliest imported row are dropped with each
+batch (see banking.checkpoints).
+"""
+import csv
+import json
+from datetime import datetime, time
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.db import transaction as db_transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Account, Business, StatementImport, Transaction
+from .ownership import parse_account_id
+from . import checkpoints
+
+FORMATS = ('csv', 'jsonl')
+TRANSACTION_TYPES = {value for value, _ in Transaction.TRANSACTION_TYPES}
+AMOUNT_LIMIT = Decimal('1e8')
+
+
+class RowError(ValueError):
+    pass
+
+
+def detect_format(path):
+    return 'jsonl' if str(path).endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+
+def read_rows(source, fmt):
+    """Yield each row of the text stream ``source`` as a dict (or a RowError for an unreadable line)."""
+    if fmt == 'csv':
+        yield from csv.DictReader(source)
+        return
+    for line in source:
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield RowError(f"invalid JSON: {e}")
+            continue
+        yield row if isinstance(row, dict) else RowError("expected a JSON object")
+
+
+def parse_timestamp(value):
+    value = str(value or '').strip()
+    try:
+        parsed = parse_datetime(value)
+        day = parse_date(value) if parsed is None else None
+    except ValueError:
+        parsed = day = None
+    if parsed is None:
+        if day is None:
+            raise RowError(f"timestamp {value!r} is not an ISO date or datetime")
+        parsed = datetime.combine(day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class Importer:
+    def __init__(self):
+        # Built once per import; statement history references existing rows only
+        self.accounts = set(Account.objects.values_list('id', flat=True))
+        self.businesses = set(Business.objects.values_list('id', flat=True))
+
+    def account(self, value, field, required=True):
+        if not value:
+            if required:
+                raise RowError(f"{field} is required")
+            return None
+        account_id = parse_account_id(value)
+        if account_id is None or account_id not in self.accounts:
+            raise RowError(f"{field} {value!r} not found")
+        return account_id
+
+    def build(self, row):
+        """Turn one source row into an unsaved Transaction, or raise RowError."""
+        if isinstance(row, RowError):
+            raise row
+        kind = str(row.get('transaction_type') or '').strip()
+        if kind not in TRANSACTION_TYPES:
+            raise RowError(f"unknown transaction_type {kind!r}")
+        try:
+            amount = Decimal(str(row.get('amount')).strip()).quantize(Decimal('0.01'))
+        except (InvalidOperation, ValueError):
+            raise RowError(f"amount {row.get('amount')!r} is not a number")
+        if amount <= 0 or amount >= AMOUNT_LIMIT:
+            raise RowError(f"amount {row.get('amount')!r} is out of range")
+        business = str(row.get('business') or '').strip() or None
+        if business is not None and business not in self.businesses:
+            raise RowError(f"business {business!r} not found")
+        return Transaction(
+            transaction_type=kind,
+            amount=amount,
+            from_account_id=self.account(row.get('from_account'), 'from_account'),
+            to_account_id=self.account(row.get('to_account'), 'to_account', required=False),
+            business_id=business,
+            timestamp=parse_timestamp(row.get('timestamp')),
+        )
+
+    def run(self, rows, source, batch_size=5000, on_error=None, on_batch=None):
+        """
+        Import ``rows`` under the checkpoint name ``source``, skipping rows an
+        earlier run already committed. Returns the StatementImport record.
+        """
+        checkpoint, _ = StatementImport.objects.get_or_create(source=source)
+        if checkpoint.completed:
+            return checkpoint
+        rows = enumerate(islice(rows, checkpoint.rows_done, None), start=checkpoint.rows_done + 1)
+        while True:
+            chunk = list(islice(rows, batch_size))
+            if not chunk:
+                break
+            batch = []
+            rejected = 0
+            for number, row in chunk:
+                try:
+                    batch.append(self.build(row))
+                except RowError as e:
+                    rejected += 1
+                    if on_error:
+                        on_error(number, e)
+            with db_transaction.atomic():
+                Transaction.objects.bulk_create(batch)
+                checkpoints.discard_stale(batch)
+                checkpoint.rows_done += len(chunk)
+                checkpoint.inserted += len(batch)
+                checkpoint.rejected += rejected
+                checkpoint.save()
+            if on_batch:
+                on_batch(checkpoint)
+        checkpoint.completed = True
+        checkpoint.save()
+        return checkpoint
@@ -4,10 +4,9 @@ Template-based registration view that doesn't rely on REST framework.
 from django.shortcuts import render, redirect
 from django.http import JsonResponse
 from django.views import View
-from django.contrib.auth.models import User
 from django.contrib import messages
-from .models import Account
-from decimal import Decimal
+from .hashing import HashingBusy
+from .registration import RegistrationError, describe_accounts, register_user
 
 class TemplateRegistrationView(View):
     """
@@ -27,79 +26,34 @@ class TemplateRegistrationView(View):
         """
         Process registration form data and create user + accounts.
         """
-        # Extract form data
-        username = request.POST.get('username')
-        password = request.POST.get('password')
-        email = request.POST.get('email', '')
-        first_name = request.POST.get('first_name', '')
-        last_name = request.POST.get('last_name', '')
-        
-        # Validate required fields
-        if not username or not password:
-            messages.error(request, 'Username and password are required')
-            return render(request, self.template_name, {})
-        
-        # Check if username already exists
-        if User.objects.filter(username=username).exists():
-            messages.error(request, 'Username already exists')
-            return render(request, self.template_name, {})
-        
         try:
-            # Create the user
-            user = User.objects.create_user(
-                username=username,
-                password=password,
-                email=email,
-                first_name=first_name,
-                last_name=last_name
+            user, accounts = register_user(
+                username=request.POST.get('username'),
+                password=request.POST.get('password'),
+                email=request.POST.get('email', ''),
+                first_name=request.POST.get('first_name', ''),
+                last_name=request.POST.get('last_name', ''),
             )
-            
-            # Create default Current Account
-            current_account = Account.objects.create(
-                name=f"{first_name or username}'s Current Account",
-                starting_balance=Decimal('1000.00'),
-                round_up_enabled=False,
-                user=user,
-                account_type='current'
-            )
-            
-            # Create default Savings Account
-            savings_account = Account.objects.create(
-                name=f"{first_name or username}'s Savings Account",
-                starting_balance=Decimal('0.00'),
-                round_up_enabled=True,
-                user=user,
-                account_type='savings'
-            )
-            
-            # Success message
-            messages.success(request, 'Registration successful! Two accounts created.')
-            
-            # Redirect to login page (or AJAX response for API)
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                return JsonResponse({
-                    'status': 'success',
-                    'message': 'Registration successful',
-                    'accounts': [
-                        {
-                            'id': str(current_account.id),
-                            'name': current_account.name,
-                            'type': current_account.get_account_type_display(),
-                            'balance': str(current_account.starting_balance)
-                        },
-                        {
-                            'id': str(savings_account.id),
-                            'name': savings_account.name,
-                            'type': savings_account.get_account_type_display(),
-                            'balance': str(savings_account.starting_balance)
-                        }
-                    ]
-                })
-            return redirect('login')  # Redirect to login page
-            
-        except Exception as e:
-            messages.error(request, f'Error creating user: {str(e)}')
+        except RegistrationError as e:
+            messages.error(request, str(e))
             return render(request, self.template_name, {})
+        except HashingBusy as e:
+            messages.error(request, 'Registration is busy, please try again shortly')
+            response = render(request, self.template_name, {}, status=503)
+            response['Retry-After'] = str(e.retry_after)
+            return response
+
+        # Success message
+        messages.success(request, 'Registration successful! Two accounts created.')
+
+        # Redirect to login page (or AJAX response for API)
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            return JsonResponse({
+                'status': 'success',
+                'message': 'Registration successful',
+                'accounts': describe_accounts(accounts),
+            })
+        return redirect('login')  # Redirect to login page
 
 # API-style functions that don't require REST framework
 def register_api(request):
@@ -122,71 +76,27 @@ def register_api(request):
         except json.JSONDecodeError:
             return JsonResponse({'error': 'Invalid JSON'}, status=400)
         
-        # Extract user data
-        username = data.get('username')
-        password = data.get('password')
-        email = data.get('email', '')
-        first_name = data.get('first_name', '')
-        last_name = data.get('last_name', '')
-        
-        # Validate required fields
-        if not username or not password:
-            return JsonResponse({'error': 'Username and password are required'}, status=400)
-        
-        # Check if username already exists
-        if User.objects.filter(username=username).exists():
-            return JsonResponse({'error': 'Username already exists'}, status=400)
-        
         try:
-            # Create the user
-            user = User.objects.create_user(
-                username=username,
-                password=password,
-                email=email,
-                first_name=first_name,
-                last_name=last_name
-            )
-            
-            # Create default Current Account
-            current_account = Account.objects.create(
-                name=f"{first_name or username}'s Current Account",
-                starting_balance=Decimal('1000.00'),
-                round_up_enabled=False,
-                user=user,
-                account_type='current'
+            user, accounts = register_user(
+                username=data.get('username'),
+                password=data.get('password'),
+                email=data.get('email', ''),
+                first_name=data.get('first_name', ''),
+                last_name=data.get('last_name', ''),
             )
-            
-            # Create default Savings Account
-            savings_account = Account.objects.create(
-                name=f"{first_name or username}'s Savings Account",
-                starting_balance=Decimal('0.00'),
-                round_up_enabled=True,
-                user=user,
-                account_type='savings'
-            )
-            
-            # Return success response
-            return JsonResponse({
-                'message': 'User registered successfully',
-                'user_id': user.id,
-                'accounts': [
-                    {
-                        'id': str(current_account.id),
-                        'name': current_account.name,
-                        'type': current_account.get_account_type_display(),
-                        'balance': str(current_account.starting_balance)
-                    },
-                    {
-                        'id': str(savings_account.id),
-                        'name': savings_account.name,
-                        'type': savings_account.get_account_type_display(),
-                        'balance': str(savings_account.starting_balance)
-                    }
-                ]
-            }, status=201)
-            
-        except Exception as e:
-            return JsonResponse({'error': f'Error creating user: {str(e)}'}, status=500)
+        except RegistrationError as e:
+            return JsonResponse({'error': str(e)}, status=400)
+        except HashingBusy as e:
+            response = JsonResponse({'error': str(e)}, status=503)
+            response['Retry-After'] = str(e.retry_after)
+            return response
+
+        # Return success response
+        return JsonResponse({
+            'message': 'User registered successfully',
+            'user_id': user.id,
+            'accounts': describe_accounts(accounts),
+        }, status=201)
     
     else:
         return JsonResponse({'error': 'Method not allowed'}, status=405)
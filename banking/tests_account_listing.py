@@ -0,0 +1,65 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class AccountListingQueryCountTestCase(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="liststaff", password="password", is_staff=True)
+        self.customer = User.objects.create_user(username="listcustomer", password="password")
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(user).access_token))
+
+    def add_accounts(self, count):
+        for i in range(count):
+            owner = User.objects.create_user(username=f"owner{Account.objects.count()}", password="password")
+            Account.objects.create(name=f"Account {i}", starting_balance=Decimal('10.00'), user=owner)
+
+    def list_queries(self, url):
+        # Resolve the token user first so both measurements see it cached
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries), response
+
+    def test_staff_listing_query_count_is_constant(self):
+        self.authenticate(self.staff)
+        url = reverse('account-list')
+        self.add_accounts(2)
+        few, _ = self.list_queries(url)
+        self.add_accounts(20)
+        many, response = self.list_queries(url)
+        self.assertEqual(few, many)
+        self.assertGreater(len(response.data['results']), 20)
+
+    def test_my_accounts_query_count_is_constant(self):
+        self.authenticate(self.customer)
+        url = reverse('account-my-accounts')
+        Account.objects.create(name="One", starting_balance=Decimal('1.00'), user=self.customer)
+        few, _ = self.list_queries(url)
+        for i in range(10):
+            Account.objects.create(name=f"More {i}", starting_balance=Decimal('1.00'), user=self.customer)
+        many, response = self.list_queries(url)
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data), Account.objects.filter(user=self.customer).count())
+
+    def test_listing_is_flat_and_detail_is_full(self):
+        self.authenticate(self.staff)
+        account = Account.objects.create(name="Flat", starting_balance=Decimal('5.00'), user=self.customer)
+
+        response = self.client.get(reverse('account-list'))
+        row = next(row for row in response.data['results'] if row['id'] == str(account.id))
+        self.assertNotIn('user_details', row)
+        self.assertEqual(row['user'], self.customer.id)
+
+        response = self.client.get(reverse('account-detail', args=[account.id]))
+        self.assertEqual(response.data['user_details']['username'], 'listcustomer')
+        self.assertEqual(response.data['account_type_display'], 'Current')
@@ -0,0 +1,84 @@
+import json
+
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, Business
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class AsyncReadEndpointsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="asyncuser", password="password")
+        self.other = User.objects.create_user(username="asyncother", password="password")
+        self.account = Account.objects.filter(user=self.user, account_type='current').get()
+        self.business = Business.objects.create(id="deli", name="Deli", category="Food")
+        Transaction.objects.create(
+            transaction_type="payment", amount=Decimal('12.50'), from_account=self.account, business=self.business,
+        )
+        Transaction.objects.create(transaction_type="deposit", amount=Decimal('40.00'), from_account=self.account)
+
+        self.token = 'Bearer ' + str(RefreshToken.for_user(self.user).access_token)
+        self.sync_client = APIClient()
+        self.sync_client.credentials(HTTP_AUTHORIZATION=self.token)
+
+    async def get(self, name, *args, token=None, **params):
+        return await self.async_client.get(
+            reverse(name, args=args), params, headers={'Authorization': token or self.token},
+        )
+
+    def sync_json(self, url, **params):
+        return json.loads(self.sync_client.get(url, params, HTTP_ACCEPT='application/json').content)
+
+    async def test_matches_sync_endpoints(self):
+        account_id = str(self.account.id)
+        pairs = [
+            (await self.get('async-my-accounts'), reverse('account-my-accounts')),
+            (await self.get('async-user-accounts'), reverse('api-user')),
+            (await self.get('async-account-transactions', account_id), reverse('transaction-account-transactions', args=[account_id])),
+            (await self.get('async-spending-summary', account_id), reverse('transaction-spending-summary', args=[account_id])),
+        ]
+        for response, sync_url in pairs:
+            self.assertEqual(response.status_code, 200)
+            expected = await self.run_sync(self.sync_json, sync_url)
+            self.assertEqual(response.json(), expected, sync_url)
+
+    async def test_time_range_filter(self):
+        response = await self.get('async-account-transactions', str(self.account.id), since='2999-01-01')
+        self.assertEqual(response.json(), [])
+        response = await self.get('async-account-transactions', str(self.account.id), since='yesterday')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_authentication_and_ownership(self):
+        response = await self.async_client.get(reverse('async-my-accounts'))
+        self.assertEqual(response.status_code, 401)
+        response = await self.get('async-my-accounts', token='Bearer not-a-token')
+        self.assertEqual(response.status_code, 401)
+
+        other_token = 'Bearer ' + str(RefreshToken.for_user(self.other).access_token)
+        response = await self.get('async-spending-summary', str(self.account.id), token=other_token)
+        self.assertEqual(response.status_code, 403)
+        response = await self.get('async-spending-summary', 'not-a-uuid')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_access_errors_match_sync_endpoints(self):
+        other_account = await Account.objects.filter(user=self.other).afirst()
+        endpoints = [
+            ('async-account-transactions', 'transaction-account-transactions'),
+            ('async-spending-summary', 'transaction-spending-summary'),
+        ]
+        for account_id in (str(other_account.id), '00000000-0000-4000-8000-000000000000', 'not-a-uuid'):
+            for async_name, sync_name in endpoints:
+                response = await self.get(async_name, account_id)
+                sync_response = await self.run_sync(
+                    self.sync_client.get, reverse(sync_name, args=[account_id]), HTTP_ACCEPT='application/json',
+                )
+                self.assertEqual(response.status_code, sync_response.status_code, (async_name, account_id))
+                self.assertEqual(response.json(), json.loads(sync_response.content), (async_name, account_id))
+
+    @staticmethod
+    async def run_sync(func, *args, **kwargs):
+        from asgiref.sync import sync_to_async
+        return await sync_to_async(func)(*args, **kwargs)
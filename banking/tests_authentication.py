@@ -0,0 +1,61 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from . import authentication
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+    def setUp(self):
+        authentication.users.clear()
+        self.user = User.objects.create_user(username="cacheduser", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        self.url = reverse('account-my-accounts')
+
+    def user_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [query for query in context.captured_queries if 'FROM "auth_user"' in query['sql']]
+
+    def test_user_is_loaded_once(self):
+        self.assertEqual(len(self.user_queries()), 1)
+        self.assertEqual(self.user_queries(), [])
+
+    def test_deactivation_takes_effect_immediately(self):
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_is_rejected(self):
+        self.client.get(self.url)
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_flag_is_refreshed_on_save(self):
+        self.client.get(self.url)
+        self.user.is_staff = True
+        self.user.save()
+        cached = authentication.users.get(self.user.id)
+        self.assertIsNone(cached)
+        self.client.get(self.url)
+        self.assertTrue(authentication.users.get(self.user.id).is_staff)
+
+    @override_settings(AUTH_USER_CACHE_SIZE=1)
+    def test_least_recently_used_entry_is_evicted(self):
+        other = User.objects.create_user(username="cachedother", password="password")
+        authentication.users.put(self.user.id, self.user)
+        authentication.users.put(other.id, other)
+        self.assertIsNone(authentication.users.get(self.user.id))
+        self.assertEqual(authentication.users.get(other.id).username, "cachedother")
+
+    @override_settings(AUTH_USER_CACHE_TTL=0)
+    def test_cache_can_be_disabled(self):
+        self.user_queries()
+        self.assertEqual(len(self.user_queries()), 1)
@@ -0,0 +1,114 @@
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction
+from . import ledger
+from django.contrib.auth.models import User
+from decimal import Decimal
+from io import StringIO
+
+
+class AccountBalanceTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="balanceuser", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
+        self.account = Account.objects.create(
+            name="Balance Current",
+            starting_balance=Decimal('1000.00'),
+            user=self.user,
+        )
+        self.other_account = Account.objects.create(
+            name="Balance Savings",
+            starting_balance=Decimal('0.00'),
+            user=self.user,
+            account_type='savings',
+        )
+
+    def balance_of(self, account):
+        account.refresh_from_db()
+        return account.balance
+
+    def test_new_account_opens_at_starting_balance(self):
+        self.assertEqual(self.balance_of(self.account), Decimal('1000.00'))
+
+    def test_outgoing_and_incoming_legs(self):
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('25.00'), from_account=self.account)
+        Transaction.objects.create(transaction_type="deposit", amount=Decimal('10.00'), from_account=self.account)
+        Transaction.objects.create(
+            transaction_type="transfer",
+            amount=Decimal('100.00'),
+            from_account=self.account,
+            to_account=self.other_account,
+        )
+
+        self.assertEqual(self.balance_of(self.account), Decimal('885.00'))
+        self.assertEqual(self.balance_of(self.other_account), Decimal('100.00'))
+
+    def test_delete_and_edit_adjust_balance(self):
+        txn = Transaction.objects.create(transaction_type="withdrawal", amount=Decimal('40.00'), from_account=self.account)
+        txn.amount = Decimal('60.00')
+        txn.save()
+        self.assertEqual(self.balance_of(self.account), Decimal('940.00'))
+
+        txn.delete()
+        self.assertEqual(self.balance_of(self.account), Decimal('1000.00'))
+
+    def test_current_balance_endpoint(self):
+        Transaction.objects.create(transaction_type="withdrawal", amount=Decimal('12.34'), from_account=self.account)
+
+        url = reverse('account-current-balance', args=[self.account.id])
+        with self.assertNumQueries(2):  # token user + account row
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['current_balance']), Decimal('987.66'))
+
+    def test_rebuild_repairs_drift(self):
+        Transaction.objects.create(transaction_type="withdrawal", amount=Decimal('50.00'), from_account=self.account)
+        Account.objects.filter(pk=self.account.pk).update(balance=Decimal('1.00'))
+
+        self.assertEqual(len(ledger.rebuild(check_only=True)), 1)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_ledger', '--check', stdout=StringIO())
+
+        call_command('rebuild_ledger', stdout=StringIO())
+        self.assertEqual(self.balance_of(self.account), Decimal('950.00'))
+        self.assertEqual(ledger.rebuild(check_only=True), [])
+
+    def test_staff_edit_of_starting_balance_moves_balance(self):
+        Transaction.objects.create(transaction_type="withdrawal", amount=Decimal('50.00'), from_account=self.account)
+        staff = User.objects.create_user(username="balancestaff", password="password", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(staff).access_token))
+
+        url = reverse('account-detail', args=[self.account.id])
+        response = self.client.patch(url, {'starting_balance': '1200.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Decimal(response.data['balance']), Decimal('1150.00'))
+        self.assertEqual(self.balance_of(self.account), Decimal('1150.00'))
+        self.assertEqual(ledger.rebuild(check_only=True), [])
+
+        self.account.name = "Renamed"
+        self.account.save()
+        self.assertEqual(self.balance_of(self.account), Decimal('1150.00'))
+
+    def test_saving_a_loaded_account_keeps_ledger_fields(self):
+        loaded = Account.objects.get(pk=self.account.pk)
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('30.00'), from_account=self.account)
+
+        loaded.name = "Renamed"
+        loaded.save()
+        self.assertEqual(self.balance_of(self.account), Decimal('970.00'))
+        self.assertEqual(self.account.name, "Renamed")
+        self.assertEqual(ledger.rebuild(check_only=True), [])
+
+        staff = User.objects.create_user(username="ledgerstaff", password="password", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(staff).access_token))
+        response = self.client.patch(reverse('account-detail', args=[self.account.id]),
+                                     {'name': "Again", 'balance': '1.00', 'round_up_pot': '5.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.balance_of(self.account), Decimal('970.00'))
+        self.assertEqual(self.account.round_up_pot, Decimal('0.00'))
+        self.assertEqual(ledger.rebuild(check_only=True), [])
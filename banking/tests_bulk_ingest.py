@@ -0,0 +1,68 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, Business
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class BulkIngestTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="bulkuser", password="password")
+        self.other_user = User.objects.create_user(username="otheruser", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
+        self.account = Account.objects.create(name="Bulk Current", starting_balance=Decimal('1000.00'), user=self.user)
+        self.other_account = Account.objects.create(name="Other Current", starting_balance=Decimal('0.00'), user=self.other_user)
+        self.business = Business.objects.create(id="shop", name="Shop", category="Retail", sanctioned=False)
+        self.url = reverse('transaction-bulk-ingest')
+
+    def rows(self, count, **overrides):
+        row = {
+            "transaction_type": "payment",
+            "amount": "10.00",
+            "from_account": str(self.account.id),
+            "business": self.business.id,
+        }
+        row.update(overrides)
+        return [dict(row) for _ in range(count)]
+
+    def test_bulk_create_updates_balance(self):
+        response = self.client.post(self.url, self.rows(50), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 50)
+        self.assertEqual(Transaction.objects.filter(from_account=self.account).count(), 50)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.balance, Decimal('500.00'))
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # Prime the rollup rows so both measured batches take the update path
+        self.client.post(self.url, self.rows(1), format='json')
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, self.rows(10), format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {"transactions": self.rows(150)}, format='json')
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(Transaction.objects.count(), 161)
+
+    def test_per_row_errors_reject_whole_batch(self):
+        rows = self.rows(3)
+        rows[1]['from_account'] = str(self.other_account.id)
+        rows[2]['amount'] = "not-a-number"
+
+        response = self.client.post(self.url, rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertIn('from_account', response.data['errors'][0]['errors'])
+        self.assertIn('amount', response.data['errors'][1]['errors'])
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_rejects_oversized_batch(self):
+        with self.settings(BULK_TRANSACTION_MAX_ROWS=5):
+            response = self.client.post(self.url, self.rows(6), format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,62 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Business
+from . import catalogue
+from django.contrib.auth.models import User
+
+
+class BusinessCatalogueCacheTestCase(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user(username="catalogstaff", password="password", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.staff).access_token))
+        self.business = Business.objects.create(id="cafe", name="Cafe", category="Food")
+        self.list_url = reverse('business-list')
+        self.detail_url = reverse('business-detail', args=[self.business.id])
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get(self.list_url)
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in first.data], ['cafe'])
+
+        with self.assertNumQueries(0):  # the token user is cached too
+            second = self.client.get(self.list_url)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_if_none_match_returns_not_modified(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_writes_invalidate_list_and_detail(self):
+        list_etag = self.client.get(self.list_url)['ETag']
+        detail_etag = self.client.get(self.detail_url)['ETag']
+
+        response = self.client.patch(self.detail_url, {'sanctioned': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['sanctioned'])
+
+        Business.objects.create(id="bar", name="Bar", category="Food")
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=list_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(sorted(row['id'] for row in response.data), ['bar', 'cafe'])
+
+    def test_missing_business_is_not_found(self):
+        response = self.client.get(reverse('business-detail', args=['nope']))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_evicted_version_does_not_revive_old_payloads(self):
+        self.client.get(self.list_url)
+        cache.delete(catalogue.VERSION_KEY)
+        # A write the signals don't see, so only a fresh version can pick it up
+        Business.objects.filter(pk=self.business.pk).update(name="Renamed")
+        response = self.client.get(self.list_url)
+        self.assertEqual([row['name'] for row in response.data], ['Renamed'])
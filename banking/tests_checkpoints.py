@@ -0,0 +1,116 @@
+from datetime import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Account, BalanceCheckpoint, Transaction
+from . import checkpoints
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+def at(*args):
+    return timezone.make_aware(datetime(*args))
+
+
+class CheckpointTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="historian", password="password")
+        self.current = Account.objects.filter(user=self.user, account_type='current').get()
+        self.savings = Account.objects.filter(user=self.user, account_type='savings').get()
+        Account.objects.filter(pk=self.current.pk).update(round_up_enabled=True)
+        self.opening = self.current.starting_balance
+        self.record('deposit', '100.00', at(2024, 1, 10))
+        self.record('payment', '2.30', at(2024, 2, 5))
+        self.record('transfer', '50.00', at(2024, 2, 20), to_account=self.savings)
+        self.record('withdrawal', '10.00', at(2024, 3, 1, 9))
+        self.client.force_authenticate(user=self.user)
+
+    def record(self, transaction_type, amount, timestamp, to_account=None):
+        Transaction(transaction_type=transaction_type, amount=Decimal(amount), from_account=self.current,
+                    to_account=to_account, timestamp=timestamp).save()
+
+    def close(self, **options):
+        out = StringIO()
+        call_command('close_period', stdout=out, **options)
+        return out.getvalue()
+
+    def balance_at(self, account, when):
+        response = self.client.get(reverse('account-balance-at', args=[account.id]), {'at': when})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_close_builds_on_previous_month(self):
+        out = self.close(since='2024-01')
+        self.assertIn("Closed 2024-01:", out)
+        self.assertIn("Closed 2024-02:", out)
+
+        january = BalanceCheckpoint.objects.get(account=self.current, period_end=at(2024, 2, 1))
+        self.assertEqual((january.balance, january.round_up_pot), (self.opening + Decimal('100.00'), Decimal('0.00')))
+        february = BalanceCheckpoint.objects.get(account=self.current, period_end=at(2024, 3, 1))
+        self.assertEqual(february.balance, self.opening + Decimal('100.00') - Decimal('3.00') - Decimal('50.00'))
+        self.assertEqual(february.round_up_pot, Decimal('0.70'))
+        self.assertEqual(BalanceCheckpoint.objects.get(account=self.savings, period_end=at(2024, 3, 1)).balance,
+                         Decimal('50.00'))
+
+        # Every checkpoint agrees with the running balance once nothing else is written
+        self.current.refresh_from_db()
+        latest = self.current.checkpoints.order_by('-period_end').first()
+        self.assertEqual((latest.balance, latest.round_up_pot), (self.current.balance, self.current.round_up_pot))
+
+    def test_balance_at_starts_from_nearest_checkpoint(self):
+        self.close(since='2024-01')
+        data = self.balance_at(self.current, '2024-02-10')
+        self.assertEqual(data['checkpoint'], at(2024, 2, 1))
+        self.assertEqual(data['balance'], self.opening + Decimal('100.00') - Decimal('3.00'))
+        self.assertEqual(data['round_up_pot'], Decimal('0.70'))
+
+        self.assertEqual(self.balance_at(self.current, '2024-03-01T09:00:00Z')['balance'],
+                         self.opening + Decimal('37.00'))
+        self.assertEqual(self.balance_at(self.current, '2024-03-01T08:59:59Z')['balance'],
+                         self.opening + Decimal('47.00'))
+
+    def test_balance_at_without_checkpoints(self):
+        data = self.balance_at(self.current, '2024-01-31')
+        self.assertIsNone(data['checkpoint'])
+        self.assertEqual(data['balance'], self.opening + Decimal('100.00'))
+        self.assertEqual(self.balance_at(self.current, '2023-12-31')['balance'], self.opening)
+
+    def test_backdated_write_discards_later_checkpoints(self):
+        self.close(since='2024-01')
+        self.record('deposit', '5.00', at(2024, 2, 15))
+        self.assertTrue(BalanceCheckpoint.objects.filter(account=self.current, period_end=at(2024, 2, 1)).exists())
+        self.assertFalse(BalanceCheckpoint.objects.filter(account=self.current, period_end__gt=at(2024, 2, 15)).exists())
+        self.assertEqual(self.balance_at(self.current, '2024-04-01')['balance'], self.opening + Decimal('42.00'))
+
+        # Closing again fills the gap, catching the account up from its last checkpoint
+        self.close(since='2024-02')
+        self.assertEqual(BalanceCheckpoint.objects.get(account=self.current, period_end=at(2024, 4, 1)).balance,
+                         self.opening + Decimal('42.00'))
+
+    def test_current_writes_keep_checkpoints(self):
+        self.close(since='2024-01')
+        count = BalanceCheckpoint.objects.count()
+        self.record('deposit', '1.00', timezone.now())
+        self.assertEqual(BalanceCheckpoint.objects.count(), count)
+
+    def test_rejected_input(self):
+        response = self.client.get(reverse('account-balance-at', args=[self.current.id]), {'at': '2024-13-01'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        other = User.objects.create_user(username="nosy", password="password")
+        self.client.force_authenticate(user=other)
+        response = self.client.get(reverse('account-balance-at', args=[self.current.id]), {'at': '2024-01-01'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ClosePeriodCommandTestCase(TestCase):
+    def test_open_month_is_refused(self):
+        with self.assertRaises(CommandError):
+            call_command('close_period', month=timezone.now().strftime('%Y-%m'), stdout=StringIO())
+        with self.assertRaises(ValueError):
+            checkpoints.close(checkpoints.next_month(checkpoints.last_closable()))
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction
+from django.contrib.auth.models import User
+from datetime import timedelta
+from decimal import Decimal
+
+
+class TransactionExportTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="exportuser", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
+        self.account = Account.objects.create(name="Export Current", starting_balance=Decimal('100.00'), user=self.user)
+        self.transactions = [
+            Transaction.objects.create(transaction_type="withdrawal", amount=Decimal(amount), from_account=self.account)
+            for amount in ('1.00', '2.00', '3.00')
+        ]
+        self.url = reverse('transaction-account-transactions', args=[self.account.id])
+
+    def stream_body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_via_accept_header(self):
+        response = self.client.get(self.url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        rows = [json.loads(line) for line in self.stream_body(response).splitlines()]
+        self.assertEqual([row['amount'] for row in rows], ['1.00', '2.00', '3.00'])
+        self.assertEqual(rows[0]['from_account'], str(self.account.id))
+
+    def test_csv_via_format_param(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = list(csv.DictReader(io.StringIO(self.stream_body(response))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[2]['transaction_type'], 'withdrawal')
+
+    def test_incremental_download_with_since(self):
+        response = self.client.get(self.url, {'format': 'ndjson'})
+        last = json.loads(self.stream_body(response).splitlines()[0])
+
+        response = self.client.get(self.url, {'format': 'ndjson', 'since': last['timestamp']})
+        self.assertEqual(len(self.stream_body(response).splitlines()), 2)
+
+    def test_date_range_applies_to_json_listing(self):
+        Transaction.objects.filter(pk=self.transactions[0].pk).update(timestamp=timezone.now() - timedelta(days=10))
+        since = (timezone.localdate() - timedelta(days=1)).isoformat()
+
+        response = self.client.get(self.url, {'since': since})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 2)
+
+        response = self.client.get(self.url, {'since': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,66 @@
+from django.contrib.auth.hashers import make_password
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from . import hashing
+from django.contrib.auth.models import User
+
+
+@override_settings(PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_QUEUE=1)
+class HashingPoolLoginTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="hasher", password="password123")
+        self.url = reverse('api-login')
+
+    def login(self, password):
+        return self.client.post(self.url, {'username': 'hasher', 'password': password}, format='json')
+
+    def test_login_checks_password(self):
+        response = self.login('password123')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+        self.assertEqual(self.login('wrong').status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.login('password123').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unknown_user_is_rejected(self):
+        response = self.client.post(self.url, {'username': 'nobody', 'password': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_saturated_pool_sheds_with_retry_after(self):
+        _, slots = hashing._executor()
+        # Occupy both admission slots (one worker plus a queue of one)
+        self.assertTrue(slots.acquire(blocking=False))
+        self.assertTrue(slots.acquire(blocking=False))
+        try:
+            response = self.login('password123')
+        finally:
+            slots.release()
+            slots.release()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+        self.assertEqual(self.login('password123').status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+    ])
+    def test_outdated_hash_is_upgraded(self):
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('password123', hasher='md5'),
+        )
+        self.assertEqual(self.login('password123').status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$'))
+
+
+@override_settings(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE=1)
+class HashingProcessPoolTestCase(APITestCase):
+    def test_hashes_in_worker_process(self):
+        encoded = hashing.make_password('password123')
+        self.assertEqual(hashing._run(hashing._check, 'password123', encoded), (True, False))
+        self.assertEqual(len(hashing.make_passwords(['a', 'b', 'c'])), 3)
+        self.addCleanup(hashing.reset)
@@ -0,0 +1,87 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Account, IdempotencyKey, Transaction
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class IdempotencyKeyTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="retrier", password="password")
+        self.current = Account.objects.filter(user=self.user, account_type='current').get()
+        self.savings = Account.objects.filter(user=self.user, account_type='savings').get()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('transaction-list')
+        self.deposit = {"transaction_type": "deposit", "amount": "10.00", "from_account": str(self.current.id)}
+
+    def post(self, data, key, url=None):
+        return self.client.post(url or self.url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retry_replays_first_response(self):
+        before = self.current.balance
+        first = self.post(self.deposit, "abc")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with CaptureQueriesContext(connection) as context:
+            retry = self.post(self.deposit, "abc")
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertIn('"banking_idempotencykey"', context.captured_queries[0]['sql'])
+
+        self.assertEqual(Transaction.objects.count(), 1)
+        self.current.refresh_from_db()
+        self.assertEqual(self.current.balance, before + Decimal('10.00'))
+
+    def test_keys_are_scoped_to_user_and_endpoint(self):
+        self.post(self.deposit, "shared")
+        other = User.objects.create_user(username="other", password="password")
+        self.client.force_authenticate(user=other)
+        other_deposit = {**self.deposit, "from_account": str(Account.objects.filter(user=other).first().id)}
+        self.assertNotIn('Idempotent-Replayed', self.post(other_deposit, "shared"))
+
+        self.client.force_authenticate(user=self.user)
+        response = self.post({"from_account": str(self.current.id), "to_account": str(self.savings.id),
+                              "amount": "1.00"}, "shared", url=reverse('transaction-transfer'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_key_reused_for_different_body(self):
+        self.post(self.deposit, "abc")
+        response = self.post({**self.deposit, "amount": "99.00"}, "abc")
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_failures_are_not_stored(self):
+        response = self.post({**self.deposit, "amount": "oops"}, "abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+        self.assertEqual(self.post(self.deposit, "abc").status_code, status.HTTP_201_CREATED)
+
+    def test_expired_keys_run_again_and_are_purged(self):
+        self.post(self.deposit, "abc")
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertNotIn('Idempotent-Replayed', self.post(self.deposit, "abc"))
+        self.assertEqual(Transaction.objects.count(), 2)
+
+        IdempotencyKey.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command('purge_idempotency_keys', stdout=out)
+        self.assertIn("Deleted 1 expired", out.getvalue())
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_requests_without_key_are_unchanged(self):
+        self.client.post(self.url, self.deposit, format='json')
+        self.client.post(self.url, self.deposit, format='json')
+        self.assertEqual(Transaction.objects.count(), 2)
+        self.assertFalse(IdempotencyKey.objects.exists())
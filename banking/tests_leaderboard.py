@@ -0,0 +1,68 @@
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, AccountSpending
+from . import rollups
+from django.contrib.auth.models import User
+from datetime import timedelta
+from decimal import Decimal
+
+
+class TopSpendersTestCase(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="leaderstaff", password="password", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.staff).access_token))
+        self.url = reverse('transaction-top-10-spenders')
+
+        # Two accounts share a display name and must not be merged
+        self.first = Account.objects.create(name="Joint", starting_balance=Decimal('1000.00'))
+        self.second = Account.objects.create(name="Joint", starting_balance=Decimal('1000.00'))
+        self.third = Account.objects.create(name="Solo", starting_balance=Decimal('1000.00'))
+
+    def pay(self, account, amount):
+        return Transaction.objects.create(transaction_type="payment", amount=Decimal(amount), from_account=account)
+
+    def test_groups_by_account_id(self):
+        self.pay(self.first, '30.00')
+        self.pay(self.second, '20.00')
+        self.pay(self.third, '25.00')
+        self.pay(self.first, '5.00')
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['account_id'], row['total_spent']) for row in response.data],
+            [(str(self.first.id), Decimal('35.00')), (str(self.third.id), Decimal('25.00')),
+             (str(self.second.id), Decimal('20.00'))],
+        )
+
+        response = self.client.get(self.url, {'n': 1})
+        self.assertEqual(len(response.data), 1)
+
+    def test_windowed_leaderboard(self):
+        old = self.pay(self.first, '500.00')
+        Transaction.objects.filter(pk=old.pk).update(timestamp=timezone.now() - timedelta(days=60))
+        rollups.rebuild()
+        self.pay(self.second, '10.00')
+
+        response = self.client.get(self.url, {'window': '30d'})
+        self.assertEqual([row['account_id'] for row in response.data], [str(self.second.id)])
+        response = self.client.get(self.url, {'window': '365d'})
+        self.assertEqual([row['account_id'] for row in response.data], [str(self.first.id), str(self.second.id)])
+
+        response = self.client.get(self.url, {'window': 'fortnight'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_totals_follow_deletes(self):
+        payment = self.pay(self.third, '12.00')
+        self.assertEqual(AccountSpending.objects.get(account=self.third).total_spent, Decimal('12.00'))
+        payment.delete()
+        self.assertFalse(AccountSpending.objects.filter(account=self.third).exists())
+
+    def test_query_count_is_independent_of_history(self):
+        for _ in range(20):
+            self.pay(self.first, '1.00')
+        with self.assertNumQueries(2):  # token user, leaderboard rows
+            self.client.get(self.url)
@@ -0,0 +1,79 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from . import metrics
+from django.contrib.auth.models import User
+
+
+class MetricsEndpointTestCase(APITestCase):
+    def setUp(self):
+        metrics.registry.clear()
+        self.staff = User.objects.create_user(username="metricsstaff", password="password", is_staff=True)
+        self.customer = User.objects.create_user(username="metricscustomer", password="password")
+
+    def authenticate(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(user).access_token))
+
+    def test_records_latency_and_queries_per_route(self):
+        self.authenticate(self.customer)
+        self.client.get(reverse('account-my-accounts'))
+        self.client.get(reverse('account-my-accounts'))
+        self.client.get('/api/no-such-page/')
+
+        snapshot = metrics.registry.snapshot()
+        buckets, count, duration, queries, db_time, statuses = snapshot[('account-my-accounts', 'GET')]
+        self.assertEqual(count, 2)
+        self.assertEqual(sum(buckets), 2)
+        self.assertGreater(duration, 0)
+        self.assertGreaterEqual(queries, 2)
+        self.assertGreater(db_time, 0)
+        self.assertEqual(statuses, {'2xx': 2})
+        self.assertEqual(snapshot[(metrics.UNMATCHED, 'GET')][5], {'4xx': 1})
+
+    def test_unknown_methods_share_one_label(self):
+        self.authenticate(self.customer)
+        url = reverse('account-my-accounts')
+        for method in ('FOO', 'BAR1'):
+            self.client.generic(method, url)
+
+        routes = {key for key in metrics.registry.snapshot() if key[0] == 'account-my-accounts'}
+        self.assertEqual(routes, {('account-my-accounts', metrics.OTHER_METHOD)})
+
+    def test_endpoint_is_staff_only(self):
+        url = reverse('metrics')
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.authenticate(self.customer)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_prometheus_text_format(self):
+        self.authenticate(self.staff)
+        self.client.get(reverse('account-my-accounts'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertIn('http_request_duration_seconds_bucket{route="account-my-accounts",method="GET",le="+Inf"} 1', body)
+        self.assertIn('http_responses_total{route="account-my-accounts",method="GET",status="2xx"} 1', body)
+        self.assertIn('http_request_db_queries_total{route="account-my-accounts",method="GET"}', body)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_can_be_disabled(self):
+        self.authenticate(self.customer)
+        self.client.get(reverse('account-my-accounts'))
+        self.assertEqual(metrics.registry.snapshot(), {})
+
+
+class MetricsAsyncTestCase(TestCase):
+    async def test_async_views_are_recorded(self):
+        from asgiref.sync import sync_to_async
+        metrics.registry.clear()
+        user = await sync_to_async(User.objects.create_user)(username="metricsasync", password="password")
+        token = 'Bearer ' + str(RefreshToken.for_user(user).access_token)
+        response = await self.async_client.get(reverse('async-my-accounts'), headers={'Authorization': token})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        _, count, _, queries, _, _ = metrics.registry.snapshot()[('async-my-accounts', 'GET')]
+        self.assertEqual(count, 1)
+        self.assertGreaterEqual(queries, 1)
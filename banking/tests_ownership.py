@@ -0,0 +1,71 @@
+import uuid
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, Business
+from . import authentication
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class OwnershipScopedQueriesTestCase(APITestCase):
+    def setUp(self):
+        authentication.users.clear()
+        self.user = User.objects.create_user(username="owner", password="password")
+        self.other = User.objects.create_user(username="stranger", password="password")
+        self.account = Account.objects.filter(user=self.user, account_type='current').get()
+        self.savings = Account.objects.filter(user=self.user, account_type='savings').get()
+        self.other_account = Account.objects.filter(user=self.other, account_type='current').get()
+        business = Business.objects.create(id="grocer", name="Grocer", category="Food")
+        Transaction.objects.create(
+            transaction_type="payment", amount=Decimal('9.99'), from_account=self.account, business=business,
+        )
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+        # Warm the authentication cache so only the endpoint's own queries are counted
+        self.client.get(reverse('account-my-accounts'))
+
+    def test_owner_read_query_counts(self):
+        # The spending summary checks ownership on the primary before its replica read
+        for name, queries in [('transaction-account-transactions', 1), ('transaction-spending-summary', 2)]:
+            url = reverse(name, args=[self.account.id])
+            with self.assertNumQueries(queries):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data), 1)
+
+    def test_empty_result_is_explained(self):
+        for name in ['transaction-account-transactions', 'transaction-spending-summary']:
+            response = self.client.get(reverse(name, args=[self.savings.id]))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data, [])
+
+            response = self.client.get(reverse(name, args=[self.other_account.id]))
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+            response = self.client.get(reverse(name, args=[uuid.uuid4()]))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+            response = self.client.get(reverse(name, args=['not-a-uuid']))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_is_scoped_to_owner(self):
+        Transaction.objects.create(transaction_type="deposit", amount=Decimal('5.00'), from_account=self.other_account)
+        response = self.client.get(reverse('transaction-list'))
+        self.assertEqual(
+            {row['from_account'] for row in response.data['results']},
+            {self.account.id},
+        )
+
+    def test_create_on_another_users_account_is_forbidden(self):
+        url = reverse('transaction-list')
+        response = self.client.post(url, {
+            "transaction_type": "deposit", "amount": "1.00", "from_account": str(self.other_account.id),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(url, {
+            "transaction_type": "deposit", "amount": "1.00", "from_account": str(self.account.id),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
@@ -0,0 +1,59 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class KeysetPaginationTestCase(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="pagestaff", password="password", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.staff).access_token))
+
+        self.account = Account.objects.create(name="Paged Current", starting_balance=Decimal('1000.00'))
+        for i in range(7):
+            Transaction.objects.create(transaction_type="withdrawal", amount=Decimal(i + 1), from_account=self.account)
+
+    def collect(self, url, params):
+        seen = []
+        pages = 0
+        while url:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen.extend(response.data['results'])
+            url, params = response.data['next'], None
+            pages += 1
+        return seen, pages
+
+    def test_transactions_walk_newest_first_without_gaps(self):
+        # Give every row the same timestamp so ordering falls back to the id tie-breaker
+        Transaction.objects.update(timestamp=Transaction.objects.first().timestamp)
+
+        rows, pages = self.collect(reverse('transaction-list'), {'page_size': 3})
+        self.assertEqual(pages, 3)
+        ids = [row['id'] for row in rows]
+        self.assertEqual(ids, sorted(Transaction.objects.values_list('id', flat=True), reverse=True))
+
+    def test_accounts_page_by_id(self):
+        rows, _ = self.collect(reverse('account-list'), {'page_size': 2})
+        self.assertEqual(len(rows), Account.objects.count())
+        self.assertEqual(len({row['id'] for row in rows}), len(rows))
+
+    def test_page_size_is_bounded(self):
+        response = self.client.get(reverse('transaction-list'), {'page_size': 100000})
+        self.assertEqual(len(response.data['results']), 7)
+        response = self.client.get(reverse('transaction-list'), {'page_size': 2})
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_tampered_cursor_is_rejected(self):
+        response = self.client.get(reverse('transaction-list'), {'page_size': 2})
+        cursor = response.data['next'].split('cursor=')[1].split('&')[0]
+
+        response = self.client.get(reverse('transaction-list'), {'cursor': cursor[:-2] + 'xx'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        # A transaction cursor isn't valid on the account listing either
+        response = self.client.get(reverse('account-list'), {'cursor': cursor})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,92 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from .models import Account
+from . import registration
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class RegistrationServiceTestCase(TestCase):
+    def test_register_user_creates_exactly_two_accounts(self):
+        user, accounts = registration.register_user("single", "password123", first_name="Sam")
+        self.assertEqual(len(accounts), 2)
+        stored = Account.objects.filter(user=user)
+        self.assertEqual(stored.count(), 2)
+        current = stored.get(account_type='current')
+        self.assertEqual(current.name, "Sam's Current Account")
+        self.assertEqual(current.balance, Decimal('1000.00'))
+        self.assertTrue(stored.get(account_type='savings').round_up_enabled)
+
+    def test_accounts_inserted_in_one_statement(self):
+        with CaptureQueriesContext(connection) as context:
+            registration.register_user("counted", "password123")
+        inserts = [q['sql'] for q in context.captured_queries if 'INSERT INTO "banking_account"' in q['sql']]
+        self.assertEqual(len(inserts), 1)
+
+    def test_duplicate_and_missing_credentials(self):
+        registration.register_user("taken", "password123")
+        with self.assertRaisesMessage(registration.RegistrationError, "exists"):
+            registration.register_user("taken", "other")
+        with self.assertRaises(registration.RegistrationError):
+            registration.register_user("", "password123")
+        self.assertEqual(Account.objects.filter(user__username="taken").count(), 2)
+
+    def test_other_integrity_errors_are_not_reported_as_taken(self):
+        with mock.patch.object(registration, 'create_default_accounts', side_effect=IntegrityError("accounts")):
+            with self.assertRaisesMessage(IntegrityError, "accounts"):
+                registration.register_user("unlucky", "password123")
+        self.assertFalse(User.objects.filter(username="unlucky").exists())
+
+    def test_accounts_are_returned_in_default_order(self):
+        _, accounts = registration.register_user("ordered", "password123")
+        self.assertEqual([account.account_type for account in accounts], ['current', 'savings'])
+
+    def test_register_api_uses_service(self):
+        response = self.client.post(
+            reverse('api-register'), {'username': 'viaapi', 'password': 'password123'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['accounts']), 2)
+        self.assertEqual(Account.objects.filter(user__username='viaapi').count(), 2)
+
+
+class BulkOnboardingTestCase(TestCase):
+    def rows(self, count, prefix):
+        return [{'username': f'{prefix}{i}', 'first_name': f'Name{i}'} for i in range(count)]
+
+    def test_queries_per_batch_do_not_grow_with_users(self):
+        with CaptureQueriesContext(connection) as small:
+            registration.register_users(self.rows(5, 'small'), batch_size=100)
+        with CaptureQueriesContext(connection) as large:
+            registration.register_users(self.rows(40, 'large'), batch_size=100)
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(Account.objects.filter(user__username__startswith='large').count(), 80)
+
+    def test_existing_and_repeated_usernames_are_skipped(self):
+        User.objects.create_user(username='branch1', password='password123')
+        rows = self.rows(3, 'branch') + [{'username': 'branch2'}, {'username': ''}]
+        created, skipped = registration.register_users(rows)
+        self.assertEqual(created, 2)
+        self.assertEqual(skipped, ['branch1', 'branch2', ''])
+        self.assertFalse(User.objects.get(username='branch0').has_usable_password())
+
+    def test_onboard_users_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as handle:
+            handle.write("username,password,email,first_name,last_name\n")
+            for i in range(4):
+                handle.write(f"file{i},,file{i}@example.com,File,User\n")
+        self.addCleanup(os.remove, handle.name)
+
+        out = StringIO()
+        call_command('onboard_users', handle.name, '--batch-size', '3', stdout=out)
+        self.assertIn("Registered 4 user(s)", out.getvalue())
+        self.assertEqual(Account.objects.filter(user__username__startswith='file').count(), 8)
+        self.assertEqual(User.objects.get(username='file2').email, 'file2@example.com')
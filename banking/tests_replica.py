@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DEFAULT_DB_ALIAS, connection, router
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from . import routers
+from .models import Account, Business, Transaction
+from decimal import Decimal
+
+
+class ReplicaTestMixin:
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'replica.sqlite3')
+        settings_override = override_settings(REPLICA_DATABASE_PATH=self.path, REPLICA_MAX_STALENESS=60)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ReplicaRouterTestCase(ReplicaTestMixin, TestCase):
+    def touch(self, age=0):
+        open(self.path, 'a').close()
+        refreshed = time.time() - age
+        os.utime(self.path, (refreshed, refreshed))
+
+    def test_reads_outside_block_use_primary(self):
+        self.touch()
+        self.assertEqual(router.db_for_read(Transaction), DEFAULT_DB_ALIAS)
+
+    def test_fresh_replica_serves_reads_in_block(self):
+        self.touch(age=5)
+        with routers.use_replica() as alias:
+            self.assertEqual(alias, 'replica')
+            self.assertEqual(router.db_for_read(Transaction), 'replica')
+            self.assertEqual(router.db_for_write(Transaction), DEFAULT_DB_ALIAS)
+        self.assertEqual(router.db_for_read(Transaction), DEFAULT_DB_ALIAS)
+
+    def test_missing_or_stale_replica_falls_back(self):
+        with routers.use_replica() as alias:
+            self.assertEqual(alias, DEFAULT_DB_ALIAS)
+        self.touch(age=120)
+        with routers.use_replica() as alias:
+            self.assertEqual(alias, DEFAULT_DB_ALIAS)
+            self.assertEqual(router.db_for_read(Transaction), DEFAULT_DB_ALIAS)
+
+    def test_replica_is_never_migrated(self):
+        self.assertTrue(router.allow_migrate(DEFAULT_DB_ALIAS, 'banking'))
+        self.assertFalse(router.allow_migrate('replica', 'banking'))
+
+
+class RefreshReplicaTestCase(ReplicaTestMixin, TransactionTestCase):
+    # The backup can't read a database with a test transaction held open on it
+
+    def test_refresh_replica_command(self):
+        call_command('refresh_replica', stdout=StringIO())
+        self.assertLess(routers.replica_lag(), 60)
+        with routers.use_replica() as alias:
+            self.assertEqual(alias, 'replica')
+        with sqlite3.connect(self.path) as copy:
+            tables = {row[0] for row in copy.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            self.assertIn(Transaction._meta.db_table, tables)
+            self.assertEqual(copy.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+
+        out = StringIO()
+        call_command('refresh_replica', max_age=60, stdout=out)
+        self.assertIn('not refreshing', out.getvalue())
+
+
+@override_settings(REPLICA_DATABASE_PATH='')
+class ReportsWithoutReplicaTestCase(APITestCase):
+    def test_reports_fall_back_to_primary(self):
+        user = User.objects.create_user(username="replicauser", password="password")
+        account = Account.objects.filter(user=user, account_type='current').get()
+        self.client.force_authenticate(user=user)
+        response = self.client.get(reverse('transaction-spending-summary', args=[account.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, [])
+
+
+
+
+class ReplicaReportsTestCase(APITestCase):
+    """Checks that must see current data run outside use_replica()."""
+
+    def get_recording_replica_reads(self, url):
+        replica_queries = []
+
+        @contextmanager
+        def recording_replica():
+            with CaptureQueriesContext(connection) as context:
+                yield DEFAULT_DB_ALIAS
+            replica_queries.extend(query['sql'] for query in context.captured_queries)
+
+        with mock.patch.object(routers, 'use_replica', recording_replica):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, replica_queries
+
+    def test_ownership_is_checked_on_primary(self):
+        user = User.objects.create_user(username="replicaowner", password="password")
+        account = Account.objects.filter(user=user, account_type='current').get()
+        self.client.force_authenticate(user=user)
+        _, replica_queries = self.get_recording_replica_reads(
+            reverse('transaction-spending-summary', args=[account.id]))
+        self.assertEqual(len(replica_queries), 1)
+        self.assertNotIn('"banking_account"', replica_queries[0])
+
+    def test_sanctions_are_read_from_primary(self):
+        staff = User.objects.create_user(username="replicastaff", password="password", is_staff=True)
+        account = Account.objects.filter(user=staff, account_type='current').get()
+        Business.objects.create(id="casino", name="Casino", category="Leisure", sanctioned=True)
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('5.00'),
+                                   from_account=account, business_id="casino")
+        self.client.force_authenticate(user=staff)
+        url = reverse('transaction-sanctioned-business-report')
+
+        response, replica_queries = self.get_recording_replica_reads(url)
+        self.assertEqual([row['business__name'] for row in response.data], ["Casino"])
+        self.assertFalse(any('"sanctioned"' in sql for sql in replica_queries))
+
+        _, replica_queries = self.get_recording_replica_reads(url + '?business=casino')
+        self.assertFalse(any('"sanctioned"' in sql for sql in replica_queries))
@@ -0,0 +1,86 @@
+from django.db import transaction as db_transaction
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, Business, DailySpending, MonthlySpending
+from . import rollups
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class SpendingRollupTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="trendsuser", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
+        self.account = Account.objects.create(name="Trends Current", starting_balance=Decimal('500.00'), user=self.user)
+        self.food = Business.objects.create(id="cafe", name="Cafe", category="Food", sanctioned=False)
+        self.travel = Business.objects.create(id="rail", name="Rail", category="Travel", sanctioned=False)
+
+    def pay(self, amount, business=None):
+        return Transaction.objects.create(
+            transaction_type="payment",
+            amount=Decimal(amount),
+            from_account=self.account,
+            business=business,
+        )
+
+    def test_payments_update_daily_and_monthly_rollups(self):
+        self.pay('10.00', self.food)
+        self.pay('5.50', self.food)
+        self.pay('20.00', self.travel)
+        Transaction.objects.create(transaction_type="deposit", amount=Decimal('99.00'), from_account=self.account)
+
+        food = MonthlySpending.objects.get(account=self.account, category="Food")
+        self.assertEqual((food.total, food.count), (Decimal('15.50'), 2))
+        self.assertEqual(DailySpending.objects.filter(account=self.account).count(), 2)
+
+    def test_deleted_payment_leaves_rollups(self):
+        payment = self.pay('8.00', self.travel)
+        payment.delete()
+        self.assertFalse(MonthlySpending.objects.filter(account=self.account).exists())
+        self.assertFalse(DailySpending.objects.filter(account=self.account).exists())
+
+    def test_category_change_refiles_past_payments(self):
+        payment = self.pay('8.00', self.food)
+        self.pay('2.00', self.food)
+        self.food.category = "Dining"
+        self.food.save()
+
+        dining = MonthlySpending.objects.get(account=self.account)
+        self.assertEqual((dining.category, dining.total, dining.count), ("Dining", Decimal('10.00'), 2))
+        self.assertEqual(list(DailySpending.objects.values_list('category', flat=True)), ["Dining"])
+
+        payment.delete()
+        dining.refresh_from_db()
+        self.assertEqual((dining.total, dining.count), (Decimal('2.00'), 1))
+
+    def test_missing_rollup_row_is_reported(self):
+        payment = self.pay('8.00', self.food)
+        DailySpending.objects.all().delete()
+        with self.assertRaises(rollups.RollupMismatch), db_transaction.atomic():
+            payment.delete()
+        self.assertTrue(Transaction.objects.filter(pk=payment.pk).exists())
+
+    def test_rebuild_matches_incremental_totals(self):
+        self.pay('3.00', self.food)
+        self.pay('4.00')
+        expected = sorted(MonthlySpending.objects.values_list('category', 'month', 'total', 'count'))
+
+        rollups.rebuild()
+        self.assertEqual(sorted(MonthlySpending.objects.values_list('category', 'month', 'total', 'count')), expected)
+
+    def test_spending_trends_reads_rollups(self):
+        self.pay('12.00', self.food)
+        self.pay('1.00')
+
+        url = reverse('account-spending-trends', args=[self.account.id])
+        with self.assertNumQueries(3):  # token user, account, rollup rows
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([(row['category'], row['total']) for row in response.data],
+                         [(None, Decimal('1.00')), ('Food', Decimal('12.00'))])
+
+        response = self.client.get(url, {'granularity': 'hourly'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
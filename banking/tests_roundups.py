@@ -0,0 +1,100 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, RoundUp
+from . import ledger, transfers
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class RoundUpAccrualTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="roundupuser", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.user).access_token))
+
+        self.account = Account.objects.create(
+            name="Round Up Current",
+            starting_balance=Decimal('100.00'),
+            round_up_enabled=True,
+            user=self.user,
+        )
+
+    def test_spare_change(self):
+        self.assertEqual(ledger.spare_change(Decimal('25.50')), Decimal('0.50'))
+        self.assertEqual(ledger.spare_change(Decimal('3.01')), Decimal('0.99'))
+        self.assertEqual(ledger.spare_change(Decimal('4.00')), Decimal('0.00'))
+
+    def test_payment_through_api_accrues_round_up(self):
+        url = reverse('transaction-list')
+        data = {
+            "transaction_type": "payment",
+            "amount": "25.50",
+            "from_account": str(self.account.id),
+        }
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.round_up_pot, Decimal('0.50'))
+        # The spare change comes out of the balance alongside the payment
+        self.assertEqual(self.account.balance, Decimal('74.00'))
+        self.assertEqual(RoundUp.objects.filter(account=self.account).count(), 1)
+
+    def test_disabled_account_does_not_accrue(self):
+        Account.objects.filter(pk=self.account.pk).update(round_up_enabled=False)
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('1.25'), from_account=self.account)
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.round_up_pot, Decimal('0.00'))
+        self.assertEqual(self.account.balance, Decimal('98.75'))
+
+    def test_reclaim_and_delete(self):
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('9.25'), from_account=self.account)
+        reclaim = transfers.reclaim(self.account.id, Decimal('0.50'))
+
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.round_up_pot, Decimal('0.25'))
+        self.assertEqual(self.account.balance, Decimal('90.50'))
+
+        reclaim.delete()
+        self.account.refresh_from_db()
+        self.assertEqual(self.account.round_up_pot, Decimal('0.75'))
+        self.assertEqual(self.account.balance, Decimal('90.00'))
+        self.assertEqual(ledger.rebuild(check_only=True), [])
+
+    def test_reclaim_is_limited_to_the_pot(self):
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('9.25'), from_account=self.account)
+        url = reverse('transaction-list')
+        for amount in ['50000.00', '0.76', '0.00', '-1.00']:
+            response = self.client.post(url, {
+                "transaction_type": "roundup_reclaim", "amount": amount, "from_account": str(self.account.id),
+            }, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.round_up_pot, self.account.balance), (Decimal('0.75'), Decimal('90.00')))
+        self.assertEqual(Transaction.objects.filter(transaction_type="roundup_reclaim").count(), 0)
+
+        response = self.client.post(url, {
+            "transaction_type": "roundup_reclaim", "amount": "0.75", "from_account": str(self.account.id),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.account.refresh_from_db()
+        self.assertEqual((self.account.round_up_pot, self.account.balance), (Decimal('0.00'), Decimal('90.75')))
+
+    def test_roundups_endpoint(self):
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('2.30'), from_account=self.account)
+        Transaction.objects.create(transaction_type="payment", amount=Decimal('4.90'), from_account=self.account)
+
+        url = reverse('account-roundups', args=[self.account.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['savings'], Decimal('0.80'))
+        self.assertEqual([entry['amount'] for entry in response.data['history']], ['0.10', '0.70'])
+
+        # Out-of-range limits are clamped rather than failing
+        for limit, expected in [('-1', 1), ('0', 1), ('1000', 2)]:
+            response = self.client.get(url, {'limit': limit})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data['history']), expected)
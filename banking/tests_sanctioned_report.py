@@ -0,0 +1,82 @@
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from .models import Account, Transaction, Business, BusinessSpending, BusinessAccountDailySpending
+from . import rollups
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class SanctionedBusinessReportTestCase(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username="compliance", password="password", is_staff=True)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(self.staff).access_token))
+        self.url = reverse('transaction-sanctioned-business-report')
+
+        self.alice = Account.objects.create(name="Alice", starting_balance=Decimal('1000.00'))
+        self.bob = Account.objects.create(name="Bob", starting_balance=Decimal('1000.00'))
+        self.casino = Business.objects.create(id="casino", name="Casino", category="Gambling", sanctioned=False)
+        self.grocer = Business.objects.create(id="grocer", name="Grocer", category="Food", sanctioned=False)
+
+    def pay(self, account, business, amount):
+        return Transaction.objects.create(
+            transaction_type="payment", amount=Decimal(amount), from_account=account, business=business,
+        )
+
+    def sanction(self, business):
+        response = self.client.patch(reverse('business-detail', args=[business.id]), {'sanctioned': True}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_flip_updates_report_immediately(self):
+        self.pay(self.alice, self.casino, '40.00')
+        self.pay(self.bob, self.casino, '15.00')
+        self.pay(self.alice, self.grocer, '9.00')
+        self.assertEqual(self.client.get(self.url).data, [])
+
+        self.sanction(self.casino)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data[0]['business_id'], 'casino')
+        self.assertEqual(response.data[0]['business__name'], 'Casino')
+        self.assertEqual(response.data[0]['total_spent'], Decimal('55.00'))
+        self.assertEqual(response.data[0]['count'], 2)
+
+    def test_drill_down_per_account_and_day(self):
+        self.pay(self.alice, self.casino, '40.00')
+        self.pay(self.alice, self.casino, '2.50')
+        self.pay(self.bob, self.casino, '15.00')
+        self.sanction(self.casino)
+
+        response = self.client.get(self.url, {'business': 'casino'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['account_id'], row['total'], row['count']) for row in response.data['accounts']],
+            [(str(self.alice.id), Decimal('42.50'), 2), (str(self.bob.id), Decimal('15.00'), 1)],
+        )
+        self.assertEqual(len(response.data['days']), 1)
+        self.assertEqual(response.data['days'][0]['total'], Decimal('57.50'))
+
+        # Businesses that aren't sanctioned aren't exposed through the report
+        response = self.client.get(self.url, {'business': 'grocer'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_totals_follow_deletes_and_rebuild(self):
+        payment = self.pay(self.alice, self.casino, '40.00')
+        self.pay(self.bob, self.casino, '15.00')
+        payment.delete()
+        self.assertEqual(BusinessSpending.objects.get(business=self.casino).total_spent, Decimal('15.00'))
+        self.assertFalse(BusinessAccountDailySpending.objects.filter(account=self.alice).exists())
+
+        before = list(BusinessAccountDailySpending.objects.values_list('business', 'account', 'day', 'total', 'count'))
+        rollups.rebuild()
+        after = list(BusinessAccountDailySpending.objects.values_list('business', 'account', 'day', 'total', 'count'))
+        self.assertEqual(before, after)
+        self.assertEqual(BusinessSpending.objects.get(business=self.casino).count, 1)
+
+    def test_requires_staff(self):
+        user = User.objects.create_user(username="customer", password="password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(user).access_token))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
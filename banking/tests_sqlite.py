@@ -0,0 +1,70 @@
+import threading
+import uuid
+
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from .models import Account, Transaction
+from . import sqlite, write_queue
+from decimal import Decimal
+
+
+class SqlitePragmaTestCase(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_connection_is_tuned(self):
+        # From the timeout option, not overridden by the PRAGMAs
+        self.assertEqual(self.pragma('busy_timeout'), 20 * 1000)
+        self.assertEqual(self.pragma('synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma('cache_size'), -64 * 1024)
+
+    def test_wal_is_opt_in(self):
+        self.assertNotIn('journal_mode', sqlite.pragmas())
+        with override_settings(SQLITE_WAL=True):
+            self.assertEqual(sqlite.pragmas()['journal_mode'], 'WAL')
+
+    def test_saves_directly_inside_a_transaction(self):
+        account = Account.objects.create(name="Direct", starting_balance=Decimal('100.00'))
+        with override_settings(TRANSACTION_WRITE_QUEUE=True):
+            txn = write_queue.save(Transaction(transaction_type="withdrawal", amount=Decimal('1.00'), from_account=account))
+        self.assertIsNotNone(txn.pk)
+
+
+@override_settings(TRANSACTION_WRITE_QUEUE=True)
+class WriteQueueTestCase(TransactionTestCase):
+    def test_concurrent_posts_are_all_committed(self):
+        account = Account.objects.create(name="Queued", starting_balance=Decimal('1000.00'))
+        errors = []
+
+        def post():
+            try:
+                write_queue.save(Transaction(transaction_type="withdrawal", amount=Decimal('2.00'), from_account=account))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(Transaction.objects.filter(from_account=account).count(), 20)
+        account.refresh_from_db()
+        self.assertEqual(account.balance, Decimal('960.00'))
+
+    def test_bad_row_fails_alone(self):
+        account = Account.objects.create(name="Mixed", starting_balance=Decimal('50.00'))
+        writer = write_queue._get_writer()
+        good = writer.submit(Transaction(transaction_type="deposit", amount=Decimal('5.00'), from_account=account))
+        bad = writer.submit(Transaction(transaction_type="deposit", amount=Decimal('5.00'), from_account_id=uuid.uuid4()))
+
+        self.assertIsNotNone(good.result(timeout=10).pk)
+        with self.assertRaises(Exception):
+            bad.result(timeout=10)
+        account.refresh_from_db()
+        self.assertEqual(account.balance, Decimal('55.00'))
@@ -0,0 +1,110 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Account, Business, DailySpending, StatementImport, Transaction
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class ImportStatementsTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="importer", password="password")
+        self.account = Account.objects.filter(user=self.user, account_type='current').get()
+        self.savings = Account.objects.filter(user=self.user, account_type='savings').get()
+        Business.objects.create(id="bakery", name="Bakery", category="Food")
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def write(self, name, text):
+        path = os.path.join(self.dir, name)
+        with open(path, 'w', newline='') as f:
+            f.write(text)
+        return path
+
+    def csv_file(self):
+        return self.write('statement.csv', (
+            "transaction_type,amount,from_account,to_account,business,timestamp\n"
+            f"deposit,100.00,{self.account.id},,,2019-03-01T09:00:00Z\n"
+            f"payment,12.50,{self.account.id},,bakery,2019-03-02T12:30:00Z\n"
+            f"transfer,20.00,{self.account.id},{self.savings.id},,2019-03-03\n"
+            f"payment,oops,{self.account.id},,,2019-03-04\n"
+            f"payment,5.00,{self.account.id},,nowhere,2019-03-05\n"
+        ))
+
+    def run_import(self, *args, **options):
+        out, err = StringIO(), StringIO()
+        call_command('import_statements', *args, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_import_keeps_history_and_rebuilds(self):
+        start_balance = self.account.balance
+        _, err = self.run_import(self.csv_file(), batch_size=2)
+
+        self.assertIn("row 4 skipped: amount 'oops' is not a number", err)
+        self.assertIn("row 5 skipped: business 'nowhere' not found", err)
+        imported = Transaction.objects.filter(from_account=self.account).order_by('timestamp')
+        self.assertEqual([txn.timestamp.date() for txn in imported],
+                         [date(2019, 3, 1), date(2019, 3, 2), date(2019, 3, 3)])
+
+        self.account.refresh_from_db()
+        self.savings.refresh_from_db()
+        self.assertEqual(self.account.balance, start_balance + Decimal('100.00') - Decimal('12.50') - Decimal('20.00'))
+        self.assertEqual(self.savings.balance, Decimal('20.00'))
+        self.assertEqual(DailySpending.objects.get(account=self.account).day, date(2019, 3, 2))
+
+        checkpoint = StatementImport.objects.get()
+        self.assertEqual((checkpoint.rows_done, checkpoint.inserted, checkpoint.rejected, checkpoint.completed),
+                         (5, 3, 2, True))
+
+    def test_resumes_after_last_committed_row(self):
+        path = self.csv_file()
+        StatementImport.objects.create(source=os.path.abspath(path), rows_done=2, inserted=2)
+        out, _ = self.run_import(path)
+        self.assertIn("resuming after row 2", out)
+        self.assertEqual(
+            list(Transaction.objects.values_list('transaction_type', flat=True)),
+            ['transfer'],
+        )
+
+        out, _ = self.run_import(path)
+        self.assertIn("already imported", out)
+        self.assertEqual(Transaction.objects.count(), 1)
+
+        self.run_import(path, restart=True)
+        self.assertEqual(Transaction.objects.count(), 4)
+
+    def test_jsonl_import(self):
+        path = self.write('statement.jsonl', "\n".join([
+            json.dumps({"transaction_type": "deposit", "amount": "40", "from_account": str(self.account.id),
+                        "timestamp": "2020-01-01T00:00:00+00:00"}),
+            "not json",
+            "",
+            json.dumps({"transaction_type": "withdrawal", "amount": 15.5, "from_account": str(self.account.id),
+                        "timestamp": "2020-13-01"}),
+        ]))
+        _, err = self.run_import(path, no_rebuild=True)
+        self.assertIn("row 2 skipped: invalid JSON", err)
+        self.assertIn("row 3 skipped: timestamp '2020-13-01'", err)
+        self.assertEqual(Transaction.objects.get().amount, Decimal('40.00'))
+
+
+class TransactionTimestampTestCase(APITestCase):
+    def test_api_ignores_client_timestamps(self):
+        user = User.objects.create_user(username="clock", password="password")
+        account = Account.objects.filter(user=user, account_type='current').get()
+        self.client.force_authenticate(user=user)
+        response = self.client.post(reverse('transaction-list'), {
+            "transaction_type": "deposit", "amount": "1.00", "from_account": str(account.id),
+            "timestamp": "2001-01-01T00:00:00Z",
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(Transaction.objects.get().timestamp.year, 2001)
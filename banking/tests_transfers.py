@@ -0,0 +1,111 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Account, Transaction
+from . import transfers
+from django.contrib.auth.models import User
+from decimal import Decimal
+
+
+class TransferTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="payer", password="password")
+        self.other = User.objects.create_user(username="payee", password="password")
+        self.current = Account.objects.filter(user=self.user, account_type='current').get()
+        self.savings = Account.objects.filter(user=self.user, account_type='savings').get()
+        self.other_current = Account.objects.filter(user=self.other, account_type='current').get()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('transaction-transfer')
+
+    def post(self, from_account, to_account, amount):
+        return self.client.post(self.url, {
+            "from_account": str(from_account.id), "to_account": str(to_account.id), "amount": amount,
+        }, format='json')
+
+    def balances(self):
+        return [Account.objects.get(pk=account.pk).balance for account in (self.current, self.savings, self.other_current)]
+
+    def test_transfer_moves_money_atomically(self):
+        before = self.balances()
+        response = self.post(self.current, self.other_current, "250.00")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Decimal(response.data['from_account_balance']), before[0] - Decimal('250.00'))
+        self.assertEqual(Decimal(response.data['to_account_balance']), before[2] + Decimal('250.00'))
+        self.assertEqual(self.balances(), [before[0] - Decimal('250.00'), before[1], before[2] + Decimal('250.00')])
+        self.assertEqual(Transaction.objects.get().transaction_type, 'transfer')
+
+    def test_insufficient_funds_changes_nothing(self):
+        before = self.balances()
+        response = self.post(self.savings, self.current, "0.01")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"amount": ["Insufficient funds"]})
+        self.assertEqual(self.balances(), before)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_rejected_transfers(self):
+        self.assertEqual(self.post(self.other_current, self.current, "1.00").status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.post(self.current, self.current, "1.00").status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post(self.current, self.savings, "-1.00").status_code, status.HTTP_400_BAD_REQUEST)
+        missing = Account(id='00000000-0000-4000-8000-000000000000')
+        self.assertEqual(self.post(self.current, missing, "1.00").status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_generic_create_checks_funds_for_transfers(self):
+        response = self.client.post(reverse('transaction-list'), {
+            "transaction_type": "transfer", "amount": "5000.00",
+            "from_account": str(self.current.id), "to_account": str(self.savings.id),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_generic_create_needs_a_destination_for_transfers(self):
+        before = self.balances()
+        response = self.client.post(reverse('transaction-list'), {
+            "transaction_type": "transfer", "amount": "99999.00", "from_account": str(self.current.id),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('to_account', response.data)
+        self.assertEqual(self.balances(), before)
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_service_locks_in_primary_key_order(self):
+        with CaptureQueriesContext(connection) as context:
+            transfers.transfer(self.current.id, self.savings.id, Decimal('1.00'))
+        lock = next(query['sql'] for query in context.captured_queries if 'FROM "banking_account"' in query['sql'])
+        self.assertIn('ORDER BY "banking_account"."id" ASC', lock)
+
+    def test_transfers_cannot_be_edited(self):
+        self.post(self.current, self.other_current, "1.00")
+        txn = Transaction.objects.get()
+        url = reverse('transaction-detail', args=[txn.id])
+        before = self.balances()
+
+        response = self.client.patch(url, {"amount": "999999.00"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(url, {"transaction_type": "deposit"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.balances(), before)
+
+    def test_payments_cannot_become_transfers(self):
+        response = self.client.post(reverse('transaction-list'), {
+            "transaction_type": "payment", "amount": "1.00", "from_account": str(self.current.id),
+        }, format='json')
+        url = reverse('transaction-detail', args=[response.data['id']])
+        before = self.balances()
+        response = self.client.patch(url, {
+            "transaction_type": "transfer", "amount": "999999.00", "to_account": str(self.savings.id),
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.balances(), before)
+
+    def test_bulk_upload_refuses_transfers(self):
+        response = self.client.post(reverse('transaction-bulk-ingest'), [
+            {"transaction_type": "deposit", "amount": "1.00", "from_account": str(self.current.id)},
+            {"transaction_type": "transfer", "amount": "999999.00",
+             "from_account": str(self.current.id), "to_account": str(self.savings.id)},
+        ], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['errors'][0]['index'], 1)
+        self.assertFalse(Transaction.objects.exists())
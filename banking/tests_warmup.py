@@ -0,0 +1,10 @@
+from django.test import TestCase
+from extra_credit_union import warmup
+
+
+class WarmupTestCase(TestCase):
+    def test_warm_imports_and_connections(self):
+        timings = warmup.warm_imports()
+        self.assertEqual(set(timings), {'urlconf', 'serializers', 'schema'})
+        self.assertIn('db:default', warmup.warm_connections())
+        self.assertIn('schema', warmup.describe(timings))
@@ -0,0 +1,99 @@
+"""
+Transfers between accounts.
+
+``transfer`` checks the payer's funds and writes the ``transfer``
+transaction (which debits one account and credits the other through the
+ledger) in one database transaction, with both account rows locked
+first. The rows are locked in primary key order, so two transfers between
+the same pair of accounts in opposite directions can't each hold one lock
+while waiting for the other. On SQLite ``select_for_update`` does
+nothing, but the connection begins transactions with ``BEGIN IMMEDIATE``
+(see the DATABASES options), which takes the database's write lock
+before the balance is read. Either way no two transfers from the same
+account can both pass the funds check against the same balance.
+
+``reclaim`` moves money from an account's round-up pot back into its
+balance under the same lock, refusing more than the pot holds.
+"""
+from django.db import transaction as db_transaction
+
+from .models import Account, Transaction
+
+
+class TransferError(Exception):
+    """A transfer that can't be made, e.g. for lack of funds. ``field`` names the input at fault."""
+
+    def __init__(self, message, field=None):
+        super().__init__(message)
+        self.field = field
+
+
+class AccountNotFound(TransferError):
+    pass
+
+
+class NotPermitted(TransferError):
+    pass
+
+
+class InsufficientFunds(TransferError):
+    def __init__(self, message="Insufficient funds"):
+        super().__init__(message, field='amount')
+
+
+def _check_amount(amount):
+    if amount <= 0:
+        raise TransferError("Amount must be positive", field='amount')
+
+
+def transfer(from_account_id, to_account_id, amount, user=None):
+    """
+    Move ``amount`` from one account to another. When ``user`` is given
+    (and isn't staff) they must own the paying account. Returns the saved
+    Transaction, with ``from_balance`` and ``to_balance`` set to the two
+    balances after the transfer.
+    """
+    if from_account_id == to_account_id:
+        raise TransferError("Can't transfer to the same account", field='to_account')
+    _check_amount(amount)
+
+    with db_transaction.atomic():
+        locked = Account.objects.select_for_update().filter(pk__in=[from_account_id, to_account_id]).order_by('pk')
+        accounts = {account.pk: account for account in locked}
+        source = accounts.get(from_account_id)
+        target = accounts.get(to_account_id)
+        if source is None or target is None:
+            raise AccountNotFound("Account not found")
+        if user is not None and not user.is_staff and source.user_id != user.id:
+            raise NotPermitted("You don't have permission to transfer from this account")
+        if source.balance < amount:
+            raise InsufficientFunds()
+
+        txn = Transaction(transaction_type='transfer', amount=amount, from_account=source, to_account=target)
+        txn.save()
+    # Exact while the rows were locked; saves reading them back
+    txn.from_balance = source.balance - amount
+    txn.to_balance = target.balance + amount
+    return txn
+
+
+def reclaim(account_id, amount, user=None):
+    """
+    Move ``amount`` from the account's round-up pot into its balance. When
+    ``user`` is given (and isn't staff) they must own the account. Returns
+    the saved ``roundup_reclaim`` Transaction.
+    """
+    _check_amount(amount)
+
+    with db_transaction.atomic():
+        account = Account.objects.select_for_update().filter(pk=account_id).first()
+        if account is None:
+            raise AccountNotFound("Account not found")
+        if user is not None and not user.is_staff and account.user_id != user.id:
+            raise NotPermitted("You don't have permission to reclaim from this account")
+        if account.round_up_pot < amount:
+            raise InsufficientFunds("Not enough in the round-up pot")
+
+        txn = Transaction(transaction_type='roundup_reclaim', amount=amount, from_account=account)
+        txn.save()
+    return txn
@@ -6,6 +6,7 @@ from rest_framework.routers import DefaultRouter
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from .views import AccountViewSet, TransactionViewSet, BusinessViewSet
+from . import async_views, metrics
 from .test_view import TestView
 import logging
 import traceback
@@ -28,6 +29,15 @@ urlpatterns = [
     # Test routing with very simple views
     path('simple-register/', SimpleRegisterView.as_view(), name='simple-registration'),
     path('test-view/', TestView.as_view(), name='banking-test-view'),
+    # Prometheus scrape endpoint, staff only
+    path('metrics/', metrics.metrics_view, name='metrics'),
+    # Async (ASGI) versions of the read-heavy endpoints
+    path('async/accounts/my_accounts/', async_views.my_accounts, name='async-my-accounts'),
+    path('async/user/', async_views.user_accounts, name='async-user-accounts'),
+    path('async/transactions/account/<str:account_id>/', async_views.account_transactions,
+         name='async-account-transactions'),
+    path('async/transactions/spending-summary/<str:account_id>/', async_views.spending_summary,
+         name='async-spending-summary'),
 ]
 
 #TASK1 Add swagger
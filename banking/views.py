@@ -3,111 +3,96 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from rest_framework.decorators import action
-from django.db import models
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.db import connection, transaction as db_transaction
 from django.db.models import Sum
-from django.contrib.auth.models import User
-from .models import Account, Transaction, Business
-from .serializers import AccountSerializer, TransactionSerializer, BusinessSerializer
-from decimal import Decimal
-import os
-import subprocess
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import (
+    Account, Transaction, Business, RoundUp, DailySpending, MonthlySpending, AccountSpending, BusinessSpending,
+    BusinessAccountDailySpending,
+)
+from .serializers import (
+    AccountSerializer, AccountSummarySerializer, TransactionSerializer, BusinessSerializer, RoundUpSerializer,
+    TransactionBulkRowSerializer, TransferSerializer,
+)
+from .renderers import NDJSONRenderer, CSVRenderer
+from .pagination import AccountPagination, TransactionPagination
+from .exports import EXPORT_FORMATS, filter_by_time_range, stream_transactions
+from .ownership import AccountOwnershipMixin, parse_account_id
+from . import catalogue, checkpoints, hashing, idempotency, ledger, registration, routers, transfers, write_queue
+from datetime import datetime, time, timedelta
+
+# granularity -> (rollup model, period field, default periods, max periods)
+TREND_GRANULARITIES = {
+    'monthly': (MonthlySpending, 'month', 12, 36),
+    'daily': (DailySpending, 'day', 30, 366),
+}
+
+# Fields whose change would move money on an existing transfer
+TRANSFER_FIELDS = ('transaction_type', 'amount', 'from_account', 'to_account')
+# Types that are only written through banking.transfers, which checks and locks first
+CHECKED_TYPES = ('transfer', ledger.RECLAIM_TYPE)
+
+# leaderboard window -> days covered (None for all time)
+LEADERBOARD_WINDOWS = {
+    '7d': 7,
+    '30d': 30,
+    '365d': 365,
+    'all': None,
+}
 
 class UserRegistrationView(APIView):
     permission_classes = [AllowAny]
     
     def post(self, request, *args, **kwargs):
-        # Extract user data from request
-        username = request.data.get('username')
-        password = request.data.get('password')
-        email = request.data.get('email', '')
-        first_name = request.data.get('first_name', '')
-        last_name = request.data.get('last_name', '')
-        
-        # Validate required fields
-        if not username or not password:
-            return Response(
-                {"error": "Username and password are required"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Check if username already exists
-        if User.objects.filter(username=username).exists():
-            return Response(
-                {"error": "Username already exists"}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
+        # Create the user and their default accounts in one transaction
         try:
-            # Create the user
-            user = User.objects.create_user(
-                username=username,
-                password=password,
-                email=email,
-                first_name=first_name,
-                last_name=last_name
-            )
-            
-            # Create default Current Account with 1000 starting balance
-            current_account = Account.objects.create(
-                name=f"{first_name or username}'s Current Account",
-                starting_balance=Decimal('1000.00'),
-                round_up_enabled=False,
-                user=user,
-                account_type='current'
-            )
-            
-            # Create default Savings Account with 0 starting balance
-            savings_account = Account.objects.create(
-                name=f"{first_name or username}'s Savings Account",
-                starting_balance=Decimal('0.00'),
-                round_up_enabled=True,  # Enable round-up for savings by default
-                user=user,
-                account_type='savings'
-            )
-            
-            # Return success response with account details
-            return Response({
-                "message": "User registered successfully",
-                "user_id": user.id,
-                "accounts": [
-                    {
-                        "id": str(current_account.id),
-                        "name": current_account.name,
-                        "type": current_account.get_account_type_display(),
-                        "balance": str(current_account.starting_balance)
-                    },
-                    {
-                        "id": str(savings_account.id),
-                        "name": savings_account.name,
-                        "type": savings_account.get_account_type_display(),
-                        "balance": str(savings_account.starting_balance)
-                    }
-                ]
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response(
-                {"error": f"Error creating user: {str(e)}"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            user, accounts = registration.register_user(
+                username=request.data.get('username'),
+                password=request.data.get('password'),
+                email=request.data.get('email', ''),
+                first_name=request.data.get('first_name', ''),
+                last_name=request.data.get('last_name', ''),
             )
+        except registration.RegistrationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except hashing.HashingBusy as e:
+            return Response({"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            headers={"Retry-After": str(e.retry_after)})
 
+        return Response({
+            "message": "User registered successfully",
+            "user_id": user.id,
+            "accounts": registration.describe_accounts(accounts),
+        }, status=status.HTTP_201_CREATED)
 
 class AccountViewSet(viewsets.ModelViewSet):
     serializer_class = AccountSerializer
+    pagination_class = AccountPagination
     
     def get_queryset(self):
         # If user is authenticated, return only their accounts
         # For admin users, return all accounts
         if self.request.user.is_authenticated:
             if self.request.user.is_staff:
-                return Account.objects.all()
+                return Account.objects.select_related('user')
             # Return only accounts associated with the logged-in user
-            return Account.objects.filter(user=self.request.user)
+            return Account.objects.filter(user=self.request.user).select_related('user')
         return Account.objects.none()
+
+    def get_serializer_class(self):
+        # Listings use the flat summary; single-account views keep the full representation
+        if self.action in ['list', 'my_accounts']:
+            return AccountSummarySerializer
+        return AccountSerializer
     
     def get_permissions(self):
         # For list and retrieve actions, require authentication
-        if self.action in ['list', 'retrieve', 'my_accounts', 'roundups', 'spending_trends', 'current_balance']:
+        if self.action in ['list', 'retrieve', 'my_accounts', 'roundups', 'spending_trends', 'current_balance',
+                           'balance_at']:
             return [IsAuthenticated()]
         # For create, update, delete actions, require admin privileges
         elif self.action in ['create', 'update', 'partial_update', 'destroy', 'manager_list']:
@@ -125,23 +110,123 @@ class AccountViewSet(viewsets.ModelViewSet):
         
         accounts = Account.objects.filter(user=request.user)
         serializer = self.get_serializer(accounts, many=True)
-        
-        # Print debugging info
-        print(f"User: {request.user}, Auth: {request.user.is_authenticated}")
-        print(f"Found {accounts.count()} accounts")
-        
         return Response(serializer.data)
 
-class TransactionViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'], url_path='current-balance')
+    def current_balance(self, request, pk=None):
+        """
+        Return the account's running balance. The balance is maintained as
+        transactions are written, so this is a single-row lookup.
+        """
+        account = self.get_object()
+        return Response({
+            "account_id": str(account.id),
+            "current_balance": account.balance,
+        })
+
+    @action(detail=True, methods=['get'], url_path='balance-at')
+    def balance_at(self, request, pk=None):
+        """
+        Return the account's balance and round-up pot at a point in time:
+        ?at=YYYY-MM-DD for the close of that day, or an ISO datetime. Starts
+        from the latest month-end checkpoint before then and adds only the
+        transactions since, rather than the account's whole history.
+        """
+        account = self.get_object()
+        value = request.query_params.get('at', '')
+        try:
+            day = parse_date(value)
+            moment = parse_datetime(value) if day is None else None
+        except ValueError:
+            day = moment = None
+        if day is not None:
+            until = timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min))
+        elif moment is not None:
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            # Include transactions at exactly that moment
+            until = moment + timedelta(microseconds=1)
+        else:
+            return Response({"detail": "at must be a date (YYYY-MM-DD) or an ISO 8601 datetime"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        balance, pot, checkpoint = checkpoints.balance_at(account, until)
+        return Response({
+            "account_id": str(account.id),
+            "at": value,
+            "balance": balance,
+            "round_up_pot": pot,
+            "checkpoint": checkpoint.period_end if checkpoint is not None else None,
+        })
+
+    @action(detail=True, methods=['get'])
+    def roundups(self, request, pk=None):
+        """
+        Return the account's round-up savings and the most recent pot
+        movements. The pot is accrued as payments are written, so past
+        payments are never rescanned here.
+        """
+        account = self.get_object()
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 50)), 500))
+        except ValueError:
+            return Response({"detail": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        history = RoundUp.objects.filter(account=account).order_by('-timestamp', '-id')[:limit]
+        return Response({
+            "account_id": str(account.id),
+            "round_up_enabled": account.round_up_enabled,
+            "savings": account.round_up_pot,
+            "history": RoundUpSerializer(history, many=True).data,
+        })
+
+    @action(detail=True, methods=['get'], url_path='spending-trends')
+    def spending_trends(self, request, pk=None):
+        """
+        Return spending per business category over time, read from the
+        pre-aggregated rollups. Defaults to the last 12 months; pass
+        ?granularity=daily&periods=30 for a daily series.
+        """
+        account = self.get_object()
+        granularity = request.query_params.get('granularity', 'monthly')
+        if granularity not in TREND_GRANULARITIES:
+            return Response({"detail": "granularity must be 'monthly' or 'daily'"}, status=status.HTTP_400_BAD_REQUEST)
+        model, period_field, default_periods, max_periods = TREND_GRANULARITIES[granularity]
+        try:
+            periods = max(1, min(int(request.query_params.get('periods', default_periods)), max_periods))
+        except ValueError:
+            return Response({"detail": "periods must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        today = timezone.localdate()
+        if granularity == 'monthly':
+            start = today.replace(day=1)
+            for _ in range(periods - 1):
+                start = (start - timedelta(days=1)).replace(day=1)
+        else:
+            start = today - timedelta(days=periods - 1)
+
+        with routers.use_replica():
+            rows = list(model.objects.filter(account=account, **{f'{period_field}__gte': start})
+                        .order_by(period_field, 'category')
+                        .values_list(period_field, 'category', 'total', 'count'))
+        return Response([
+            {
+                "period": period.strftime('%Y-%m' if granularity == 'monthly' else '%Y-%m-%d'),
+                "category": category or None,
+                "total": total,
+                "count": count,
+            }
+            for period, category, total, count in rows
+        ])
+
+class TransactionViewSet(AccountOwnershipMixin, viewsets.ModelViewSet):
     serializer_class = TransactionSerializer
+    pagination_class = TransactionPagination
     
     def get_queryset(self):
         # Return transactions for accounts owned by the user
         if self.request.user.is_authenticated:
-            if self.request.user.is_staff:
-                return Transaction.objects.all()
-            user_accounts = Account.objects.filter(user=self.request.user)
-            return Transaction.objects.filter(from_account__in=user_accounts)
+            return self.scope_to_owner(Transaction.objects.all())
         return Transaction.objects.none()
     
     def get_permissions(self):
@@ -151,82 +236,316 @@ class TransactionViewSet(viewsets.ModelViewSet):
         # For write actions, also require authentication
         return [IsAuthenticated()]
     
+    @idempotency.idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
     def perform_create(self, serializer):
-        # When creating a transaction, validate that the user owns the from_account
-        from_account_id = self.request.data.get('from_account')
-        
+        # When creating a transaction, validate that the user owns the from_account.
+        # The serializer has already loaded the account, so this costs no query.
+        from_account = serializer.validated_data['from_account']
+        if from_account.user_id != self.request.user.id and not self.request.user.is_staff:
+            raise PermissionDenied("You don't have permission to create transactions for this account")
+
+        to_account = serializer.validated_data.get('to_account')
+        transaction_type = serializer.validated_data['transaction_type']
+        amount = serializer.validated_data['amount']
+        if transaction_type == 'transfer':
+            if to_account is None:
+                raise ValidationError({'to_account': ["A transfer needs an account to pay into"]})
+            # Transfers between our accounts get the same funds check and locking as the transfer endpoint
+            serializer.instance = self.make_transfer(from_account.pk, to_account.pk, amount)
+            return
+        if transaction_type == ledger.RECLAIM_TYPE:
+            # Reclaims are checked against the pot with the account locked
+            serializer.instance = self.make_reclaim(from_account.pk, amount)
+            return
+        serializer.instance = write_queue.save(Transaction(**serializer.validated_data))
+
+    def perform_update(self, serializer):
+        # The same ownership rule as create, for the account the row ends up on
+        instance = serializer.instance
+        data = serializer.validated_data
+        from_account = data.get('from_account', instance.from_account)
+        if from_account.user_id != self.request.user.id and not self.request.user.is_staff:
+            raise PermissionDenied("You don't have permission to create transactions for this account")
+
+        # Re-pricing a transfer or reclaim in place would skip the funds check and locking
+        types = {instance.transaction_type, data.get('transaction_type', instance.transaction_type)}
+        changed = any(field in data and data[field] != getattr(instance, field) for field in TRANSFER_FIELDS)
+        if types & set(CHECKED_TYPES) and changed:
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [
+                "Transfers and round-up reclaims can't be changed; make a new one instead"
+            ]})
+        serializer.save()
+
+    def make_transfer(self, from_account_id, to_account_id, amount):
+        return self.call_money_service(transfers.transfer, from_account_id, to_account_id, amount)
+
+    def make_reclaim(self, account_id, amount):
+        return self.call_money_service(transfers.reclaim, account_id, amount)
+
+    def call_money_service(self, service, *args):
+        # Map banking.transfers errors onto API responses
         try:
-            from_account = Account.objects.get(id=from_account_id)
-            
-            # Check if the user is authorized for this account
-            if from_account.user != self.request.user and not self.request.user.is_staff:
-                raise PermissionError("You don't have permission to create transactions for this account")
-                
-            serializer.save()
-        except Account.DoesNotExist:
-            raise ValueError("Account not found")
-        except PermissionError as e:
-            raise PermissionError(str(e))
-
-    @action(detail=False, methods=['get'], url_path='account/(?P<account_id>[^/.]+)')
+            return service(*args, user=self.request.user)
+        except transfers.AccountNotFound as e:
+            raise NotFound(str(e))
+        except transfers.NotPermitted as e:
+            raise PermissionDenied(str(e))
+        except transfers.TransferError as e:
+            raise ValidationError({e.field or api_settings.NON_FIELD_ERRORS_KEY: [str(e)]})
+
+    @action(detail=False, methods=['post'])
+    @idempotency.idempotent
+    def transfer(self, request):
+        """
+        Move money between two accounts. Both balances change in one database
+        transaction, with the accounts locked and the payer's funds checked
+        first. Answers 400 if the balance doesn't cover the amount.
+        """
+        serializer = TransferSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        txn = self.make_transfer(data['from_account'], data['to_account'], data['amount'])
+        return Response({
+            **TransactionSerializer(txn).data,
+            "from_account_balance": txn.from_balance,
+            "to_account_balance": txn.to_balance,
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk_ingest(self, request):
+        """
+        Create many transactions in one request. Accepts a JSON list of rows
+        (or {"transactions": [...]}). Ownership of every referenced account
+        is checked with one query and the rows are inserted with bulk_create
+        in a single atomic block; if any row is invalid nothing is written
+        and the per-row errors are returned. Transfers and round-up reclaims
+        are refused, since they need a funds check with the account locked.
+        """
+        rows = request.data.get('transactions') if isinstance(request.data, dict) else request.data
+        if not isinstance(rows, list) or not rows:
+            return Response({"detail": "Expected a non-empty list of transactions"}, status=status.HTTP_400_BAD_REQUEST)
+        max_rows = getattr(settings, 'BULK_TRANSACTION_MAX_ROWS', 5000)
+        if len(rows) > max_rows:
+            return Response({"detail": f"At most {max_rows} transactions per request"}, status=status.HTTP_400_BAD_REQUEST)
+
+        errors = [{} for _ in rows]
+        valid_rows = []
+        for i, raw in enumerate(rows):
+            row_serializer = TransactionBulkRowSerializer(data=raw)
+            if not row_serializer.is_valid():
+                valid_rows.append(None)
+                errors[i] = dict(row_serializer.errors)
+            elif row_serializer.validated_data['transaction_type'] in CHECKED_TYPES:
+                # bulk_create can't lock and funds-check each payer
+                valid_rows.append(None)
+                errors[i] = {'transaction_type': ["Transfers and round-up reclaims can't be bulk uploaded"]}
+            else:
+                valid_rows.append(row_serializer.validated_data)
+
+        # Resolve every referenced account and business with one query each
+        account_ids = set()
+        business_ids = set()
+        for row in valid_rows:
+            if row is None:
+                continue
+            account_ids.add(row['from_account'])
+            if row.get('to_account'):
+                account_ids.add(row['to_account'])
+            if row.get('business'):
+                business_ids.add(row['business'])
+        owners = dict(Account.objects.filter(pk__in=account_ids).values_list('id', 'user_id'))
+        known_businesses = set(Business.objects.filter(pk__in=business_ids).values_list('id', flat=True))
+
+        for i, row in enumerate(valid_rows):
+            if row is None:
+                continue
+            if row['from_account'] not in owners:
+                errors[i]['from_account'] = ["Account not found"]
+            elif owners[row['from_account']] != request.user.id and not request.user.is_staff:
+                errors[i]['from_account'] = ["You don't have permission to create transactions for this account"]
+            if row.get('to_account') and row['to_account'] not in owners:
+                errors[i]['to_account'] = ["Account not found"]
+            if row.get('business') and row['business'] not in known_businesses:
+                errors[i]['business'] = ["Business not found"]
+
+        if any(errors):
+            return Response({
+                "detail": "No transactions were created",
+                "errors": [{"index": i, "errors": row_errors} for i, row_errors in enumerate(errors) if row_errors],
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        transactions = [
+            Transaction(
+                transaction_type=row['transaction_type'],
+                amount=row['amount'],
+                from_account_id=row['from_account'],
+                to_account_id=row.get('to_account'),
+                business_id=row.get('business'),
+            )
+            for row in valid_rows
+        ]
+        with db_transaction.atomic():
+            if connection.features.can_return_rows_from_bulk_insert:
+                Transaction.objects.bulk_create(transactions, batch_size=500)
+                ledger.apply(transactions)
+            else:
+                # Without returned ids the ledger can't link round-ups, so save row by row
+                for txn in transactions:
+                    txn.save()
+
+        return Response({
+            "created": len(transactions),
+            "ids": [txn.id for txn in transactions],
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='account/(?P<account_id>[^/.]+)',
+            renderer_classes=[*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer])
     def account_transactions(self, request, account_id=None):
-        # View all transactions related to a specific account
+        # View all transactions related to a specific account.
+        # ?since= (exclusive) and ?until= (inclusive) take ISO dates or datetimes.
+        # Asking for NDJSON or CSV (Accept header or ?format=ndjson|csv) streams
+        # the rows in chunks instead of building the whole body in memory.
+        # Ownership is part of the query; an empty result is checked afterwards.
+        account_uuid = parse_account_id(account_id)
+        if account_uuid is None:
+            return self.account_access_error(account_id)
         try:
-            account = Account.objects.get(id=account_id)
-            
-            # Check if the user has permission to access this account
-            if account.user != request.user and not request.user.is_staff:
-                return Response({"detail": "You don't have permission to access this account"}, 
-                               status=status.HTTP_403_FORBIDDEN)
-                
-            transactions = Transaction.objects.filter(from_account=account)
-            serializer = self.get_serializer(transactions, many=True)
-            return Response(serializer.data)
-        except Account.DoesNotExist:
-            return Response({"detail": "Account not found"}, status=status.HTTP_404_NOT_FOUND)
+            transactions = filter_by_time_range(
+                self.scope_to_owner(Transaction.objects.filter(from_account_id=account_uuid)),
+                request.query_params,
+            )
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.accepted_renderer.format in EXPORT_FORMATS:
+            # A stream can't be checked after the fact
+            error = self.account_access_error(account_uuid)
+            if error:
+                return error
+            return stream_transactions(transactions, request.accepted_renderer.format, f"transactions-{account_uuid}")
+
+        data = self.get_serializer(transactions, many=True).data
+        if not data:
+            error = self.account_access_error(account_uuid)
+            if error:
+                return error
+        return Response(data)
 
     @action(detail=False, methods=['get'], url_path='spending-summary/(?P<account_id>[^/.]+)')
     def spending_summary(self, request, account_id=None):
-        # Summarize spending by category for a given account
-        try:
-            account = Account.objects.get(id=account_id)
-            
-            # Check if the user has permission to access this account
-            if account.user != request.user and not request.user.is_staff:
-                return Response({"detail": "You don't have permission to access this account"}, 
-                               status=status.HTTP_403_FORBIDDEN)
-                
-            # Summarize spending by business category
-            spending_summary = Transaction.objects.filter(
-                from_account=account,
+        # Summarize spending by category for a given account.
+        # Ownership is checked on the primary; a stale replica could still show a former owner.
+        error = self.account_access_error(account_id)
+        if error:
+            return error
+
+        # Summarize spending by business category
+        with routers.use_replica():
+            spending_summary = list(Transaction.objects.filter(
+                from_account_id=parse_account_id(account_id),
                 transaction_type="payment"
-            ).values('business__category').annotate(total=Sum('amount'))        
-            return Response(spending_summary)
-        except Account.DoesNotExist:
-            return Response({"detail": "Account not found"}, status=status.HTTP_404_NOT_FOUND)
+            ).values('business__category').annotate(total=Sum('amount')))
+        return Response(spending_summary)
 
     @action(detail=False, methods=['get'], url_path='top-10-spenders')
     def top_10_spenders(self, request):
-        # Get the top 10 spenders by amount - admin only
+        # Get the top spenders by amount - admin only.
+        # ?n= sets the leaderboard size (default 10) and ?window=7d|30d|365d|all
+        # the period (default all). Reads the per-account spending rollups,
+        # grouped by account id so accounts sharing a name stay separate.
         if not request.user.is_staff:
             return Response({"detail": "Admin privileges required"}, status=status.HTTP_403_FORBIDDEN)
-            
-        top_spenders = Transaction.objects.filter(transaction_type="payment") \
-            .values('from_account__name') \
-            .annotate(total_spent=Sum('amount')) \
-            .order_by('-total_spent')[:10]
-        return Response(top_spenders)
+
+        window = request.query_params.get('window', 'all')
+        if window not in LEADERBOARD_WINDOWS:
+            return Response({"detail": f"window must be one of {', '.join(LEADERBOARD_WINDOWS)}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+        try:
+            n = max(1, min(int(request.query_params.get('n', 10)), 100))
+        except ValueError:
+            return Response({"detail": "n must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
+        days = LEADERBOARD_WINDOWS[window]
+        if days is None:
+            top_spenders = AccountSpending.objects.order_by('-total_spent') \
+                .values('account_id', 'account__name', 'total_spent')[:n]
+        else:
+            since = timezone.localdate() - timedelta(days=days - 1)
+            top_spenders = DailySpending.objects.filter(day__gte=since) \
+                .values('account_id', 'account__name') \
+                .annotate(total_spent=Sum('total')) \
+                .order_by('-total_spent')[:n]
+        with routers.use_replica():
+            top_spenders = list(top_spenders)
+
+        return Response([
+            {
+                "account_id": str(row['account_id']),
+                "account_name": row['account__name'],
+                "total_spent": row['total_spent'],
+            }
+            for row in top_spenders
+        ])
 
     @action(detail=False, methods=['get'], url_path='sanctioned-business-report')
     def sanctioned_business_report(self, request):
-        # Report all transactions related to sanctioned businesses - admin only
+        # Report spending with sanctioned businesses - admin only.
+        # Reads the per-business running totals from the replica. The
+        # sanctioned flags come from the primary, so a sanction flip shows up
+        # immediately. ?business=<id> drills into one business, broken down
+        # per paying account and per day.
         if not request.user.is_staff:
             return Response({"detail": "Admin privileges required"}, status=status.HTTP_403_FORBIDDEN)
-            
-        sanctioned_transactions = Transaction.objects.filter(business__sanctioned=True) \
-            .values('business__name') \
-            .annotate(total_spent=Sum('amount'))
-        return Response(sanctioned_transactions)
+
+        business_id = request.query_params.get('business')
+        if business_id is not None:
+            return self.sanctioned_business_detail(business_id)
+
+        names = dict(Business.objects.filter(sanctioned=True).values_list('id', 'name'))
+        with routers.use_replica():
+            totals = list(BusinessSpending.objects.filter(business_id__in=names)
+                          .order_by('-total_spent')
+                          .values_list('business_id', 'total_spent', 'count'))
+        return Response([
+            {
+                "business_id": business_id,
+                "business__name": names[business_id],
+                "total_spent": total_spent,
+                "count": count,
+            }
+            for business_id, total_spent, count in totals
+        ])
+
+    def sanctioned_business_detail(self, business_id):
+        business = Business.objects.filter(pk=business_id, sanctioned=True).first()
+        if business is None:
+            return Response({"detail": "Sanctioned business not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        rows = BusinessAccountDailySpending.objects.filter(business=business)
+        with routers.use_replica():
+            accounts = list(rows.values('account_id', 'account__name')
+                            .annotate(total=Sum('total'), count=Sum('count'))
+                            .order_by('-total'))
+            days = list(rows.values('day')
+                        .annotate(total=Sum('total'), count=Sum('count'))
+                        .order_by('-day'))
+        return Response({
+            "business_id": business.id,
+            "business_name": business.name,
+            "accounts": [
+                {
+                    "account_id": str(row['account_id']),
+                    "account_name": row['account__name'],
+                    "total": row['total'],
+                    "count": row['count'],
+                }
+                for row in accounts
+            ],
+            "days": days,
+        })
 
 
 class BusinessViewSet(viewsets.ModelViewSet):
@@ -238,4 +557,24 @@ class BusinessViewSet(viewsets.ModelViewSet):
         if self.action in ['list', 'retrieve']:
             return [IsAuthenticated()]
         # For write operations, require admin privileges
-        return [IsAdminUser()]
\ No newline at end of file
+        return [IsAdminUser()]
+
+    def cached_response(self, name, build):
+        # Serve the catalogue from the cache, answering 304 when the client's copy is current
+        data, etag = catalogue.get_or_build(name, build)
+        if catalogue.etag_matches(self.request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response('list', lambda: list(super(BusinessViewSet, self).list(request).data))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            f'detail:{kwargs[self.lookup_field]}',
+            lambda: dict(super(BusinessViewSet, self).retrieve(request, *args, **kwargs).data),
+        )
\ No newline at end of file
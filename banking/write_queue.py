@@ -0,0 +1,116 @@
+"""
+In-process write queue for transaction inserts.
+
+SQLite allows one writer at a time, and every commit syncs the journal. When
+many request threads post transactions at once they queue for the write
+lock, and each pays for its own commit. With ``TRANSACTION_WRITE_QUEUE``
+enabled, request threads hand their unsaved Transaction to a single writer
+thread instead. The writer drains whatever has queued up, to
+``TRANSACTION_WRITE_QUEUE_MAX_BATCH`` rows or
+``TRANSACTION_WRITE_QUEUE_MAX_WAIT`` seconds, saves each row in its own
+savepoint and commits the batch once (a group commit). Each caller blocks
+until its own row is committed or has failed, so the API's behaviour is
+unchanged.
+
+Rows are saved with ``Transaction.save()``, so the ledger and rollups are
+applied exactly as on the direct path.
+"""
+import os
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.conf import settings
+from django.db import connection, transaction as db_transaction
+
+
+class _Writer:
+    def __init__(self):
+        self.pid = os.getpid()
+        self.jobs = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.run, name='transaction-writer', daemon=True)
+        self.thread.start()
+
+    def submit(self, instance):
+        future = Future()
+        self.jobs.put((instance, future))
+        return future
+
+    def next_batch(self):
+        batch = [self.jobs.get()]
+        max_batch = settings.TRANSACTION_WRITE_QUEUE_MAX_BATCH
+        max_wait = settings.TRANSACTION_WRITE_QUEUE_MAX_WAIT
+        while len(batch) < max_batch:
+            try:
+                batch.append(self.jobs.get(timeout=max_wait))
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.next_batch()
+            try:
+                self.write(batch)
+            except Exception:
+                # The commit itself failed (e.g. a deferred foreign key check),
+                # so nothing was written; retry one row per commit so only
+                # the bad row fails
+                for job in batch:
+                    if not job[1].done():
+                        self.write_one(job)
+            finally:
+                connection.close_if_unusable_or_obsolete()
+
+    def write_one(self, job):
+        instance = job[0]
+        # Forget the id from the rolled-back insert so this is an insert again
+        instance.pk = None
+        instance._state.adding = True
+        try:
+            self.write([job])
+        except Exception as e:
+            job[1].set_exception(e)
+
+    def write(self, batch):
+        done = []
+        with db_transaction.atomic():
+            for instance, future in batch:
+                try:
+                    with db_transaction.atomic():
+                        instance.save()
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    done.append((instance, future))
+        for instance, future in done:
+            future.set_result(instance)
+
+
+_writer = None
+_lock = threading.Lock()
+
+
+def _get_writer():
+    global _writer
+    with _lock:
+        # A forked worker inherits the object but not the thread
+        if _writer is None or _writer.pid != os.getpid():
+            _writer = _Writer()
+        return _writer
+
+
+def enabled():
+    return settings.TRANSACTION_WRITE_QUEUE
+
+
+def save(instance):
+    """
+    Save a new Transaction, through the write queue when it's enabled.
+    Callers already inside a transaction save directly, because the writer
+    thread can't see their uncommitted rows.
+    """
+    if not enabled() or connection.in_atomic_block:
+        instance.save()
+        return instance
+    return _get_writer().submit(instance).result()
@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the banking API.
+
+Each module is a standalone script run from the project root, e.g.::
+
+    python -m benchmarks.bulk_ingest --rows 5000
+
+They run against a throwaway SQLite database, never ``db.sqlite3``.
+"""
@@ -0,0 +1,203 @@
+"""
+Synthetic load against the real URLconf: the main customer and staff
+endpoints driven by concurrent clients over a seeded dataset.
+
+    python -m benchmarks.api_load --users 1000 --transactions 1000000 --output run.json
+    python -m benchmarks.compare baseline.json run.json
+
+The dataset (``--users`` users with ``--accounts-per-user`` accounts each,
+``--businesses`` businesses and ``--transactions`` transactions) is
+generated with benchmarks.dataset, and the balances and rollups are then
+rebuilt. Tens of millions of transactions take a while to build, so pass
+``--database PATH`` to keep the file and reuse it on later runs. A file
+that already has users is used as it is.
+
+Each scenario sends ``--requests`` requests from ``--concurrency`` client
+threads, each acting as one of ``--clients`` customers. It reports
+throughput, latency percentiles, non-2xx responses and the database
+queries and time per request, taken from the metrics middleware
+(banking.metrics). ``--output`` writes the results as JSON for
+benchmarks.compare.
+
+Passwords use a fast hasher unless ``--real-hashing`` is given, so by
+default the login figures leave out the cost of PBKDF2.
+"""
+import argparse
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from benchmarks.common import Stopwatch, print_table, setup_django, summarize, write_results
+
+
+def _scenarios(window_days):
+    # name -> (route the metrics middleware files it under, request builder)
+    from django.utils import timezone
+
+    since = (timezone.now() - timedelta(days=window_days)).date().isoformat()
+    return {
+        'login': ('api-login', lambda who: (
+            'post', '/api/login/', {'data': {'username': who.username, 'password': 'password'}, 'format': 'json'})),
+        'my_accounts': ('account-my-accounts', lambda who: (
+            'get', '/api/accounts/my_accounts/', {})),
+        'account_transactions': ('transaction-account-transactions', lambda who: (
+            'get', f'/api/transactions/account/{who.account}/', {'data': {'since': since}})),
+        'spending_summary': ('transaction-spending-summary', lambda who: (
+            'get', f'/api/transactions/spending-summary/{who.account}/', {})),
+        'top_10_spenders': ('transaction-top-10-spenders', lambda who: (
+            'get', '/api/transactions/top-10-spenders/', {'data': {'window': '30d'}, 'staff': True})),
+        'transaction_create': ('transaction-list', lambda who: (
+            'post', '/api/transactions/', {'data': {
+                'transaction_type': 'deposit', 'amount': '1.00', 'from_account': str(who.account),
+            }, 'format': 'json'})),
+    }
+
+
+class Customer:
+    def __init__(self, user, account, token):
+        self.username = user.username
+        self.account = account
+        self.token = token
+
+
+def build_dataset(args):
+    from django.contrib.auth.models import User
+
+    from banking import ledger, rollups
+    from benchmarks import dataset
+
+    if User.objects.exists():
+        print('Reusing the existing dataset.')
+        return
+    print(f'Generating {args.users:,} users and {args.transactions:,} transactions...')
+    with Stopwatch() as watch:
+        dataset.generate(
+            users=args.users,
+            accounts_per_user=args.accounts_per_user,
+            businesses=args.businesses,
+            transactions=args.transactions,
+            seed=args.seed,
+            progress=lambda written: print(f'  {written:,} transactions', end='\r'),
+        )
+        ledger.rebuild()
+        rollups.rebuild()
+    print(f'\nBuilt the dataset in {watch.elapsed:.1f} s')
+
+
+def pick_customers(count, seed):
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from banking.models import Account
+
+    rng = random.Random(seed)
+    user_ids = list(User.objects.filter(is_staff=False).values_list('id', flat=True))
+    chosen = User.objects.in_bulk(rng.sample(user_ids, min(count, len(user_ids))))
+    accounts = {}
+    for account_id, user_id in Account.objects.filter(user_id__in=chosen).values_list('id', 'user_id'):
+        accounts.setdefault(user_id, []).append(account_id)
+    return [
+        Customer(user, rng.choice(accounts[user.id]), 'Bearer ' + str(RefreshToken.for_user(user).access_token))
+        for user in chosen.values() if user.id in accounts
+    ]
+
+
+def staff_token():
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    staff, _ = User.objects.get_or_create(username='bench-staff', defaults={'is_staff': True})
+    return 'Bearer ' + str(RefreshToken.for_user(staff).access_token)
+
+
+def run(build, customers, staff, requests, concurrency):
+    from rest_framework.test import APIClient
+
+    local = threading.local()
+    durations = []
+    failures = []
+
+    def send(i):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = APIClient()
+        who = customers[i % len(customers)]
+        method, url, options = build(who)
+        options = dict(options)
+        token = staff if options.pop('staff', False) else who.token
+        start = time.perf_counter()
+        response = getattr(client, method)(url, HTTP_AUTHORIZATION=token, **options)
+        durations.append(time.perf_counter() - start)
+        if response.status_code >= 300:
+            failures.append(response.status_code)
+
+    with Stopwatch() as watch, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, range(requests)))
+    return watch.elapsed, durations, failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--accounts-per-user', type=int, default=2)
+    parser.add_argument('--businesses', type=int, default=200)
+    parser.add_argument('--transactions', type=int, default=200000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--database', help='SQLite file to build the dataset in and reuse (default: a temporary file)')
+    parser.add_argument('--requests', type=int, default=500, help='requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--clients', type=int, default=50, help='distinct customers the requests are spread over')
+    parser.add_argument('--window-days', type=int, default=30, help='history requested by account_transactions')
+    parser.add_argument('--scenario', action='append', help='limit to these scenarios (default: all)')
+    parser.add_argument('--real-hashing', action='store_true', help='use the production password hasher')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    setup_django(db_path=args.database, fast_hashing=not args.real_hashing)
+
+    from django.conf import settings
+
+    from banking import metrics
+
+    settings.METRICS_ENABLED = True
+    # Shed logins (503) are counted as errors; don't log each one
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+    scenarios = _scenarios(args.window_days)
+    unknown = set(args.scenario or ()) - set(scenarios)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}; choose from {', '.join(scenarios)}")
+
+    build_dataset(args)
+    customers = pick_customers(args.clients, args.seed)
+    staff = staff_token()
+
+    results = []
+    for name in args.scenario or scenarios:
+        route, build = scenarios[name]
+        run(build, customers, staff, min(20, args.requests), args.concurrency)  # warm up
+        metrics.registry.clear()
+        elapsed, durations, failures = run(build, customers, staff, args.requests, args.concurrency)
+        stats = {key[0]: value for key, value in metrics.registry.snapshot().items()}.get(route)
+        served = stats[1] if stats else 0
+        results.append({
+            'scenario': name,
+            'requests': args.requests,
+            'errors': len(failures),
+            'req_per_sec': args.requests / elapsed,
+            **{key: value for key, value in summarize(durations).items() if key != 'count'},
+            'queries_per_request': stats[3] / served if served else None,
+            'db_ms_per_request': stats[4] * 1000 / served if served else None,
+        })
+
+    print_table(results, ['scenario', 'req_per_sec', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms',
+                          'queries_per_request', 'db_ms_per_request', 'errors'])
+    if args.output:
+        write_results(args.output, 'api_load', vars(args), results)
+        print(f'\nWrote {args.output}')
+
+
+if __name__ == '__main__':
+    main()
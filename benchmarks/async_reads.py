@@ -0,0 +1,119 @@
+"""
+The async read endpoints (banking.async_views) served through Django's ASGI
+handler against their synchronous DRF counterparts served through WSGI.
+
+    python -m benchmarks.async_reads --concurrency 64 --requests 2000
+
+``--concurrency`` clients issue requests back to back. On the WSGI path
+they share ``--threads`` worker threads, like a threaded WSGI server, and
+queue for a free one; on the ASGI path every request runs on one event
+loop. Latency is measured from the client's side, queueing included. Both
+paths run in-process, so the numbers compare request handling rather than
+network I/O.
+"""
+import argparse
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import Stopwatch, print_table, setup_django, summarize
+
+ENDPOINTS = {
+    'my_accounts': ('/api/accounts/my_accounts/', '/api/async/accounts/my_accounts/'),
+    'user': ('/api/user/', '/api/async/user/'),
+    'account_transactions': ('/api/transactions/account/{account}/', '/api/async/transactions/account/{account}/'),
+    'spending_summary': ('/api/transactions/spending-summary/{account}/',
+                         '/api/async/transactions/spending-summary/{account}/'),
+}
+
+
+def run_wsgi(url, token, requests, concurrency, threads):
+    from django.db import connections
+    from django.test import Client
+
+    local = threading.local()
+    # Stands in for the server's worker threads; clients queue for one
+    workers = threading.Semaphore(threads)
+    durations = []
+
+    def get(_):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client(HTTP_AUTHORIZATION=token)
+        start = time.perf_counter()
+        with workers:
+            response = client.get(url, HTTP_ACCEPT='application/json')
+            connections.close_all()
+        durations.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.content
+
+    with Stopwatch() as watch, ThreadPoolExecutor(max_workers=concurrency) as clients:
+        list(clients.map(get, range(requests)))
+    return watch.elapsed, durations
+
+
+def run_asgi(url, token, requests, concurrency, threads=None):
+    from django.test import AsyncClient
+
+    durations = []
+
+    async def main():
+        client = AsyncClient()
+        clients = asyncio.Semaphore(concurrency)
+
+        async def get():
+            async with clients:
+                start = time.perf_counter()
+                response = await client.get(url, headers={'Authorization': token})
+                durations.append(time.perf_counter() - start)
+                assert response.status_code == 200, response.content
+
+        await asyncio.gather(*(get() for _ in range(requests)))
+
+    with Stopwatch() as watch:
+        asyncio.run(main())
+    return watch.elapsed, durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000, help='requests per endpoint and path')
+    parser.add_argument('--concurrency', type=int, default=64, help='concurrent clients')
+    parser.add_argument('--threads', type=int, default=8, help='worker threads on the WSGI path')
+    parser.add_argument('--transactions', type=int, default=20000)
+    parser.add_argument('--endpoint', choices=ENDPOINTS, action='append', help='limit to these endpoints')
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from benchmarks import dataset
+
+    users, accounts, _ = dataset.generate(users=20, transactions=args.transactions)
+    user = users[0]
+    account = next(account for account in accounts if account.user_id == user.id)
+    token = 'Bearer ' + str(RefreshToken.for_user(user).access_token)
+
+    results = []
+    for name in args.endpoint or ENDPOINTS:
+        sync_url, async_url = (url.format(account=account.id) for url in ENDPOINTS[name])
+        for path, runner, url in (
+            (f'WSGI ({args.threads} threads)', run_wsgi, sync_url),
+            ('ASGI (one event loop)', run_asgi, async_url),
+        ):
+            runner(url, token, 5, args.concurrency, args.threads)  # warm up
+            elapsed, durations = runner(url, token, args.requests, args.concurrency, args.threads)
+            results.append({
+                'endpoint': name,
+                'path': path,
+                'req_per_sec': args.requests / elapsed,
+                **{key: value for key, value in summarize(durations).items() if key != 'count'},
+            })
+
+    print_table(results, ['endpoint', 'path', 'req_per_sec', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+Throughput of POST /api/transactions/ (one row per request) against
+POST /api/transactions/bulk/ (many rows per request).
+
+    python -m benchmarks.bulk_ingest --rows 2000 --batch-size 1000
+"""
+import argparse
+import random
+from decimal import Decimal
+
+from benchmarks.common import Stopwatch, api_client, count_queries, print_table, setup_django
+
+
+def make_rows(accounts, businesses, count, seed):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(count):
+        rows.append({
+            'transaction_type': 'payment',
+            'amount': str(Decimal(rng.randint(100, 20000)) / 100),
+            'from_account': str(rng.choice(accounts).id),
+            'business': rng.choice(businesses).id,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2000, help='rows to ingest through each path')
+    parser.add_argument('--batch-size', type=int, default=1000, help='rows per bulk request')
+    parser.add_argument('--accounts', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from banking.models import Account, Business, Transaction
+
+    user = User.objects.create_user(username='bench', password='bench')
+    accounts = [
+        Account.objects.create(name=f'Bench {i}', starting_balance=Decimal('100000.00'), user=user, round_up_enabled=True)
+        for i in range(args.accounts)
+    ]
+    businesses = [
+        Business.objects.create(id=f'biz{i}', name=f'Business {i}', category=f'Category {i % 5}')
+        for i in range(20)
+    ]
+    client = api_client(user)
+
+    results = []
+
+    rows = make_rows(accounts, businesses, args.rows, args.seed)
+    with count_queries() as queries, Stopwatch() as watch:
+        for row in rows:
+            response = client.post('/api/transactions/', row, format='json')
+            assert response.status_code == 201, response.content
+    results.append({
+        'path': 'single-row POST',
+        'rows': len(rows),
+        'seconds': watch.elapsed,
+        'rows_per_sec': len(rows) / watch.elapsed,
+        'queries_per_row': queries.count / len(rows),
+    })
+
+    rows = make_rows(accounts, businesses, args.rows, args.seed + 1)
+    with count_queries() as queries, Stopwatch() as watch:
+        for start in range(0, len(rows), args.batch_size):
+            response = client.post('/api/transactions/bulk/', rows[start:start + args.batch_size], format='json')
+            assert response.status_code == 201, response.content
+    results.append({
+        'path': f'bulk POST ({args.batch_size}/request)',
+        'rows': len(rows),
+        'seconds': watch.elapsed,
+        'rows_per_sec': len(rows) / watch.elapsed,
+        'queries_per_row': queries.count / len(rows),
+    })
+
+    print_table(results, ['path', 'rows', 'seconds', 'rows_per_sec', 'queries_per_row'])
+    print(f'speed-up: {results[1]["rows_per_sec"] / results[0]["rows_per_sec"]:.1f}x')
+    assert Transaction.objects.count() == 2 * args.rows
+
+
+if __name__ == '__main__':
+    main()
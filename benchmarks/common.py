@@ -0,0 +1,169 @@
+"""
+Shared bootstrap and reporting helpers for the benchmark scripts.
+"""
+import atexit
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_path=None, fast_hashing=True, migrate=True):
+    """
+    Configure Django against a fresh SQLite file and migrate it (unless
+    ``migrate`` is false). Returns the database path. ``fast_hashing`` swaps
+    PBKDF2 for MD5 so fixture users are cheap to create; benchmarks that
+    measure hashing must turn it off.
+    """
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'extra_credit_union.settings')
+
+    from django.conf import settings
+
+    if db_path is None:
+        fd, db_path = tempfile.mkstemp(prefix='banking-bench-', suffix='.sqlite3')
+        os.close(fd)
+        atexit.register(_remove_database, db_path)
+    settings.DATABASES['default']['NAME'] = str(db_path)
+    if fast_hashing:
+        settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+    import django
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    setup_test_environment()
+    if migrate:
+        call_command('migrate', verbosity=0)
+    return db_path
+
+
+def _remove_database(db_path):
+    for suffix in ('', '-wal', '-shm', '-journal'):
+        try:
+            os.remove(db_path + suffix)
+        except FileNotFoundError:
+            pass
+
+
+def api_client(user):
+    """An APIClient authenticated as ``user`` with a real JWT."""
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(RefreshToken.for_user(user).access_token))
+    return client
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Yield a ``QueryCounter`` whose ``count`` is the number of queries run in the block."""
+    from django.db import connection
+
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples):
+    """Latency summary (in milliseconds) of a list of durations in seconds."""
+    return {
+        'count': len(samples),
+        'mean_ms': statistics.fmean(samples) * 1000 if samples else 0.0,
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p95_ms': percentile(samples, 95) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+    }
+
+
+class Stopwatch:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+
+
+def print_table(rows, columns):
+    """Print a list of dicts as an aligned plain-text table."""
+    widths = {
+        column: max(len(column), *(len(_format(row.get(column))) for row in rows))
+        for column in columns
+    }
+    print('  '.join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        print('  '.join(_format(row.get(column)).ljust(widths[column]) for column in columns))
+
+
+def _format(value):
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return '' if value is None else str(value)
+
+
+def environment():
+    """What a result was measured on, so runs from different setups aren't compared blindly."""
+    import sqlite3
+
+    import django
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=PROJECT_ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def write_results(path, benchmark, parameters, results):
+    """
+    Write a run as JSON for ``python -m benchmarks.compare``. ``results`` is a
+    list of dicts, each identified by its ``scenario`` key.
+    """
+    document = {
+        'benchmark': benchmark,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': environment(),
+        'parameters': parameters,
+        'results': results,
+    }
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write('\n')
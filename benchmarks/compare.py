@@ -0,0 +1,101 @@
+"""
+Compare two benchmark result files written with ``--output``.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 10
+
+Scenarios are matched by name. A metric counts as a regression when it
+gets worse by more than ``--threshold`` percent: throughput falling, or
+latency, errors or queries per request rising. Any increase in queries per
+request is flagged, because it is a count rather than a noisy timing.
+Exits with status 1 if anything regressed, so the check can gate CI.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.common import print_table
+
+# metric -> True if bigger is better
+METRICS = {
+    'req_per_sec': True,
+    'mean_ms': False,
+    'p50_ms': False,
+    'p95_ms': False,
+    'p99_ms': False,
+    'queries_per_request': False,
+    'db_ms_per_request': False,
+    'errors': False,
+}
+# Exact counts: any change the wrong way is a regression
+EXACT = {'queries_per_request', 'errors'}
+
+
+def load(path):
+    with open(path) as f:
+        document = json.load(f)
+    return document, {row['scenario']: row for row in document['results']}
+
+
+def compare(baseline, candidate, threshold):
+    """Return ``(rows, regressions)`` for the scenarios both runs measured."""
+    rows = []
+    regressions = []
+    for scenario in baseline:
+        if scenario not in candidate:
+            continue
+        for metric, higher_is_better in METRICS.items():
+            before = baseline[scenario].get(metric)
+            after = candidate[scenario].get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before * 100 if before else (0.0 if after == before else float('inf'))
+            worse = after < before if higher_is_better else after > before
+            limit = 0 if metric in EXACT else threshold
+            regressed = worse and abs(change) > limit
+            improved = not worse and after != before and abs(change) > limit
+            row = {
+                'scenario': scenario,
+                'metric': metric,
+                'baseline': before,
+                'candidate': after,
+                'change_pct': change,
+                'verdict': 'REGRESSION' if regressed else 'improved' if improved else '',
+            }
+            rows.append(row)
+            if regressed:
+                regressions.append(row)
+    return rows, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0, help='tolerated change in percent (default 10)')
+    args = parser.parse_args()
+
+    baseline_doc, baseline = load(args.baseline)
+    candidate_doc, candidate = load(args.candidate)
+    if baseline_doc.get('benchmark') != candidate_doc.get('benchmark'):
+        parser.error(f"{args.baseline} and {args.candidate} are results of different benchmarks")
+    for key in ('cpu_count', 'platform', 'sqlite'):
+        before = baseline_doc['environment'].get(key)
+        after = candidate_doc['environment'].get(key)
+        if before != after:
+            print(f'warning: {key} differs ({before} vs {after}); timings may not be comparable')
+    if baseline_doc.get('parameters', {}).get('transactions') != candidate_doc.get('parameters', {}).get('transactions'):
+        print('warning: the runs used different dataset sizes')
+
+    rows, regressions = compare(baseline, candidate, args.threshold)
+    print_table(rows, ['scenario', 'metric', 'baseline', 'candidate', 'change_pct', 'verdict'])
+    missing = sorted(set(baseline) ^ set(candidate))
+    if missing:
+        print(f"\nOnly in one run: {', '.join(missing)}")
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) beyond {args.threshold:g}%')
+        sys.exit(1)
+    print('\nNo regressions.')
+
+
+if __name__ == '__main__':
+    main()
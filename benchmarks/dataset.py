@@ -0,0 +1,116 @@
+"""
+Seeded synthetic data for the benchmarks.
+
+Transactions are written with raw ``executemany`` batches rather than the
+ORM, so tens of millions of rows load in minutes. That also skips the
+ledger, so callers that need balances or rollups should run
+``rebuild_ledger`` afterwards.
+"""
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+TRANSACTION_MIX = [
+    ('payment', 70),
+    ('withdrawal', 10),
+    ('deposit', 10),
+    ('transfer', 10),
+]
+CATEGORIES = ['Food', 'Travel', 'Retail', 'Utilities', 'Entertainment', 'Health', 'Gambling', 'Crypto']
+
+
+def create_users(count, password='password', prefix='user'):
+    """Create ``count`` users without firing the default-account signal per row."""
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+
+    encoded = make_password(password)
+    users = [User(username=f'{prefix}{i}', password=encoded) for i in range(count)]
+    return User.objects.bulk_create(users, batch_size=500)
+
+
+def create_accounts(users, per_user, rng):
+    from banking.models import Account
+
+    accounts = []
+    for user in users:
+        for n in range(per_user):
+            balance = Decimal(rng.randint(0, 500000)) / 100
+            accounts.append(Account(
+                id=uuid.UUID(int=rng.getrandbits(128), version=4),
+                name=f'{user.username} account {n}',
+                starting_balance=balance,
+                balance=balance,
+                round_up_enabled=n == 0,
+                user=user,
+                account_type='current' if n == 0 else 'savings',
+            ))
+    return Account.objects.bulk_create(accounts, batch_size=500)
+
+
+def create_businesses(count, rng, sanctioned_share=0.05):
+    from banking.models import Business
+
+    return Business.objects.bulk_create([
+        Business(
+            id=f'biz{i}',
+            name=f'Business {i}',
+            category=rng.choice(CATEGORIES),
+            sanctioned=rng.random() < sanctioned_share,
+        )
+        for i in range(count)
+    ], batch_size=500)
+
+
+def insert_transactions(accounts, businesses, count, rng, days=365 * 3, batch_size=50000, progress=None):
+    """
+    Insert ``count`` transactions spread over the last ``days`` days with raw
+    SQL. Returns the number of rows written.
+    """
+    from django.db import connection, transaction as db_transaction
+    from django.utils import timezone
+
+    from banking.models import Transaction
+
+    table = Transaction._meta.db_table
+    sql = (
+        f'INSERT INTO {table} (transaction_type, amount, from_account_id, to_account_id, business_id, timestamp) '
+        'VALUES (%s, %s, %s, %s, %s, %s)'
+    )
+    account_ids = [account.id.hex for account in accounts]
+    business_ids = [business.id for business in businesses]
+    types, weights = zip(*TRANSACTION_MIX)
+    now = timezone.now().replace(tzinfo=None)
+    span = days * 86400
+
+    written = 0
+    while written < count:
+        size = min(batch_size, count - written)
+        rows = []
+        for kind in rng.choices(types, weights, k=size):
+            from_id = rng.choice(account_ids)
+            to_id = rng.choice(account_ids) if kind == 'transfer' else None
+            business_id = rng.choice(business_ids) if kind == 'payment' and business_ids else None
+            amount = f'{rng.randint(50, 25000) / 100:.2f}'
+            timestamp = (now - timedelta(seconds=rng.randrange(span))).strftime('%Y-%m-%d %H:%M:%S.%f')
+            rows.append((kind, amount, from_id, to_id, business_id, timestamp))
+        with db_transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+        written += size
+        if progress:
+            progress(written)
+    return written
+
+
+def generate(users=100, accounts_per_user=2, businesses=50, transactions=10000, seed=1, days=365 * 3, progress=None):
+    """
+    Build a complete dataset and return ``(users, accounts, businesses)``.
+    The same arguments and seed always produce the same rows.
+    """
+    rng = random.Random(seed)
+    user_rows = create_users(users)
+    account_rows = create_accounts(user_rows, accounts_per_user, rng)
+    business_rows = create_businesses(businesses, rng)
+    insert_transactions(account_rows, business_rows, transactions, rng, days=days, progress=progress)
+    return user_rows, account_rows, business_rows
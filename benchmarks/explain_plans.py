@@ -0,0 +1,116 @@
+"""
+SQLite query plans for the endpoint queries on the transaction table,
+before and after the 0010_transaction_indexes migration.
+
+    python -m benchmarks.explain_plans --transactions 2000000
+
+Loads a generated dataset at the migration just before the indexes, prints
+``EXPLAIN QUERY PLAN`` and a timing for every query, applies the index
+migration, and prints both again.
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.common import setup_django
+
+BEFORE = '0009_spending_rollups'
+AFTER = '0010_transaction_indexes'
+
+
+def endpoint_queries(user, account, since):
+    """The transaction-table queries each endpoint runs, built the same way the views build them."""
+    from django.db.models import Sum
+    from django.db.models.functions import TruncDate
+
+    from banking.models import Account, Transaction
+
+    return {
+        'account_transactions': Transaction.objects.filter(from_account=account),
+        'account_transactions export ?since=': Transaction.objects.filter(from_account=account, timestamp__gt=since)
+            .order_by('timestamp', 'id'),
+        'transactions list (customer)': Transaction.objects.filter(from_account__in=Account.objects.filter(user=user))
+            .order_by('-timestamp', '-id')[:51],
+        'transactions list (staff)': Transaction.objects.all().order_by('-timestamp', '-id')[:51],
+        'spending_summary': Transaction.objects.filter(from_account=account, transaction_type='payment')
+            .values('business__category').annotate(total=Sum('amount')),
+        'sanctioned business scan': Transaction.objects.filter(business__sanctioned=True)
+            .values('business__name').annotate(total_spent=Sum('amount')),
+        'daily rollup rebuild': Transaction.objects.filter(transaction_type='payment')
+            .annotate(period=TruncDate('timestamp')).values('from_account', 'business__category', 'period')
+            .annotate(total=Sum('amount')).order_by(),
+    }
+
+
+def explain(queries, repeat):
+    from django.db import connection
+
+    results = {}
+    for name, queryset in queries.items():
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            plan = [row[-1] for row in cursor.fetchall()]
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                cursor.execute(sql, params)
+                cursor.fetchall()
+                timings.append(time.perf_counter() - start)
+        results[name] = (plan, statistics.median(timings) * 1000)
+    return results
+
+
+def print_plans(title, results):
+    print(f'\n=== {title} ===')
+    for name, (plan, ms) in results.items():
+        print(f'\n{name}  ({ms:.1f} ms)')
+        for step in plan:
+            print(f'    {step}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--transactions', type=int, default=2000000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--businesses', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per query (median reported)')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    setup_django(migrate=False)
+
+    from django.core.management import call_command
+    from django.db import connection
+    from django.utils import timezone
+    from datetime import timedelta
+
+    from benchmarks import dataset
+
+    call_command('migrate', verbosity=0)
+    call_command('migrate', 'banking', BEFORE, verbosity=0)
+
+    print(f'Generating {args.transactions:,} transactions...')
+    users, accounts, _ = dataset.generate(
+        users=args.users,
+        businesses=args.businesses,
+        transactions=args.transactions,
+        seed=args.seed,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+    queries = endpoint_queries(users[0], accounts[0], timezone.now() - timedelta(days=30))
+    print_plans(f'before ({BEFORE})', explain(queries, args.repeat))
+
+    start = time.perf_counter()
+    call_command('migrate', 'banking', AFTER, verbosity=0)
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    print(f'\nApplied {AFTER} in {time.perf_counter() - start:.1f} s')
+
+    print_plans(f'after ({AFTER})', explain(queries, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Login throughput under concurrency, hashing inline on the request thread
+against hashing in the process pool (banking.hashing).
+
+    python -m benchmarks.login_throughput --concurrency 16 --requests 200
+
+Each mode fires ``--requests`` logins from ``--concurrency`` threads with the
+real PBKDF2 hasher and reports logins per second, latency percentiles and
+how many requests were shed with a 503.
+"""
+import argparse
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import Stopwatch, print_table, setup_django, summarize
+
+
+def run(concurrency, requests, usernames, password):
+    from django.db import connections
+    from django.test import Client
+
+    local = threading.local()
+    durations = []
+    statuses = []
+
+    def login(i):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = Client()
+        start = time.perf_counter()
+        response = client.post(
+            '/api/login/',
+            {'username': usernames[i % len(usernames)], 'password': password},
+            content_type='application/json',
+        )
+        durations.append(time.perf_counter() - start)
+        statuses.append(response.status_code)
+        connections.close_all()
+
+    with Stopwatch() as watch, ThreadPoolExecutor(max_workers=concurrency) as threads:
+        list(threads.map(login, range(requests)))
+    return watch.elapsed, durations, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', type=int, default=16, help='client threads')
+    parser.add_argument('--requests', type=int, default=200, help='logins per mode')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='hashing pool size')
+    parser.add_argument('--queue', type=int, default=None, help='admission queue (default 2x workers)')
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django(fast_hashing=False)
+    # Shed requests are expected here; don't log each 503
+    logging.getLogger('django.request').setLevel(logging.CRITICAL)
+
+    from django.conf import settings
+
+    from banking import hashing
+    from benchmarks import dataset
+
+    password = 'correct horse battery staple'
+    usernames = [user.username for user in dataset.create_users(args.users, password=password)]
+    queue = args.queue if args.queue is not None else 2 * args.workers
+
+    results = []
+    for mode, workers in (('inline', 0), (f'pool ({args.workers} workers)', args.workers)):
+        settings.PASSWORD_HASH_WORKERS = workers
+        settings.PASSWORD_HASH_QUEUE = queue if workers else args.concurrency
+        hashing.reset()
+        # Warm up so process start-up isn't counted
+        run(1, 1, usernames, password)
+
+        elapsed, durations, statuses = run(args.concurrency, args.requests, usernames, password)
+        ok = [d for d, code in zip(durations, statuses) if code == 200]
+        results.append({
+            'mode': mode,
+            'logins': len(ok),
+            'shed_503': statuses.count(503),
+            'logins_per_sec': len(ok) / elapsed,
+            **{key: value for key, value in summarize(ok).items() if key != 'count'},
+        })
+        assert set(statuses) <= {200, 503}, statuses
+
+    hashing.reset()
+    print(f'{args.requests} logins per mode, {args.concurrency} client threads, '
+          f'admission limit {args.workers} workers + {queue} queued')
+    print_table(results, ['mode', 'logins', 'shed_503', 'logins_per_sec', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Concurrent transaction posts against SQLite: untuned connections, tuned
+connections (banking.sqlite), and tuned connections with the write queue
+(banking.write_queue).
+
+    python -m benchmarks.sqlite_writes --threads 16 --posts 50
+
+Each mode runs in a fresh process against a fresh database file. Every
+thread posts ``--posts`` transactions through POST /api/transactions/.
+Reported per mode: throughput, latency and how many posts failed (for
+example with "database is locked").
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from decimal import Decimal
+
+from benchmarks.common import PROJECT_ROOT, Stopwatch, print_table, setup_django, summarize
+
+MODES = ['untuned', 'tuned', 'tuned + write queue']
+
+
+def child(mode, threads, posts):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'extra_credit_union.settings')
+    from django.conf import settings
+
+    if mode == 'untuned':
+        settings.SQLITE_PRAGMAS = {}
+        settings.DATABASES['default']['OPTIONS'] = {}
+        settings.DATABASES['default']['CONN_MAX_AGE'] = 0
+    settings.SQLITE_WAL = mode != 'untuned'
+    settings.TRANSACTION_WRITE_QUEUE = mode == 'tuned + write queue'
+    setup_django()
+
+    from django.contrib.auth.models import User
+    from django.db import connections
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from banking.models import Account, Transaction
+
+    user = User.objects.create_user(username='writer', password='writer')
+    account = Account.objects.create(name='Hot account', starting_balance=Decimal('1000000.00'), user=user)
+    token = 'Bearer ' + str(RefreshToken.for_user(user).access_token)
+    connections.close_all()
+
+    durations = []
+    failures = []
+
+    def worker():
+        client = APIClient(raise_request_exception=False)
+        client.credentials(HTTP_AUTHORIZATION=token)
+        for _ in range(posts):
+            start = time.perf_counter()
+            try:
+                response = client.post('/api/transactions/', {
+                    'transaction_type': 'withdrawal',
+                    'amount': '1.00',
+                    'from_account': str(account.id),
+                }, format='json')
+                ok = response.status_code == 201
+            except Exception:
+                ok = False
+            durations.append(time.perf_counter() - start)
+            if not ok:
+                failures.append(1)
+        connections.close_all()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    with Stopwatch() as watch:
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    written = Transaction.objects.count()
+    account.refresh_from_db()
+    assert account.balance == account.starting_balance - written, 'balance out of step with the rows written'
+    print(json.dumps({
+        'mode': mode,
+        'written': written,
+        'failed': len(failures),
+        'posts_per_sec': written / watch.elapsed,
+        **{key: value for key, value in summarize(durations).items() if key != 'count'},
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--posts', type=int, default=50, help='posts per thread')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.threads, args.posts)
+        return
+
+    results = []
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.sqlite_writes', '--child', mode,
+             '--threads', str(args.threads), '--posts', str(args.posts)],
+            cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f'{args.threads} threads x {args.posts} posts')
+    print_table(results, ['mode', 'written', 'failed', 'posts_per_sec', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Cold-start cost of a fresh server process, with and without the
+extra_credit_union.warmup hooks.
+
+    python -m benchmarks.startup --runs 5
+
+Each run starts a new Python process that boots Django (including migrating
+a throwaway database), optionally warms up, then times its first and second
+request to a few endpoints. Without warm-up the first request pays for
+URLconf, serializer and schema set-up; with it that cost moves to start-up,
+before the process takes traffic.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PROJECT_ROOT, print_table, setup_django
+
+ENDPOINTS = [
+    ('swagger schema', '/api/swagger/?format=openapi'),
+    ('business list', '/api/businesses/'),
+    ('my_accounts', '/api/accounts/my_accounts/'),
+]
+
+
+def child(warm):
+    started = time.perf_counter()
+    setup_django()
+    booted = time.perf_counter()
+
+    from django.contrib.auth.models import User
+    from django.test import Client
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    user = User.objects.create_user(username='startup', password='startup')
+    token = 'Bearer ' + str(RefreshToken.for_user(user).access_token)
+
+    warmed = booted
+    if warm:
+        from extra_credit_union import warmup
+
+        warmup.warm_imports()
+        warmup.close_connections()
+        warmup.warm_connections()
+        warmed = time.perf_counter()
+
+    client = Client(HTTP_AUTHORIZATION=token)
+    result = {'boot_s': booted - started, 'warmup_s': warmed - booted}
+    for name, url in ENDPOINTS:
+        for attempt in ('first', 'second'):
+            start = time.perf_counter()
+            response = client.get(url)
+            result[f'{name} {attempt}_ms'] = (time.perf_counter() - start) * 1000
+            assert response.status_code == 200, (url, response.status_code)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per mode (median reported)')
+    parser.add_argument('--child', choices=['cold', 'warm'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child == 'warm')
+        return
+
+    rows = []
+    for mode in ('cold', 'warm'):
+        runs = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.startup', '--child', mode],
+                cwd=PROJECT_ROOT, check=True, capture_output=True, text=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        for key in runs[0]:
+            rows.append({'mode': mode, 'measure': key, 'median': statistics.median(run[key] for run in runs)})
+
+    print(f'median of {args.runs} fresh processes per mode')
+    print_table(rows, ['mode', 'measure', 'median'])
+
+
+if __name__ == '__main__':
+    main()
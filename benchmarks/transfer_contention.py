@@ -0,0 +1,131 @@
+"""
+Many threads transferring money between a few hot accounts, through the
+transfer service (banking.transfers) and through the old path of saving a
+bare ``transfer`` Transaction with no lock and no funds check.
+
+    python -m benchmarks.transfer_contention --threads 200 --accounts 4 --transfers 5000
+
+Each mode starts from fresh accounts holding ``--balance`` each. Threads
+pick random payer/payee pairs and amounts, so many transfers meet an
+empty account. Reported per mode: completed transfers per second, transfers
+refused for lack of funds, errors (on SQLite, writers that gave up waiting
+for the lock after ``busy_timeout``; they write nothing), and three
+consistency checks: money created or destroyed across the hot accounts,
+stored balances that disagree with the transaction log (lost updates), and
+accounts overdrawn.
+"""
+import argparse
+import random
+import threading
+from decimal import Decimal
+
+from benchmarks.common import Stopwatch, print_table, setup_django
+
+MODES = ['transfer service', 'unchecked save']
+
+
+def make_accounts(count, balance, label):
+    from django.contrib.auth.models import User
+
+    from banking.models import Account
+
+    user = User.objects.create_user(username=f'hot-{label}', password='password')
+    return [
+        Account.objects.create(name=f'Hot {label} {i}', starting_balance=balance, user=user).pk
+        for i in range(count)
+    ]
+
+
+def run(mode, accounts, threads, transfers_total, seed):
+    from django.db import connections
+
+    from banking import transfers
+    from banking.models import Transaction
+
+    per_thread = max(1, transfers_total // threads)
+    counts = {'done': 0, 'refused': 0, 'errors': 0}
+    lock = threading.Lock()
+    start_line = threading.Barrier(threads)
+
+    def tally(key):
+        with lock:
+            counts[key] += 1
+
+    def worker(n):
+        rng = random.Random(seed * 1000 + n)
+        start_line.wait()
+        try:
+            for _ in range(per_thread):
+                payer, payee = rng.sample(accounts, 2)
+                amount = Decimal(rng.randint(1, 5000)) / 100
+                try:
+                    if mode == 'transfer service':
+                        transfers.transfer(payer, payee, amount)
+                    else:
+                        Transaction(transaction_type='transfer', amount=amount,
+                                    from_account_id=payer, to_account_id=payee).save()
+                except transfers.InsufficientFunds:
+                    tally('refused')
+                except Exception:
+                    tally('errors')
+                else:
+                    tally('done')
+        finally:
+            connections.close_all()
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    with Stopwatch() as watch:
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+    return watch.elapsed, counts
+
+
+def check(accounts, opening_total):
+    from banking import ledger
+    from banking.models import Account
+
+    stored = dict(Account.objects.filter(pk__in=accounts).values_list('pk', 'balance'))
+    expected = ledger.computed_balances()
+    return {
+        'money_drift': sum(stored.values()) - opening_total,
+        'lost_updates': sum(1 for pk, balance in stored.items() if balance != expected[pk][0]),
+        'overdrawn': sum(1 for balance in stored.values() if balance < 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--threads', type=int, default=200)
+    parser.add_argument('--accounts', type=int, default=4, help='hot accounts shared by every thread')
+    parser.add_argument('--transfers', type=int, default=5000, help='transfers attempted per mode')
+    parser.add_argument('--balance', type=Decimal, default=Decimal('100.00'), help='opening balance per account')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--mode', choices=MODES, action='append', help='limit to these modes')
+    args = parser.parse_args()
+    if args.accounts < 2:
+        parser.error('--accounts must be at least 2')
+
+    setup_django()
+
+    from django.db import connections
+
+    results = []
+    for i, mode in enumerate(args.mode or MODES):
+        accounts = make_accounts(args.accounts, args.balance, i)
+        connections.close_all()
+        elapsed, counts = run(mode, accounts, args.threads, args.transfers, args.seed)
+        results.append({
+            'mode': mode,
+            'transfers_per_sec': counts['done'] / elapsed,
+            **counts,
+            **check(accounts, args.balance * args.accounts),
+        })
+
+    print_table(results, ['mode', 'transfers_per_sec', 'done', 'refused', 'errors',
+                          'money_drift', 'lost_updates', 'overdrawn'])
+
+
+if __name__ == '__main__':
+    main()
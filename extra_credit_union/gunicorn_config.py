@@ -0,0 +1,78 @@
+"""
+Gunicorn configuration for production serving.
+
+    gunicorn -c extra_credit_union/gunicorn_config.py extra_credit_union.wsgi:application
+
+Every setting can be overridden from the environment:
+
+* ``WEB_CONCURRENCY``: worker processes (default 2 x CPUs + 1)
+* ``GUNICORN_THREADS``: threads per worker (default 4)
+* ``GUNICORN_WORKER_CLASS``: ``gthread`` by default. Use
+  ``uvicorn.workers.UvicornWorker`` with ``extra_credit_union.asgi:application``
+  to serve the async endpoints
+* ``PORT``, ``GUNICORN_TIMEOUT``, ``GUNICORN_MAX_REQUESTS``
+
+Each worker runs its own password hashing pool (see banking.hashing).
+Unless ``PASSWORD_HASH_WORKERS`` is set, the CPUs are shared out between
+the workers' pools, with at least one hashing process per worker, rather
+than every worker starting a pool as large as the machine.
+
+The app is preloaded and warmed in the master before forking (see
+extra_credit_union.warmup), and each worker opens its own database
+connections straight after the fork.
+"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = timeout
+keepalive = 5
+# Recycle workers now and then so slow leaks can't build up; the jitter keeps them from restarting together
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 5000))
+max_requests_jitter = max_requests // 10
+
+preload_app = True
+accesslog = '-'
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before any worker forks
+    from extra_credit_union import warmup
+
+    try:
+        timings = warmup.warm_imports()
+    except Exception:
+        # A failed warm-up only costs the first requests some latency; serve anyway
+        server.log.exception('master warm-up failed')
+    else:
+        server.log.info('master warm-up: %s', warmup.describe(timings))
+    finally:
+        # Nothing opened here may leak into the workers
+        warmup.close_connections()
+
+
+def hash_workers_per_process(workers):
+    return max(1, multiprocessing.cpu_count() // workers)
+
+
+def post_fork(server, worker):
+    from django.conf import settings
+
+    from banking import hashing
+    from extra_credit_union import warmup
+
+    if 'PASSWORD_HASH_WORKERS' not in os.environ:
+        settings.PASSWORD_HASH_WORKERS = hash_workers_per_process(server.cfg.workers)
+        if 'PASSWORD_HASH_QUEUE' not in os.environ:
+            settings.PASSWORD_HASH_QUEUE = 2 * settings.PASSWORD_HASH_WORKERS
+    # The hashing pool's processes belong to the master; each worker starts its own
+    hashing.reset()
+    warmup.close_connections()
+    timings = warmup.warm_connections()
+    server.log.info('worker %s warm-up: %s', worker.pid, warmup.describe(timings))
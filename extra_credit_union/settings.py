@@ -10,8 +10,14 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import hashlib
+import os
+import sys
+import tempfile
 from pathlib import Path
 
+from corsheaders.defaults import default_headers
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,8 +54,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
-    
+    # First, so its timings cover the rest of the stack
+    'banking.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    # Serves the collected static files (admin, Swagger) when running under gunicorn
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Add this line
     'django.middleware.common.CommonMiddleware',
@@ -87,9 +96,38 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Seconds to wait for the write lock before "database is locked"
+            'timeout': 20,
+            # Take the write lock when a transaction starts rather than failing to upgrade it midway
+            'transaction_mode': 'IMMEDIATE',
+        },
+        # Keep connections open between requests (checked before reuse)
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Put the primary database in WAL mode (see banking.sqlite). Persistent and leaves
+# -wal/-shm files beside the database, so it's for deployments rather than checkouts.
+SQLITE_WAL = os.environ.get('SQLITE_WAL', '') == '1'
+
+# Read-only copy of the database for reporting queries (see banking.routers).
+# Rebuild it with `manage.py refresh_replica`, e.g. from cron.
+REPLICA_DATABASE_ALIAS = 'replica'
+REPLICA_DATABASE_PATH = os.environ.get('REPLICA_DATABASE_PATH', str(BASE_DIR / 'db.replica.sqlite3'))
+DATABASES[REPLICA_DATABASE_ALIAS] = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': REPLICA_DATABASE_PATH,
+    'OPTIONS': {'timeout': 20},
+    # Reconnect per request so a refreshed copy is picked up straight away
+    'CONN_MAX_AGE': 0,
+    'TEST': {'MIRROR': 'default'},
+}
+DATABASE_ROUTERS = ['banking.routers.ReplicaRouter']
+# Seconds since the last refresh after which reports read from the primary instead
+REPLICA_MAX_STALENESS = int(os.environ.get('REPLICA_MAX_STALENESS', 15 * 60))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -126,6 +164,12 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.1/howto/static-files/
 
 STATIC_URL = 'static/'
+# Filled by `manage.py collectstatic` and served by WhiteNoise
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedStaticFilesStorage'},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -133,12 +177,59 @@ STATIC_URL = 'static/'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'banking.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',
     ),
 }
 
+# Users resolved from JWTs are cached per process (see banking.authentication).
+# A deactivated user keeps access from other processes for at most the TTL.
+AUTH_USER_CACHE_SIZE = 1024
+AUTH_USER_CACHE_TTL = 60
+
 CORS_ALLOW_ALL_ORIGINS = True  # For development only, don't use in production
-CORS_ALLOW_CREDENTIALS = True
\ No newline at end of file
+CORS_ALLOW_CREDENTIALS = True
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+# Largest batch accepted by POST /api/transactions/bulk/
+BULK_TRANSACTION_MAX_ROWS = 5000
+
+# Shared by every worker process on the host, so an invalidation made by one
+# worker (e.g. the business catalogue's version bump) reaches all of them.
+# The directory is per database, so other checkouts on the host don't share
+# it. Point several hosts at a shared cache server instead. Test runs use a
+# private in-memory cache.
+TESTING = sys.argv[1:2] == ['test']
+_CACHE_DIR = 'extra_credit_union_cache_' + hashlib.md5(str(DATABASES['default']['NAME']).encode()).hexdigest()[:12]
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', os.path.join(tempfile.gettempdir(), _CACHE_DIR)),
+    },
+}
+if TESTING:
+    CACHES['default'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+# Cache backing the business catalogue (see banking.catalogue)
+BUSINESS_CACHE_ALIAS = 'default'
+BUSINESS_CACHE_TIMEOUT = 60 * 60
+
+# Password hashing pool (see banking.hashing). 0 workers hashes inline.
+# Under gunicorn the default is divided between the worker processes (see gunicorn_config.post_fork).
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+# Hashes allowed to wait for a worker before logins are shed with a 503
+PASSWORD_HASH_QUEUE = int(os.environ.get('PASSWORD_HASH_QUEUE', 2 * PASSWORD_HASH_WORKERS))
+# Seconds a shed client is told to wait before retrying
+PASSWORD_HASH_RETRY_AFTER = 1
+
+# Serialize and group-commit single transaction posts through one writer thread (see banking.write_queue)
+TRANSACTION_WRITE_QUEUE = os.environ.get('TRANSACTION_WRITE_QUEUE', '') == '1'
+TRANSACTION_WRITE_QUEUE_MAX_BATCH = 100
+TRANSACTION_WRITE_QUEUE_MAX_WAIT = 0.002
+
+# Seconds a response stored under an Idempotency-Key is replayed for (see banking.idempotency)
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
+# Per-route latency and query metrics, served to staff at /api/metrics/ (see banking.metrics)
+METRICS_ENABLED = True
+METRICS_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
@@ -0,0 +1,88 @@
+"""
+Start-up warm-up for production workers.
+
+The first request a fresh process serves otherwise pays for importing
+every view module, building the URL resolver, compiling the serializers
+and generating the drf_yasg schema. ``warm_imports`` does all of that ahead
+of time. Under gunicorn it runs once in the master before forking, so the
+workers share the result. ``warm_connections`` opens each worker's
+database connections. Connections can't be shared across a fork, so it
+runs in every worker after the fork.
+"""
+import time
+
+
+def _timed(timings, name, func):
+    start = time.perf_counter()
+    func()
+    timings[name] = time.perf_counter() - start
+
+
+def _load_urlconf():
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    # Populating the reverse lookup compiles every pattern's regex
+    resolver.reverse_dict
+
+
+def _load_serializers():
+    from rest_framework.serializers import Serializer
+
+    from banking import serializers
+
+    for candidate in vars(serializers).values():
+        if isinstance(candidate, type) and issubclass(candidate, Serializer) \
+                and candidate.__module__ == serializers.__name__:
+            # Building .fields introspects the model and related fields
+            candidate().fields
+
+
+def _generate_schema():
+    from django.conf import settings
+    from django.test import RequestFactory
+
+    from banking.urls import schema_view
+
+    # The schema embeds absolute URLs, so the host has to pass ALLOWED_HOSTS
+    hosts = [host.lstrip('.') for host in settings.ALLOWED_HOSTS if host.strip('.*')]
+    request = RequestFactory(SERVER_NAME=hosts[0] if hosts else 'localhost') \
+        .get('/api/swagger/', {'format': 'openapi'})
+    response = schema_view.without_ui(cache_timeout=0)(request)
+    response.render()
+    if response.status_code != 200:
+        raise RuntimeError(f'schema generation returned {response.status_code}')
+
+
+def warm_imports():
+    """Import and build everything request handling needs. Returns timings in seconds."""
+    timings = {}
+    _timed(timings, 'urlconf', _load_urlconf)
+    _timed(timings, 'serializers', _load_serializers)
+    _timed(timings, 'schema', _generate_schema)
+    return timings
+
+
+def warm_connections():
+    """Open a connection to every configured database. Returns timings in seconds."""
+    from django.db import connections
+
+    from banking import routers
+
+    timings = {}
+    for alias in connections:
+        # Connecting to a missing replica would create an empty file in its place
+        if alias == routers.replica_alias() and routers.replica_lag() is None:
+            continue
+        _timed(timings, f'db:{alias}', connections[alias].ensure_connection)
+    return timings
+
+
+def close_connections():
+    from django.db import connections
+
+    connections.close_all()
+
+
+def describe(timings):
+    return ', '.join(f'{name} {seconds * 1000:.0f}ms' for name, seconds in timings.items())